@@ -5,15 +5,41 @@ Demonstra uso de validação, tratamento de erros e profiling
 """
 
 import asyncio
+import codecs
+import ctypes
+import fnmatch
+import functools
+import hashlib
+import heapq
+import importlib.util
 import json
 import logging
+import math
+import mmap
+import operator
 import os
+import random
+import re
+import socket
+import ssl
+import stat
+import struct
+import sys
 import tempfile
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from pydantic import BaseModel, Field, validator
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele a serialização usa o módulo json
+    orjson = None
+
+from pydantic import BaseModel, ConfigDict, Field, validator
 
 # Simulação das importações dos templates (ajuste conforme necessário)
 class ToolParameter:
@@ -35,49 +61,640 @@ class ToolResult:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class BaseMCPTool:
-    """Classe base para ferramentas MCP (simplificada para exemplo)"""
+# Pool CPU-bound compartilhado com o servidor básico (módulo próprio, sem importar o servidor)
+try:
+    from cpu_executor import CPUBoundExecutor
+except ImportError:
+    # Execução fora do diretório dos exemplos: carrega cpu_executor.py ao lado deste arquivo; o
+    # registro em sys.modules permite que os workers do pool resolvam as funções por nome no pickle
+    _cpu_spec = importlib.util.spec_from_file_location("cpu_executor", Path(__file__).with_name("cpu_executor.py"))
+    _cpu_module = importlib.util.module_from_spec(_cpu_spec)
+    sys.modules["cpu_executor"] = _cpu_module
+    _cpu_spec.loader.exec_module(_cpu_module)
+    from cpu_executor import CPUBoundExecutor
+
+# Estado por worker: instâncias de ferramentas reaproveitadas e um event loop por thread
+_worker_tools: Dict[Any, Any] = {}
+_worker_state = threading.local()
+
+def _run_tool_coroutine(tool: "BaseMCPTool", params: Dict[str, Any]) -> "ToolResult":
+    """Executa tool.execute de forma síncrona no loop local do worker"""
+    loop = getattr(_worker_state, "loop", None)
+    if loop is None:
+        loop = _worker_state.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(tool.execute(**params))
+
+def _execute_tool_in_worker(tool_class, config: Dict[str, Any], **params) -> "ToolResult":
+    """Ponto de entrada no processo worker: reconstrói (uma vez) a ferramenta e executa"""
+    key = (tool_class, json.dumps(config, sort_keys=True, default=str))
+    tool = _worker_tools.get(key)
+    if tool is None:
+        tool = _worker_tools[key] = tool_class(config=config)
+    return _run_tool_coroutine(tool, params)
+
+class AsyncFileIO:
+    """
+    Backend de I/O de arquivos fora do event loop
+    Executa as chamadas bloqueantes em um pool de threads limitado e mede vazão e fila
+    """
     
-    def __init__(self, name: str, description: str, config: Optional[Dict[str, Any]] = None):
-        self.name = name
-        self.description = description
-        self.config = config or {}
-        self.logger = logging.getLogger(f"{__name__}.{self.name}")
+    def __init__(self, max_workers: int = 8):
+        if max_workers <= 0:
+            raise ValueError("max_workers deve ser maior que zero")
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-io")
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stats = {
+            "operations": 0,
+            "reads": 0,
+            "writes": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "read_time": 0.0,
+            "write_time": 0.0
+        }
     
-    def get_parameters(self) -> List[ToolParameter]:
-        raise NotImplementedError
+    async def run(self, func, *args, kind: Optional[str] = None) -> Any:
+        """Executa func(*args) no pool; kind ('read'/'write') contabiliza bytes e tempo"""
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.stats["operations"] += 1
+        start_time = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._pool, func, *args)
+        finally:
+            self.in_flight -= 1
+            if kind is not None:
+                self.stats[f"{kind}s"] += 1
+                self.stats[f"{kind}_time"] += time.perf_counter() - start_time
     
-    async def execute(self, **kwargs) -> ToolResult:
-        raise NotImplementedError
+    def record_bytes(self, kind: str, size: int) -> None:
+        """Contabiliza bytes lidos ou escritos"""
+        self.stats["bytes_read" if kind == "read" else "bytes_written"] += size
     
-    def validate_parameters(self, **kwargs) -> Dict[str, Any]:
-        """Validação básica de parâmetros"""
-        parameters = self.get_parameters()
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna métricas de vazão (bytes/s) e fila do backend"""
+        stats = self.stats
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": max(0, self.in_flight - self.max_workers),
+            "read_throughput": stats["bytes_read"] / stats["read_time"] if stats["read_time"] else 0.0,
+            "write_throughput": stats["bytes_written"] / stats["write_time"] if stats["write_time"] else 0.0,
+            **stats
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerra o pool de I/O"""
+        self._pool.shutdown(wait=wait)
+
+_file_io: Optional[AsyncFileIO] = None
+
+def get_file_io() -> AsyncFileIO:
+    """Retorna o backend de I/O compartilhado (criado sob demanda)"""
+    global _file_io
+    if _file_io is None:
+        _file_io = AsyncFileIO()
+    return _file_io
+
+# Funções bloqueantes executadas nas threads de I/O
+def _stat_path(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+def _max_size_message(size: int, max_size: int) -> str:
+    return f"arquivo tem {size} bytes, acima de max_size ({max_size}); use offset/length ou start_line/line_count"
+
+def _read_text_file(path: Path, encoding: str, max_size: int):
+    with open(path, "r", encoding=encoding) as f:
+        file_stat = os.fstat(f.fileno())
+        if file_stat.st_size > max_size:
+            raise ValueError(_max_size_message(file_stat.st_size, max_size))
+        return f.read(), file_stat
+
+class _InotifyWatcher:
+    """
+    Observador inotify mínimo (Linux, via ctypes) sobre diretórios
+    Reporta os caminhos alterados desde a última leitura, sem bloquear
+    """
+    
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+    _EVENT_HEADER = struct.Struct("iIII")
+    
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify disponível apenas no Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._directories: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+    
+    def watch(self, directory: str) -> bool:
+        """Observa um diretório; retorna False se não for possível"""
+        if directory in self._watches:
+            return True
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            return False
+        self._watches[directory] = wd
+        self._directories[wd] = directory
+        return True
+    
+    def is_watched(self, directory: str) -> bool:
+        return directory in self._watches
+    
+    def read_changes(self) -> Optional[Set[str]]:
+        """Caminhos alterados desde a última chamada; None se tudo deve ser invalidado"""
+        changed: Set[str] = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, name_length = self._EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self._EVENT_HEADER.size
+                name = buffer[offset:offset + name_length].rstrip(b"\0")
+                offset += name_length
+                
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                directory = self._directories.get(wd)
+                if directory is None:
+                    continue
+                if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF | self.IN_IGNORED):
+                    # O próprio diretório mudou: deixa de ser confiável
+                    self._watches.pop(directory, None)
+                    self._directories.pop(wd, None)
+                    changed.add(directory + os.sep)
+                elif name:
+                    changed.add(os.path.join(directory, os.fsdecode(name)))
+    
+    def close(self) -> None:
+        os.close(self.fd)
+
+class FileReadCache:
+    """
+    Cache LRU de conteúdos lidos, limitado por bytes
+    Entradas chaveadas por (caminho resolvido, encoding) e validadas por
+    (st_ino, st_mtime_ns, st_size); com inotify, hits dispensam o stat
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, use_inotify: bool = False):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[tuple, str, os.stat_result, int]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._watcher = None
+        if use_inotify:
+            try:
+                self._watcher = _InotifyWatcher()
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify indisponível, usando apenas validação por stat: {e}")
+    
+    @staticmethod
+    def signature(file_stat: os.stat_result) -> tuple:
+        return (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+    
+    def _sync_watcher(self) -> None:
+        changed = self._watcher.read_changes()
+        if changed is None:
+            self.clear()
+            return
+        for path in changed:
+            if path.endswith(os.sep):
+                for key in [key for key in self._entries if key[0].startswith(path)]:
+                    self._remove(key)
+                    self.stats["invalidations"] += 1
+            else:
+                self.invalidate(path)
+    
+    def get_watched(self, path: str, encoding: str) -> Optional[Tuple[str, os.stat_result]]:
+        """Hit sem stat: só quando o diretório é observado via inotify e nada mudou"""
+        if self._watcher is None:
+            return None
+        self._sync_watcher()
+        key = (path, encoding)
+        entry = self._entries.get(key)
+        if entry is None or not self._watcher.is_watched(os.path.dirname(path)):
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1], entry[2]
+    
+    def get(self, path: str, encoding: str, file_stat: os.stat_result) -> Optional[str]:
+        """Retorna o conteúdo em cache se a assinatura do arquivo não mudou"""
+        key = (path, encoding)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == self.signature(file_stat):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            self._remove(key)
+            self.stats["invalidations"] += 1
+        self.stats["misses"] += 1
+        return None
+    
+    def put(self, path: str, encoding: str, file_stat: os.stat_result, content: str) -> None:
+        """Armazena conteúdo lido, removendo os menos usados se passar do limite"""
+        size = sys.getsizeof(content)
+        if size > self.max_bytes:
+            return
+        key = (path, encoding)
+        if key in self._entries:
+            self._remove(key)
+        if self._watcher is not None and self._watcher.watch(os.path.dirname(path)):
+            # O watch pode ter sido criado depois da leitura: confere o arquivo agora que
+            # ele está observado, para não guardar um conteúdo que já mudou sem evento
+            try:
+                current = os.stat(path)
+            except OSError:
+                return
+            if self.signature(current) != self.signature(file_stat):
+                self.stats["invalidations"] += 1
+                return
+        self._entries[key] = (self.signature(file_stat), content, file_stat, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+    
+    def invalidate(self, path: str) -> None:
+        """Remove todas as entradas de um caminho"""
+        for key in [key for key in self._entries if key[0] == path]:
+            self._remove(key)
+            self.stats["invalidations"] += 1
+    
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry[3]
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna contadores do cache"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "inotify": self._watcher is not None,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+            **self.stats
+        }
+
+def _read_file_range(path: Path, encoding: str, max_bytes: int, offset: int = 0,
+                     start_line: Optional[int] = None, line_count: Optional[int] = None,
+                     scan_from: tuple = (1, 0)):
+    """
+    Lê um trecho do arquivo via mmap, sem carregar o arquivo inteiro
+    Modo bytes: [offset, offset + max_bytes), recuado para não cortar caracteres; em UTF-8 o
+    offset avança até o início de um caractere e a página tem pelo menos um caractere completo
+    Modo linhas: line_count linhas a partir de start_line (busca começa em scan_from = (linha, byte))
+    Retorna (texto, metadados) com next_cursor para a próxima página (None no fim)
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        metadata = {"file_size": size, "offset": offset, "next_cursor": None}
+        if size == 0 or offset >= size:
+            return "", {**metadata, "length": 0}
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if start_line is None:
+                if codecs.lookup(encoding).name == "utf-8":
+                    # Bytes de continuação (10xxxxxx) não iniciam caractere
+                    while offset < size and mm[offset] & 0xC0 == 0x80:
+                        offset += 1
+                    metadata["offset"] = offset
+                end = min(size, offset + max_bytes)
+                while True:
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                    text = decoder.decode(mm[offset:end], final=end >= size)
+                    consumed = end - len(decoder.getstate()[0])
+                    if consumed > offset or end >= size:
+                        break
+                    end += 1  # Página menor que um caractere: estende até completá-lo
+                end = consumed
+                if end < size:
+                    metadata["next_cursor"] = f"b:{end}"
+                return text, {**metadata, "length": end - offset}
+            
+            if "\n".encode(encoding) != b"\n":
+                raise ValueError(f"Leitura por linhas não suportada para o encoding {encoding}")
+            
+            line, start = scan_from
+            while line < start_line and start < size:
+                newline = mm.find(b"\n", start)
+                start = size if newline == -1 else newline + 1
+                line += 1
+            
+            end = start
+            lines_read = 0
+            while lines_read < line_count and end < size:
+                newline = mm.find(b"\n", end)
+                line_end = size if newline == -1 else newline + 1
+                if line_end - start > max_bytes:
+                    if lines_read == 0:
+                        raise ValueError(f"Linha {start_line} excede max_size ({max_bytes} bytes)")
+                    break
+                end = line_end
+                lines_read += 1
+            
+            if end < size:
+                metadata["next_cursor"] = f"l:{start_line + lines_read}:{end}"
+            return mm[start:end].decode(encoding), {
+                **metadata,
+                "offset": start,
+                "length": end - start,
+                "start_line": start_line,
+                "line_count": lines_read
+            }
+
+def _write_text_file(path: Path, content: str, encoding: str) -> int:
+    data = content.encode(encoding)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def _create_temp_file(parent: Path, name: str, mode: int) -> Tuple[int, str]:
+    """
+    Como tempfile.mkstemp, mas criando com o modo pedido em vez de 0600
+    O kernel aplica o umask do processo na criação, sem precisar consultá-lo (os.umask
+    alteraria estado global, visível para as outras threads)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_CLOEXEC", 0)
+    for _ in range(tempfile.TMP_MAX):
+        temp_path = str(parent / f".{name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(temp_path, flags, mode), temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Não foi possível criar arquivo temporário em {parent}")
+
+def _write_files_atomic(entries: List[tuple], fsync: bool = True) -> Dict[str, Any]:
+    """
+    Escreve vários arquivos de forma atômica
+    Cada conteúdo vai para um temporário no diretório de destino (com fsync), e só
+    depois de todos escritos os temporários são renomeados sobre os destinos; por fim
+    cada diretório pai recebe um único fsync. Leitores nunca veem arquivo pela metade.
+    """
+    prepared_dirs = set()
+    pending = []
+    try:
+        for path, data in entries:
+            parent = path.parent
+            if parent not in prepared_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                prepared_dirs.add(parent)
+            
+            try:
+                existing = os.stat(path)
+            except FileNotFoundError:
+                # Arquivo novo: permissão padrão (0666 menos o umask, aplicado na criação)
+                mode = None
+            else:
+                # Falha antes de qualquer rename, para o lote não ficar pela metade
+                if stat.S_ISDIR(existing.st_mode):
+                    raise IsADirectoryError(f"Destino é um diretório: {path}")
+                mode = stat.S_IMODE(existing.st_mode)
+            
+            fd, temp_path = _create_temp_file(parent, path.name, 0o666 if mode is None else mode)
+            pending.append((temp_path, path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if mode is not None:
+                    # O umask pode ter removido bits do modo original
+                    os.fchmod(f.fileno(), mode)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        
+        for temp_path, path in pending:
+            os.replace(temp_path, path)
+        pending = []
+    finally:
+        for temp_path, _ in pending:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+    
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        for parent in prepared_dirs:
+            dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    
+    return {"directories": len(prepared_dirs)}
+
+def _scan_directory(dir_path: Path, limit: int, after: Optional[str] = None, recursive: bool = False,
+                    max_depth: int = 1, pattern: Optional[str] = None):
+    """
+    Lista diretório com os.scandir, reaproveitando os dados do DirEntry
+    Retorna a página ordenada por caminho relativo (após 'after') e o total de entradas
+    Apenas as entradas da página fazem stat; tipo vem do d_type quando disponível
+    A ordem do scandir não é estável, então cada página (cursor "p:<nome>") percorre o
+    diretório inteiro de novo: O(N log limit) em tempo, mas só limit + 1 entradas em
+    memória, pois a seleção é feita em fluxo, retomando após o nome do cursor. Percorrer
+    tudo em páginas custa O(N²/limit); para listagens completas, use um limit maior.
+    """
+    matcher = re.compile(fnmatch.translate(pattern)).match if pattern else None
+    total = 0
+    
+    def candidates():
+        nonlocal total
+        pending = [(dir_path, "", 1)]
+        while pending:
+            current, prefix, depth = pending.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    relative = prefix + entry.name
+                    if recursive and depth < max_depth and entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, relative + "/", depth + 1))
+                    if matcher is not None and not matcher(entry.name):
+                        continue
+                    total += 1
+                    if after is None or relative > after:
+                        yield relative, entry
+    
+    page = heapq.nsmallest(limit + 1, candidates(), key=operator.itemgetter(0))
+    has_more = len(page) > limit
+    items = []
+    for relative, entry in page[:limit]:
+        is_dir = entry.is_dir()
+        try:
+            entry_stat = entry.stat()
+            size = entry_stat.st_size if entry.is_file() else None
+            modified = entry_stat.st_mtime
+        except FileNotFoundError:  # Symlink quebrado
+            size = modified = None
+        items.append({
+            "name": relative,
+            "type": "directory" if is_dir else "file",
+            "size": size,
+            "modified": modified
+        })
+    
+    next_cursor = f"p:{items[-1]['name']}" if has_more else None
+    return items, total, next_cursor
+
+# Tipos Python aceitos para cada tipo de parâmetro (bool não conta como número)
+_PARAMETER_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list, tuple)
+}
+
+class CompiledValidator:
+    """
+    Validador de parâmetros compilado uma vez a partir da lista de ToolParameter
+    Guarda apenas tuplas com o necessário para validar cada chamada
+    """
+    
+    __slots__ = ("fields",)
+    
+    def __init__(self, parameters: List[ToolParameter]):
+        self.fields = tuple(
+            (
+                param.name,
+                param.required,
+                param.default,
+                param.type,
+                _PARAMETER_TYPES.get(param.type),
+                frozenset(param.enum) if param.enum else None,
+                param.enum
+            )
+            for param in parameters
+        )
+    
+    def __call__(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         validated = {}
         errors = []
         
-        for param in parameters:
-            value = kwargs.get(param.name)
+        for name, required, default, type_name, python_types, enum_set, enum in self.fields:
+            value = kwargs.get(name)
             
-            if param.required and value is None:
-                errors.append(f"Parâmetro obrigatório '{param.name}' não fornecido")
+            if value is None:
+                if required:
+                    errors.append(f"Parâmetro obrigatório '{name}' não fornecido")
+                    continue
+                validated[name] = default
                 continue
             
-            if value is None and param.default is not None:
-                value = param.default
+            if python_types is not None and (
+                not isinstance(value, python_types) or (isinstance(value, bool) and type_name != "boolean")
+            ):
+                errors.append(f"Parâmetro '{name}' deve ser do tipo {type_name}")
+                continue
+            
+            if enum_set is not None:
+                try:
+                    allowed = value in enum_set
+                except TypeError:
+                    allowed = False
+                if not allowed:
+                    errors.append(f"Valor '{value}' inválido para '{name}'. Valores aceitos: {enum}")
+                    continue
             
-            validated[param.name] = value
+            validated[name] = value
         
         if errors:
             raise ValueError(f"Erro de validação: {'; '.join(errors)}")
         
         return validated
+
+_compiled_validators: Dict[type, CompiledValidator] = {}
+
+class BaseMCPTool:
+    """Classe base para ferramentas MCP (simplificada para exemplo)"""
+    
+    # Ferramentas CPU-bound rodam no cpu_executor recebido (o do servidor) quando a entrada
+    # (soma dos parâmetros string) atinge cpu_offload_min_bytes; sem executor, rodam no loop
+    cpu_bound: bool = False
+    cpu_offload_min_bytes: int = 0
+    
+    def __init__(self, name: str, description: str, config: Optional[Dict[str, Any]] = None,
+                 cpu_executor: Optional[CPUBoundExecutor] = None):
+        self.name = name
+        self.description = description
+        self.config = config or {}
+        self.cpu_executor = cpu_executor
+        self.logger = logging.getLogger(f"{__name__}.{self.name}")
+    
+    def get_parameters(self) -> List[ToolParameter]:
+        raise NotImplementedError
+    
+    async def execute(self, **kwargs) -> ToolResult:
+        raise NotImplementedError
+    
+    def get_validator(self) -> "CompiledValidator":
+        """
+        Validador compilado a partir de get_parameters(), cacheado por classe
+        Ferramentas cujos parâmetros variam por instância devem sobrescrever este método
+        """
+        tool_class = type(self)
+        validator = _compiled_validators.get(tool_class)
+        if validator is None:
+            validator = _compiled_validators[tool_class] = CompiledValidator(self.get_parameters())
+        return validator
+    
+    def validate_parameters(self, **kwargs) -> Dict[str, Any]:
+        """Validação de parâmetros (obrigatórios, defaults, tipo e enum)"""
+        return self.get_validator()(kwargs)
+    
+    def _should_offload(self, params: Dict[str, Any]) -> bool:
+        """Decide se a execução deve ir para o pool CPU-bound"""
+        if not self.cpu_bound or self.cpu_executor is None:
+            return False
+        payload_size = sum(len(value) for value in params.values() if isinstance(value, str))
+        return payload_size >= self.cpu_offload_min_bytes
+    
+    async def _run_offloaded(self, params: Dict[str, Any]) -> ToolResult:
+        """Executa execute(**params) no cpu_executor, fora do event loop"""
+        # Em processos a ferramenta é reconstruída pela config; em threads usa a própria instância
+        return await self.cpu_executor.call(
+            functools.partial(_execute_tool_in_worker, type(self), self.config), params,
+            thread_call=functools.partial(_run_tool_coroutine, self, params)
+        )
     
     async def safe_execute(self, **kwargs) -> ToolResult:
         """Executa ferramenta com tratamento de erros"""
         try:
             validated_params = self.validate_parameters(**kwargs)
             self.logger.info(f"Executando ferramenta '{self.name}'")
+            if self._should_offload(validated_params):
+                return await self._run_offloaded(validated_params)
             result = await self.execute(**validated_params)
             return result
         except Exception as e:
@@ -86,8 +703,16 @@ class BaseMCPTool:
             return ToolResult(success=False, content=None, error=error_msg)
 
 # Validação com Pydantic
+FORBIDDEN_PATH_PATTERNS = ('../', '..\\', '/etc/', '/root/')
+_FORBIDDEN_PATH_RE = re.compile('|'.join(re.escape(pattern) for pattern in FORBIDDEN_PATH_PATTERNS))
+
+# Requests validados são imutáveis e reaproveitados para argumentos idênticos
+VALIDATION_CACHE_SIZE = 4096
+
 class FileOperationRequest(BaseModel):
     """Modelo de validação para operações de arquivo"""
+    model_config = ConfigDict(frozen=True)
+    
     file_path: str = Field(..., description="Caminho do arquivo")
     encoding: str = Field("utf-8", description="Encoding do arquivo")
     max_size: int = Field(1024000, description="Tamanho máximo em bytes", gt=0, le=10*1024*1024)
@@ -97,22 +722,37 @@ class FileOperationRequest(BaseModel):
         if not v or not isinstance(v, str):
             raise ValueError("Caminho do arquivo deve ser uma string não vazia")
         
-        # Validações de segurança básicas
-        forbidden_patterns = ['../', '..\\', '/etc/', '/root/']
-        for pattern in forbidden_patterns:
-            if pattern in v:
-                raise ValueError(f"Caminho contém padrão proibido: {pattern}")
+        # Validações de segurança básicas (padrões compilados em uma única regex)
+        match = _FORBIDDEN_PATH_RE.search(v)
+        if match:
+            raise ValueError(f"Caminho contém padrão proibido: {match.group(0)}")
         
         return v.strip()
 
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def validate_file_request(file_path: str, encoding: str = "utf-8", max_size: Optional[int] = None) -> FileOperationRequest:
+    """Valida (uma vez por combinação de argumentos) um FileOperationRequest"""
+    if max_size is None:
+        return FileOperationRequest(file_path=file_path, encoding=encoding)
+    return FileOperationRequest(file_path=file_path, encoding=encoding, max_size=max_size)
+
 class APICallRequest(BaseModel):
     """Modelo de validação para chamadas de API"""
+    model_config = ConfigDict(frozen=True)
+    
     url: str = Field(..., description="URL da API")
     method: str = Field("GET", description="Método HTTP")
     headers: Dict[str, str] = Field(default_factory=dict)
     data: Optional[Dict[str, Any]] = Field(None)
     timeout: int = Field(30, gt=0, le=300)
     
+    @validator('url')
+    def validate_url(cls, v):
+        parts = urlsplit(v)
+        if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"URL inválida (esperado http:// ou https:// com host): {v}")
+        return v
+    
     @validator('method')
     def validate_method(cls, v):
         allowed_methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
@@ -120,18 +760,141 @@ class APICallRequest(BaseModel):
             raise ValueError(f"Método HTTP deve ser um de: {allowed_methods}")
         return v.upper()
 
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_api_request_cached(url: str, method: str, timeout: int, header_items: tuple) -> APICallRequest:
+    return APICallRequest(url=url, method=method, headers=dict(header_items), timeout=timeout)
+
+def validate_api_request(url: str, method: str = "GET", headers: Optional[Dict[str, str]] = None,
+                         data: Optional[Dict[str, Any]] = None, timeout: int = 30) -> APICallRequest:
+    """
+    Monta um APICallRequest validado
+    Requests sem corpo são validados uma vez por (url, método, timeout, headers) e
+    reaproveitados; com corpo, o modelo é validado normalmente
+    """
+    if data is None and isinstance(headers, (dict, type(None))):
+        try:
+            header_items = tuple(sorted(headers.items())) if headers else ()
+            return _validate_api_request_cached(url, method, timeout, header_items)
+        except TypeError:
+            pass  # Argumentos não hasheáveis: validação completa reporta o erro
+    
+    return APICallRequest(url=url, method=method, headers=headers or {}, data=data, timeout=timeout)
+
 # Implementações avançadas de ferramentas
+# Prefixo de unidade do Windows ("C:"), que no POSIX viraria um nome de arquivo relativo
+_WINDOWS_DRIVE_RE = re.compile(r"^[A-Za-z]:")
+
+class PathGuard:
+    """
+    Confina caminhos a um diretório base
+    A base é resolvida uma vez e a contenção é verificada por componentes (não por prefixo
+    de string). Caminhos aceitos ficam em cache com a identidade (dev, inode) de cada
+    diretório entre a base e o alvo; um hit faz lstat de cada um (sem seguir symlinks) e só
+    é usado se nenhum virou symlink ou foi trocado, e se o alvo não virou symlink
+    """
+    
+    def __init__(self, base_directory, cache_size: int = 4096):
+        self.base = Path(base_directory).resolve()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[Path, Tuple[Tuple[str, int, int], ...]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "revalidations": 0, "rejections": 0}
+    
+    def _directory_chain(self, resolved: Path) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+        """(caminho, dev, inode) de cada diretório abaixo da base até o pai do alvo"""
+        if resolved == self.base:
+            return ()
+        chain = []
+        current = self.base
+        for part in resolved.parent.relative_to(self.base).parts:
+            current = current / part
+            try:
+                dir_stat = os.lstat(current)
+            except OSError:
+                return None
+            chain.append((str(current), dir_stat.st_dev, dir_stat.st_ino))
+        return tuple(chain)
+    
+    @staticmethod
+    def _still_valid(resolved: Path, chain: Tuple[Tuple[str, int, int], ...]) -> bool:
+        for path, dev, ino in chain:
+            try:
+                dir_stat = os.lstat(path)
+            except OSError:
+                return False
+            if (dir_stat.st_dev, dir_stat.st_ino) != (dev, ino) or not stat.S_ISDIR(dir_stat.st_mode):
+                return False
+        try:
+            return not stat.S_ISLNK(os.lstat(resolved).st_mode)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+    
+    def resolve(self, file_path: str) -> Path:
+        """Resolve file_path dentro da base ou levanta ValueError"""
+        entry = self._cache.get(file_path)
+        if entry is not None:
+            if self._still_valid(*entry):
+                self._cache.move_to_end(file_path)
+                self.stats["hits"] += 1
+                return entry[0]
+            del self._cache[file_path]
+            self.stats["revalidations"] += 1
+        
+        self.stats["misses"] += 1
+        if _WINDOWS_DRIVE_RE.match(file_path):
+            self.stats["rejections"] += 1
+            raise ValueError("Caminho com unidade (drive) não permitido")
+        
+        resolved = (self.base / file_path).resolve()
+        if not resolved.is_relative_to(self.base):
+            self.stats["rejections"] += 1
+            raise ValueError("Caminho fora do diretório permitido")
+        
+        # Só guarda caminhos cujos diretórios já existem (identidade verificável)
+        chain = self._directory_chain(resolved)
+        if chain is None:
+            return resolved
+        self._cache[file_path] = (resolved, chain)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return resolved
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna contadores do guard"""
+        return {"entries": len(self._cache), **self.stats}
+
 class FileManagerTool(BaseMCPTool):
     """Ferramenta avançada para gerenciamento de arquivos"""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    # Linhas por página em leituras por linha sem line_count
+    DEFAULT_PAGE_LINES = 100
+    # Entradas por página na listagem sem limit, e profundidade padrão da listagem recursiva
+    DEFAULT_LIST_LIMIT = 1000
+    DEFAULT_LIST_DEPTH = 5
+    # Máximo de arquivos por operação write_many
+    MAX_BATCH_FILES = 5000
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 cpu_executor: Optional[CPUBoundExecutor] = None):
         super().__init__(
             name="file_manager",
             description="Gerencia operações de arquivo com validação e segurança",
-            config=config
+            config=config,
+            cpu_executor=cpu_executor
         )
         self.allowed_extensions = self.config.get("allowed_extensions", [".txt", ".json", ".py", ".md"])
         self.base_directory = Path(self.config.get("base_directory", "."))
+        self.path_guard = PathGuard(self.base_directory)
+        # Backend de I/O próprio se io_workers for configurado; senão, o compartilhado
+        io_workers = self.config.get("io_workers")
+        self.io = AsyncFileIO(max_workers=io_workers) if io_workers else get_file_io()
+        # Cache de leitura (read_cache_bytes=0 desativa)
+        cache_bytes = self.config.get("read_cache_bytes", 32 * 1024 * 1024)
+        self.read_cache = FileReadCache(
+            max_bytes=cache_bytes,
+            use_inotify=self.config.get("read_cache_inotify", False)
+        ) if cache_bytes else None
     
     def get_parameters(self) -> List[ToolParameter]:
         return [
@@ -140,7 +903,7 @@ class FileManagerTool(BaseMCPTool):
                 type="string",
                 description="Operação a realizar",
                 required=True,
-                enum=["read", "write", "list", "delete", "create_dir"]
+                enum=["read", "write", "write_many", "list", "delete", "create_dir"]
             ),
             ToolParameter(
                 name="file_path",
@@ -160,31 +923,102 @@ class FileManagerTool(BaseMCPTool):
                 description="Encoding do arquivo",
                 required=False,
                 default="utf-8"
+            ),
+            ToolParameter(
+                name="offset",
+                type="integer",
+                description="Leitura parcial: byte inicial",
+                required=False
+            ),
+            ToolParameter(
+                name="length",
+                type="integer",
+                description="Leitura parcial: número máximo de bytes (limitado a max_size)",
+                required=False
+            ),
+            ToolParameter(
+                name="start_line",
+                type="integer",
+                description="Leitura parcial: primeira linha (1 = início do arquivo)",
+                required=False
+            ),
+            ToolParameter(
+                name="line_count",
+                type="integer",
+                description="Leitura parcial: número de linhas a partir de start_line",
+                required=False
+            ),
+            ToolParameter(
+                name="cursor",
+                type="string",
+                description="Cursor de continuação retornado em metadata.next_cursor",
+                required=False
+            ),
+            ToolParameter(
+                name="max_size",
+                type="integer",
+                description="Tamanho máximo em bytes de uma leitura",
+                required=False
+            ),
+            ToolParameter(
+                name="files",
+                type="array",
+                description="write_many: lista de {path, content}, com path relativo a file_path",
+                required=False
+            ),
+            ToolParameter(
+                name="limit",
+                type="integer",
+                description="Listagem: máximo de entradas por página",
+                required=False
+            ),
+            ToolParameter(
+                name="recursive",
+                type="boolean",
+                description="Listagem: percorre subdiretórios",
+                required=False,
+                default=False
+            ),
+            ToolParameter(
+                name="max_depth",
+                type="integer",
+                description="Listagem recursiva: profundidade máxima (1 = só o diretório)",
+                required=False
+            ),
+            ToolParameter(
+                name="pattern",
+                type="string",
+                description="Listagem: filtro glob aplicado ao nome (ex.: '*.py')",
+                required=False
             )
         ]
     
-    async def execute(self, operation: str, file_path: str, content: str = None, encoding: str = "utf-8") -> ToolResult:
+    async def execute(self, operation: str, file_path: str, content: str = None, encoding: str = "utf-8",
+                      offset: int = None, length: int = None, start_line: int = None, line_count: int = None,
+                      cursor: str = None, max_size: int = None, limit: int = None, recursive: bool = False,
+                      max_depth: int = None, pattern: str = None, files: List[Dict[str, str]] = None) -> ToolResult:
         """Executa operação de arquivo"""
         try:
-            # Valida caminho usando Pydantic
-            request = FileOperationRequest(file_path=file_path, encoding=encoding)
-            
-            # Resolve caminho completo
-            full_path = (self.base_directory / request.file_path).resolve()
-            
-            # Verifica se está dentro do diretório base
-            if not str(full_path).startswith(str(self.base_directory.resolve())):
-                raise ValueError("Caminho fora do diretório permitido")
+            request, full_path = self._resolve_path(file_path, encoding, max_size)
             
             # Executa operação
             if operation == "read":
-                return await self._read_file(full_path, request.encoding)
+                if any(value is not None for value in (offset, length, start_line, line_count, cursor)):
+                    return await self._read_file_range(
+                        full_path, request.encoding, request.max_size,
+                        offset, length, start_line, line_count, cursor
+                    )
+                return await self._read_file(full_path, request.encoding, request.max_size)
             elif operation == "write":
                 if content is None:
                     raise ValueError("Conteúdo é obrigatório para operação de escrita")
                 return await self._write_file(full_path, content, request.encoding)
+            elif operation == "write_many":
+                if not files:
+                    raise ValueError("Lista 'files' é obrigatória para operação write_many")
+                return await self._write_many(request.file_path, files, request.encoding)
             elif operation == "list":
-                return await self._list_directory(full_path)
+                return await self._list_directory(full_path, limit, cursor, recursive, max_depth, pattern)
             elif operation == "delete":
                 return await self._delete_file(full_path)
             elif operation == "create_dir":
@@ -199,13 +1033,24 @@ class FileManagerTool(BaseMCPTool):
                 error=str(e)
             )
     
-    async def _read_file(self, file_path: Path, encoding: str) -> ToolResult:
-        """Lê arquivo"""
-        if not file_path.exists():
-            return ToolResult(success=False, content=None, error="Arquivo não encontrado")
+    def _resolve_path(self, file_path: str, encoding: str = "utf-8", max_size: Optional[int] = None):
+        """Valida o caminho e o resolve dentro do diretório base"""
+        # Valida caminho usando Pydantic (resultado em cache por argumentos)
+        request = validate_file_request(file_path, encoding, max_size)
         
-        if not file_path.is_file():
-            return ToolResult(success=False, content=None, error="Caminho não é um arquivo")
+        # Resolve caminho completo dentro do diretório base
+        full_path = self.path_guard.resolve(request.file_path)
+        
+        return request, full_path
+    
+    async def _check_readable(self, file_path: Path) -> Tuple[Optional[ToolResult], Optional[os.stat_result]]:
+        """Retorna (ToolResult de erro, stat); o erro é None se o arquivo puder ser lido"""
+        file_stat = await self.io.run(_stat_path, file_path)
+        if file_stat is None:
+            return ToolResult(success=False, content=None, error="Arquivo não encontrado"), None
+        
+        if not stat.S_ISREG(file_stat.st_mode):
+            return ToolResult(success=False, content=None, error="Caminho não é um arquivo"), file_stat
         
         # Verifica extensão
         if file_path.suffix not in self.allowed_extensions:
@@ -213,77 +1058,198 @@ class FileManagerTool(BaseMCPTool):
                 success=False,
                 content=None,
                 error=f"Extensão não permitida. Permitidas: {self.allowed_extensions}"
-            )
+            ), file_stat
+        
+        return None, file_stat
+    
+    def _read_result(self, file_path: Path, content: str, file_stat: os.stat_result, encoding: str,
+                     max_size: int, cache_status: str) -> ToolResult:
+        if file_stat.st_size > max_size:
+            return ToolResult(success=False, content=None,
+                              error=f"Erro ao ler arquivo: {_max_size_message(file_stat.st_size, max_size)}")
+        return ToolResult(
+            success=True,
+            content=content,
+            metadata={
+                "file_size": file_stat.st_size,
+                "encoding": encoding,
+                "extension": file_path.suffix,
+                "cache": cache_status
+            }
+        )
+    
+    async def _read_file(self, file_path: Path, encoding: str, max_size: int) -> ToolResult:
+        """Lê arquivo inteiro (limitado a max_size), servindo do cache quando válido"""
+        cache_key = str(file_path)
+        if self.read_cache is not None and file_path.suffix in self.allowed_extensions:
+            watched = self.read_cache.get_watched(cache_key, encoding)
+            if watched is not None:
+                return self._read_result(file_path, watched[0], watched[1], encoding, max_size, "hit")
+        
+        error, file_stat = await self._check_readable(file_path)
+        if error is not None:
+            return error
+        
+        if self.read_cache is not None:
+            content = self.read_cache.get(cache_key, encoding, file_stat)
+            if content is not None:
+                return self._read_result(file_path, content, file_stat, encoding, max_size, "hit")
         
         try:
-            content = file_path.read_text(encoding=encoding)
-            return ToolResult(
-                success=True,
-                content=content,
-                metadata={
-                    "file_size": file_path.stat().st_size,
-                    "encoding": encoding,
-                    "extension": file_path.suffix
-                }
+            content, file_stat = await self.io.run(_read_text_file, file_path, encoding, max_size, kind="read")
+            self.io.record_bytes("read", file_stat.st_size)
+            if self.read_cache is not None:
+                self.read_cache.put(cache_key, encoding, file_stat, content)
+            return self._read_result(file_path, content, file_stat, encoding, max_size, "miss")
+        except Exception as e:
+            return ToolResult(success=False, content=None, error=f"Erro ao ler arquivo: {e}")
+    
+    async def _read_file_range(self, file_path: Path, encoding: str, max_size: int, offset: Optional[int],
+                               length: Optional[int], start_line: Optional[int], line_count: Optional[int],
+                               cursor: Optional[str]) -> ToolResult:
+        """Lê um trecho do arquivo (bytes ou linhas) com cursor de continuação"""
+        error, _ = await self._check_readable(file_path)
+        if error is not None:
+            return error
+        
+        if line_count is not None and line_count <= 0:
+            return ToolResult(success=False, content=None, error="line_count deve ser maior que zero")
+        
+        scan_from = (1, 0)
+        if cursor is not None:
+            try:
+                mode, *position = cursor.split(":")
+                if mode == "b" and len(position) == 1:
+                    offset, start_line = int(position[0]), None
+                elif mode == "l" and len(position) == 2:
+                    start_line, offset = int(position[0]), int(position[1])
+                    scan_from = (start_line, offset)
+                    line_count = line_count or self.DEFAULT_PAGE_LINES
+                else:
+                    raise ValueError
+            except ValueError:
+                return ToolResult(success=False, content=None, error=f"Cursor inválido: {cursor}")
+        elif start_line is not None or line_count is not None:
+            start_line = start_line or 1
+            line_count = line_count or self.DEFAULT_PAGE_LINES
+        
+        if (offset or 0) < 0 or (length is not None and length <= 0) or (start_line is not None and start_line < 1):
+            return ToolResult(success=False, content=None, error="Intervalo de leitura inválido")
+        
+        max_bytes = min(length, max_size) if length else max_size
+        try:
+            content, metadata = await self.io.run(
+                _read_file_range, file_path, encoding, max_bytes, offset or 0, start_line, line_count, scan_from,
+                kind="read"
             )
+            self.io.record_bytes("read", metadata["length"])
+            metadata.update({"encoding": encoding, "extension": file_path.suffix})
+            return ToolResult(success=True, content=content, metadata=metadata)
         except Exception as e:
             return ToolResult(success=False, content=None, error=f"Erro ao ler arquivo: {e}")
     
+    def _invalidate_cached(self, file_path: Path) -> None:
+        if self.read_cache is not None:
+            self.read_cache.invalidate(str(file_path))
+    
     async def _write_file(self, file_path: Path, content: str, encoding: str) -> ToolResult:
-        """Escreve arquivo"""
+        """Escreve arquivo (criando o diretório pai se não existir)"""
         try:
-            # Cria diretório pai se não existir
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Escreve arquivo
-            file_path.write_text(content, encoding=encoding)
+            self._invalidate_cached(file_path)
+            file_size = await self.io.run(_write_text_file, file_path, content, encoding, kind="write")
+            self.io.record_bytes("write", file_size)
             
             return ToolResult(
                 success=True,
                 content=f"Arquivo escrito com sucesso: {file_path}",
                 metadata={
-                    "file_size": len(content.encode(encoding)),
+                    "file_size": file_size,
                     "encoding": encoding
                 }
             )
         except Exception as e:
             return ToolResult(success=False, content=None, error=f"Erro ao escrever arquivo: {e}")
     
-    async def _list_directory(self, dir_path: Path) -> ToolResult:
-        """Lista diretório"""
-        if not dir_path.exists():
+    async def _write_many(self, base_path: str, files: List[Dict[str, str]], encoding: str) -> ToolResult:
+        """Escreve vários arquivos atomicamente em uma única operação"""
+        if len(files) > self.MAX_BATCH_FILES:
+            return ToolResult(success=False, content=None, error=f"Lote excede {self.MAX_BATCH_FILES} arquivos")
+        
+        entries = []
+        seen = set()
+        for index, entry in enumerate(files):
+            if not isinstance(entry, dict) or not isinstance(entry.get("path"), str) or not isinstance(entry.get("content"), str):
+                return ToolResult(success=False, content=None, error=f"Item {index} de 'files' deve ter 'path' e 'content' (strings)")
+            _, full_path = self._resolve_path(str(Path(base_path) / entry["path"]), encoding)
+            if full_path in seen:
+                return ToolResult(success=False, content=None, error=f"Caminho repetido no lote: {entry['path']}")
+            seen.add(full_path)
+            entries.append((full_path, entry["content"].encode(encoding)))
+        
+        try:
+            for full_path, _ in entries:
+                self._invalidate_cached(full_path)
+            batch = await self.io.run(_write_files_atomic, entries, self.config.get("fsync", True), kind="write")
+            total_bytes = sum(len(data) for _, data in entries)
+            self.io.record_bytes("write", total_bytes)
+            return ToolResult(
+                success=True,
+                content=f"{len(entries)} arquivos escritos com sucesso",
+                metadata={
+                    "file_count": len(entries),
+                    "total_bytes": total_bytes,
+                    "directories": batch["directories"],
+                    "encoding": encoding
+                }
+            )
+        except Exception as e:
+            return ToolResult(success=False, content=None, error=f"Erro ao escrever arquivos: {e}")
+    
+    async def _list_directory(self, dir_path: Path, limit: Optional[int] = None, cursor: Optional[str] = None,
+                              recursive: bool = False, max_depth: Optional[int] = None,
+                              pattern: Optional[str] = None) -> ToolResult:
+        """Lista diretório (paginado, com filtro glob e recursão opcional)"""
+        dir_stat = await self.io.run(_stat_path, dir_path)
+        if dir_stat is None:
             return ToolResult(success=False, content=None, error="Diretório não encontrado")
         
-        if not dir_path.is_dir():
+        if not stat.S_ISDIR(dir_stat.st_mode):
             return ToolResult(success=False, content=None, error="Caminho não é um diretório")
         
+        after = None
+        if cursor is not None:
+            if not cursor.startswith("p:"):
+                return ToolResult(success=False, content=None, error=f"Cursor inválido: {cursor}")
+            after = cursor[2:]
+        
+        limit = limit or self.DEFAULT_LIST_LIMIT
+        max_depth = (max_depth or self.DEFAULT_LIST_DEPTH) if recursive else 1
+        if limit <= 0 or max_depth <= 0:
+            return ToolResult(success=False, content=None, error="limit e max_depth devem ser positivos")
+        
         try:
-            items = []
-            for item in dir_path.iterdir():
-                item_info = {
-                    "name": item.name,
-                    "type": "directory" if item.is_dir() else "file",
-                    "size": item.stat().st_size if item.is_file() else None,
-                    "modified": item.stat().st_mtime
-                }
-                items.append(item_info)
+            items, total, next_cursor = await self.io.run(
+                _scan_directory, dir_path, limit, after, recursive, max_depth, pattern
+            )
             
             return ToolResult(
                 success=True,
-                content=json.dumps(items, indent=2),
-                metadata={"item_count": len(items)}
+                content=json.dumps(items, separators=(",", ":")),
+                metadata={"item_count": len(items), "total_entries": total, "next_cursor": next_cursor}
             )
         except Exception as e:
             return ToolResult(success=False, content=None, error=f"Erro ao listar diretório: {e}")
     
     async def _delete_file(self, file_path: Path) -> ToolResult:
         """Deleta arquivo"""
-        if not file_path.exists():
+        file_stat = await self.io.run(_stat_path, file_path)
+        if file_stat is None:
             return ToolResult(success=False, content=None, error="Arquivo não encontrado")
         
         try:
-            if file_path.is_file():
-                file_path.unlink()
+            if stat.S_ISREG(file_stat.st_mode):
+                self._invalidate_cached(file_path)
+                await self.io.run(file_path.unlink)
                 return ToolResult(success=True, content=f"Arquivo deletado: {file_path}")
             else:
                 return ToolResult(success=False, content=None, error="Caminho não é um arquivo")
@@ -293,24 +1259,855 @@ class FileManagerTool(BaseMCPTool):
     async def _create_directory(self, dir_path: Path) -> ToolResult:
         """Cria diretório"""
         try:
-            dir_path.mkdir(parents=True, exist_ok=True)
+            await self.io.run(functools.partial(dir_path.mkdir, parents=True, exist_ok=True))
             return ToolResult(success=True, content=f"Diretório criado: {dir_path}")
         except Exception as e:
             return ToolResult(success=False, content=None, error=f"Erro ao criar diretório: {e}")
 
+# Cliente HTTP assíncrono com pool de conexões (somente stdlib)
+_HTTP_DEFAULT_PORTS = {"http": 80, "https": 443}
+_HTTP_NO_BODY_STATUS = frozenset({204, 304})
+# Podem ser reenviados se a conexão reaproveitada cair: o servidor pode já ter recebido o request
+_HTTP_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+class HTTPResponse:
+    """Resposta HTTP já lida por completo"""
+    
+    __slots__ = ("status", "reason", "headers", "body", "connection_reused", "cache_status")
+    
+    def __init__(self, status: int, reason: str, headers: Dict[str, str], body: bytes,
+                 connection_reused: bool, cache_status: Optional[str] = None):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.connection_reused = connection_reused
+        self.cache_status = cache_status
+    
+    def with_cache_status(self, cache_status: str) -> "HTTPResponse":
+        """Cópia rasa marcada com a origem (hit, stale, revalidated, coalesced...)"""
+        return HTTPResponse(self.status, self.reason, self.headers, self.body, self.connection_reused, cache_status)
+    
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+    
+    def json(self) -> Any:
+        return _loads_json(self.body)
+
+class _HTTPConnection:
+    __slots__ = ("reader", "writer", "last_used", "requests")
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+        self.requests = 0
+    
+    def is_usable(self, idle_timeout: float) -> bool:
+        return (
+            not self.writer.is_closing()
+            and not self.reader.at_eof()
+            and time.monotonic() - self.last_used < idle_timeout
+        )
+    
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except RuntimeError:
+            pass  # Event loop da conexão já foi fechado
+
+class _HostPool:
+    __slots__ = ("semaphore", "idle", "active", "created", "reused", "waits")
+    
+    def __init__(self, max_connections: int):
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self.idle: List[_HTTPConnection] = []
+        self.active = 0
+        self.created = 0
+        self.reused = 0
+        self.waits = 0
+
+class HTTPConnectionPool:
+    """
+    Cliente HTTP/1.1 assíncrono com conexões keep-alive reaproveitadas por host
+    Cada (esquema, host, porta) tem no máximo max_connections_per_host conexões em
+    uso; as ociosas voltam para uma pilha (LIFO) e expiram após idle_timeout.
+    Resoluções DNS ficam em cache por dns_ttl segundos. O pool pertence ao event loop
+    em que foi usado; se o loop mudar, as conexões antigas são descartadas.
+    """
+    
+    def __init__(self, max_connections_per_host: int = 10, idle_timeout: float = 30.0,
+                 dns_ttl: float = 300.0, max_response_bytes: int = 10 * 1024 * 1024,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self.dns_ttl = dns_ttl
+        self.max_response_bytes = max_response_bytes
+        self.ssl_context = ssl_context
+        self._hosts: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._dns: Dict[Tuple[str, int], Tuple[float, List[Tuple[Any, ...]]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0, "retries": 0, "dns_hits": 0, "dns_misses": 0}
+    
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            for host_pool in self._hosts.values():
+                for conn in host_pool.idle:
+                    conn.close()
+            self._hosts.clear()
+            self._loop = loop
+    
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self.ssl_context is None:
+            self.ssl_context = ssl.create_default_context()
+        return self.ssl_context
+    
+    async def _resolve(self, host: str, port: int) -> List[Tuple[Any, ...]]:
+        key = (host, port)
+        cached = self._dns.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.stats["dns_hits"] += 1
+            return cached[1]
+        self.stats["dns_misses"] += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = [info[4] for info in infos]
+        self._dns[key] = (time.monotonic() + self.dns_ttl, addresses)
+        return addresses
+    
+    async def _connect(self, scheme: str, host: str, port: int) -> _HTTPConnection:
+        tls = self._get_ssl_context() if scheme == "https" else None
+        last_error: Optional[Exception] = None
+        for address in await self._resolve(host, port):
+            try:
+                reader, writer = await asyncio.open_connection(
+                    address[0], address[1], ssl=tls, server_hostname=host if tls else None
+                )
+            except OSError as e:
+                last_error = e
+                continue
+            return _HTTPConnection(reader, writer)
+        raise ConnectionError(f"Não foi possível conectar a {host}:{port}: {last_error}")
+    
+    async def _acquire(self, key: Tuple[str, str, int]) -> Tuple[_HTTPConnection, bool]:
+        host_pool = self._hosts.get(key)
+        if host_pool is None:
+            host_pool = self._hosts[key] = _HostPool(self.max_connections_per_host)
+        if host_pool.semaphore.locked():
+            host_pool.waits += 1
+        await host_pool.semaphore.acquire()
+        host_pool.active += 1
+        while host_pool.idle:
+            conn = host_pool.idle.pop()
+            if conn.is_usable(self.idle_timeout):
+                host_pool.reused += 1
+                return conn, True
+            conn.close()
+        try:
+            conn = await self._connect(*key)
+        except BaseException:
+            self._release(key, None)
+            raise
+        host_pool.created += 1
+        return conn, False
+    
+    def _release(self, key: Tuple[str, str, int], conn: Optional[_HTTPConnection], reusable: bool = False) -> None:
+        host_pool = self._hosts.get(key)
+        if host_pool is None:  # Pool descartado por troca de event loop
+            if conn is not None:
+                conn.close()
+            return
+        host_pool.active -= 1
+        host_pool.semaphore.release()
+        if conn is None:
+            return
+        if reusable:
+            conn.last_used = time.monotonic()
+            host_pool.idle.append(conn)
+        else:
+            conn.close()
+    
+    @staticmethod
+    def _header_line(name: str, value: Any) -> str:
+        value = str(value)
+        if any(char in name or char in value for char in "\r\n") or ":" in name:
+            raise ValueError(f"Header HTTP inválido: {name!r}")
+        return f"{name}: {value}\r\n"
+    
+    async def _read_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> Tuple[bytes, bool]:
+        """Lê o corpo; devolve (corpo, conexão pode ser reaproveitada)"""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            size = 0
+            while True:
+                size_line = await reader.readline()
+                if not size_line.endswith(b"\n"):
+                    # EOF no meio do corpo: não é o chunk final, a resposta está incompleta
+                    raise asyncio.IncompleteReadError(b"".join(chunks), None)
+                chunk_size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if chunk_size == 0:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n"):
+                            return b"".join(chunks), True
+                        if not line:
+                            return b"".join(chunks), False  # Trailers interrompidos pelo servidor
+                size += chunk_size
+                if size > self.max_response_bytes:
+                    raise ValueError(f"Resposta excede {self.max_response_bytes} bytes")
+                chunks.append(await reader.readexactly(chunk_size))
+                if await reader.readexactly(2) != b"\r\n":
+                    raise ValueError("Chunk HTTP sem CRLF final")
+        if "content-length" in headers:
+            length = int(headers["content-length"])
+            if length > self.max_response_bytes:
+                raise ValueError(f"Resposta excede {self.max_response_bytes} bytes")
+            return await reader.readexactly(length), True
+        # Sem Content-Length nem chunked: o corpo termina quando o servidor fecha a conexão
+        chunks = []
+        size = 0
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                return b"".join(chunks), False
+            size += len(chunk)
+            if size > self.max_response_bytes:
+                raise ValueError(f"Resposta excede {self.max_response_bytes} bytes")
+            chunks.append(chunk)
+    
+    async def _exchange(self, conn: _HTTPConnection, request: bytes, method: str) -> Tuple[HTTPResponse, bool]:
+        conn.writer.write(request)
+        await conn.writer.drain()
+        
+        while True:
+            status_line = await conn.reader.readline()
+            if not status_line:
+                raise ConnectionResetError("Conexão fechada pelo servidor antes da resposta")
+            version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+            headers: Dict[str, str] = {}
+            while True:
+                line = await conn.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                value = value.strip()
+                headers[name] = f"{headers[name]}, {value}" if name in headers else value
+            status_code = int(status)
+            # 1xx (100 Continue, 103 Early Hints) são interinas: a resposta final vem em seguida
+            if status_code >= 200 or status_code == 101:
+                break
+        
+        if status_code == 101:
+            # Protocolo trocado: a conexão não volta a falar HTTP/1.1
+            body, reusable = b"", False
+        elif method == "HEAD" or status_code in _HTTP_NO_BODY_STATUS:
+            body, reusable = b"", True
+        else:
+            body, reusable = await self._read_body(conn.reader, headers)
+        
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            reusable = reusable and "keep-alive" in connection
+        else:
+            reusable = reusable and "close" not in connection
+        return HTTPResponse(status_code, reason, headers, body, conn.requests > 0), reusable
+    
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[bytes] = None, timeout: float = 30.0) -> HTTPResponse:
+        """Executa um request completo (conexão + envio + leitura) dentro de timeout segundos"""
+        self._check_loop()
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in _HTTP_DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"URL inválida: {url}")
+        port = parts.port or _HTTP_DEFAULT_PORTS[scheme]
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        if ":" in parts.hostname:
+            host_header = f"[{parts.hostname}]" + (f":{parts.port}" if parts.port else "")
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        
+        lines = [f"{method} {target} HTTP/1.1\r\n", self._header_line("Host", host_header)]
+        names = set()
+        for name, value in (headers or {}).items():
+            names.add(name.lower())
+            lines.append(self._header_line(name, value))
+        if "connection" not in names:
+            lines.append("Connection: keep-alive\r\n")
+        if body is not None:
+            lines.append(self._header_line("Content-Length", len(body)))
+        request = "".join(lines).encode("latin-1") + b"\r\n" + (body or b"")
+        
+        self.stats["requests"] += 1
+        key = (scheme, parts.hostname, port)
+        try:
+            return await asyncio.wait_for(self._send(key, request, method), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise TimeoutError(f"Timeout de {timeout}s excedido em {method} {url}") from None
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+    
+    async def _send(self, key: Tuple[str, str, int], request: bytes, method: str) -> HTTPResponse:
+        while True:
+            conn, reused = await self._acquire(key)
+            try:
+                response, reusable = await self._exchange(conn, request, method)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                self._release(key, conn)
+                # Conexão keep-alive fechada pelo servidor enquanto ociosa: tenta uma conexão nova
+                # (só métodos idempotentes; POST/PATCH podem já ter sido aplicados)
+                if (reused and method in _HTTP_IDEMPOTENT_METHODS
+                        and isinstance(e, (ConnectionResetError, BrokenPipeError))):
+                    self.stats["retries"] += 1
+                    continue
+                raise
+            except BaseException:
+                self._release(key, conn)
+                raise
+            conn.requests += 1
+            self._release(key, conn, reusable)
+            return response
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas globais e por host (conexões ativas, ociosas, criadas, reaproveitadas, esperas)"""
+        hosts = {}
+        for (scheme, host, port), host_pool in self._hosts.items():
+            hosts[f"{scheme}://{host}:{port}"] = {
+                "active": host_pool.active,
+                "idle": len(host_pool.idle),
+                "created": host_pool.created,
+                "reused": host_pool.reused,
+                "waits": host_pool.waits,
+                "utilization": host_pool.active / self.max_connections_per_host
+            }
+        return {
+            **self.stats,
+            "max_connections_per_host": self.max_connections_per_host,
+            "dns_cache_entries": len(self._dns),
+            "hosts": hosts
+        }
+    
+    async def close(self) -> None:
+        """Fecha todas as conexões ociosas"""
+        for host_pool in self._hosts.values():
+            for conn in host_pool.idle:
+                conn.close()
+            host_pool.idle.clear()
+
+# Status cacheáveis por padrão (RFC 9111, seção 4.2.2)
+_HTTP_CACHEABLE_STATUS = frozenset({200, 203, 204, 300, 301, 308, 404, 410})
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+def _directive_seconds(directives: Dict[str, Optional[str]], name: str) -> float:
+    try:
+        return max(0.0, float(directives.get(name) or 0))
+    except ValueError:
+        return 0.0
+
+class _CacheEntry:
+    __slots__ = ("response", "stored_at", "lifetime", "stale_window", "no_cache", "etag", "last_modified", "vary")
+    
+    def __init__(self, response: HTTPResponse, lifetime: float, stale_window: float, no_cache: bool,
+                 vary: Tuple[Tuple[str, Optional[str]], ...] = ()):
+        self.response = response
+        self.stored_at = time.monotonic()
+        self.lifetime = lifetime
+        self.stale_window = stale_window
+        self.no_cache = no_cache
+        self.etag = response.headers.get("etag")
+        self.last_modified = response.headers.get("last-modified")
+        # Valores, no request que gerou a resposta, dos headers listados em Vary
+        self.vary = vary
+    
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+    
+    def matches(self, headers: Dict[str, str]) -> bool:
+        """O request (headers em minúsculas) pede a mesma variante guardada?"""
+        return all(headers.get(name) == value for name, value in self.vary)
+
+class CachedHTTPClient:
+    """
+    Cache de respostas GET e coalescência de requests idênticos sobre um HTTPConnectionPool
+    (ou um HostGuardedClient, que aplica breaker/limitador só ao que vai ao upstream)
+    Respeita Cache-Control (max-age, no-cache, no-store, private, stale-while-revalidate),
+    Age, Vary e validadores (ETag/Last-Modified, revalidados com requests condicionais).
+    Requests GET idênticos (todos os headers iguais) em andamento compartilham uma única
+    chamada ao servidor. A chave é método + URL + os headers de cache_key_headers; cada
+    entrada guarda os valores dos headers nomeados em Vary e só serve requests com os
+    mesmos valores. O cache é compartilhado entre agentes, então private não é guardado.
+    """
+    
+    def __init__(self, client: HTTPConnectionPool, max_entries: int = 1024,
+                 max_entry_bytes: int = 1024 * 1024, stale_while_revalidate: float = 0.0,
+                 cache_key_headers: Tuple[str, ...] = ("accept", "accept-language", "authorization")):
+        self.client = client
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self.cache_key_headers = tuple(name.lower() for name in cache_key_headers)
+        self._entries: "OrderedDict[Tuple[Any, ...], _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+        self.stats = {
+            "requests": 0, "hits": 0, "stale_hits": 0, "misses": 0, "revalidated": 0,
+            "coalesced": 0, "stores": 0, "evictions": 0, "background_refreshes": 0
+        }
+    
+    def _key(self, url: str, headers: Dict[str, str]) -> Tuple[Any, ...]:
+        return ("GET", url) + tuple(headers.get(name) for name in self.cache_key_headers)
+    
+    @staticmethod
+    def _flight_key(key: Tuple[Any, ...], headers: Dict[str, str]) -> Tuple[Any, ...]:
+        # Coalescência exige todos os headers iguais: a resposta pode variar por qualquer um deles
+        return key + (tuple(sorted(headers.items())),)
+    
+    @staticmethod
+    def _vary_values(response: HTTPResponse, headers: Dict[str, str]) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+        names = {name.strip().lower() for name in response.headers.get("vary", "").split(",") if name.strip()}
+        if "*" in names:
+            return None
+        return tuple((name, headers.get(name)) for name in sorted(names))
+    
+    def _start(self, key: Tuple[Any, ...], coroutine) -> asyncio.Future:
+        task = asyncio.ensure_future(coroutine)
+        self._inflight[key] = task
+        
+        def done(finished: asyncio.Future) -> None:
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if not finished.cancelled():
+                finished.exception()  # Marca a exceção como observada
+        task.add_done_callback(done)
+        return task
+    
+    async def _single_flight(self, key: Tuple[Any, ...], factory) -> HTTPResponse:
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.stats["coalesced"] += 1
+            return (await asyncio.shield(task)).with_cache_status("coalesced")
+        return await asyncio.shield(self._start(key, factory()))
+    
+    def _store(self, key: Tuple[Any, ...], response: HTTPResponse, headers: Dict[str, str]) -> None:
+        directives = _parse_cache_control(response.headers.get("cache-control", ""))
+        vary = self._vary_values(response, headers)
+        if (
+            response.status not in _HTTP_CACHEABLE_STATUS
+            or "no-store" in directives
+            or "private" in directives
+            or vary is None
+            or len(response.body) > self.max_entry_bytes
+        ):
+            self._entries.pop(key, None)
+            return
+        entry = self._build_entry(response, directives, vary)
+        if entry.lifetime <= 0 and entry.etag is None and entry.last_modified is None and entry.stale_window <= 0:
+            self._entries.pop(key, None)  # Sem frescor nem validador: nada a reaproveitar
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+    
+    def _build_entry(self, response: HTTPResponse, directives: Dict[str, Optional[str]],
+                     vary: Tuple[Tuple[str, Optional[str]], ...]) -> _CacheEntry:
+        try:
+            age = max(0.0, float(response.headers.get("age", 0)))
+        except ValueError:
+            age = 0.0
+        lifetime = _directive_seconds(directives, "max-age") - age
+        if "must-revalidate" in directives:
+            stale_window = 0.0
+        elif "stale-while-revalidate" in directives:
+            stale_window = _directive_seconds(directives, "stale-while-revalidate")
+        else:
+            stale_window = self.stale_while_revalidate
+        return _CacheEntry(response, lifetime, stale_window, "no-cache" in directives, vary)
+    
+    async def _fetch(self, key: Tuple[Any, ...], url: str, headers: Dict[str, str], lowered: Dict[str, str],
+                     timeout: float, entry: Optional[_CacheEntry]) -> HTTPResponse:
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry.etag is not None:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                request_headers["If-Modified-Since"] = entry.last_modified
+        response = await self.client.request("GET", url, request_headers, None, timeout=timeout)
+        if response.status == 304 and entry is not None:
+            # Atualiza frescor com os headers novos e reaproveita o corpo guardado
+            merged = HTTPResponse(entry.response.status, entry.response.reason,
+                                  {**entry.response.headers, **response.headers},
+                                  entry.response.body, response.connection_reused)
+            self._store(key, merged, lowered)
+            self.stats["revalidated"] += 1
+            return merged.with_cache_status("revalidated")
+        self._store(key, response, lowered)
+        return response.with_cache_status("miss")
+    
+    def _refresh_in_background(self, key: Tuple[Any, ...], url: str, headers: Dict[str, str],
+                               lowered: Dict[str, str], timeout: float, entry: _CacheEntry) -> None:
+        flight_key = self._flight_key(key, lowered)
+        if flight_key in self._inflight:
+            return
+        self.stats["background_refreshes"] += 1
+        task = self._start(flight_key, self._fetch(key, url, headers, lowered, timeout, entry))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[bytes] = None, timeout: float = 30.0) -> HTTPResponse:
+        """Mesma interface de HTTPConnectionPool.request; só GET sem corpo passa pelo cache"""
+        if method != "GET" or body is not None:
+            return await self.client.request(method, url, headers, body, timeout=timeout)
+        
+        headers = headers or {}
+        self.stats["requests"] += 1
+        lowered = {name.lower(): value for name, value in headers.items()}
+        key = self._key(url, lowered)
+        request_directives = _parse_cache_control(lowered.get("cache-control", ""))
+        if "no-store" in request_directives:
+            self.stats["misses"] += 1
+            return await self.client.request(method, url, headers, None, timeout=timeout)
+        
+        entry = self._entries.get(key)
+        if entry is not None and not entry.matches(lowered):
+            entry = None  # Outra variante (Vary): nem serve nem revalida a guardada
+        if entry is not None and "no-cache" not in request_directives and not entry.no_cache:
+            self._entries.move_to_end(key)
+            age = entry.age()
+            if age < entry.lifetime:
+                self.stats["hits"] += 1
+                return entry.response.with_cache_status("hit")
+            if age < max(entry.lifetime, 0.0) + entry.stale_window:
+                self.stats["stale_hits"] += 1
+                self._refresh_in_background(key, url, headers, lowered, timeout, entry)
+                return entry.response.with_cache_status("stale")
+        
+        self.stats["misses"] += 1
+        return await self._single_flight(self._flight_key(key, lowered),
+                                         lambda: self._fetch(key, url, headers, lowered, timeout, entry))
+    
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Remove entradas de uma URL (ou todas)"""
+        if url is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[1] == url]:
+            del self._entries[key]
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        requests = self.stats["requests"]
+        served = self.stats["hits"] + self.stats["stale_hits"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_ratio": served / requests if requests else 0.0
+        }
+    
+    async def close(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        await self.client.close()
+
+# Proteção por host: circuit breaker e limite adaptativo de concorrência
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+class CircuitOpenError(RuntimeError):
+    """Request rejeitado porque o circuito do host está aberto"""
+
+class ConcurrencyLimitError(RuntimeError):
+    """Request rejeitado por esperar demais por uma vaga no limite de concorrência"""
+
+class HostCircuitBreaker:
+    """
+    Circuit breaker com janela deslizante de resultados
+    Abre quando a taxa de falhas (exceções de rede, 5xx/429 e chamadas acima de
+    slow_call_seconds) nas últimas window_size chamadas atinge failure_rate_threshold,
+    com pelo menos min_calls na janela. Após recovery_timeout admite até
+    half_open_max_calls sondas simultâneas e fecha após success_threshold sucessos.
+    O estado é um atributo simples: no circuito fechado, allow() é uma comparação.
+    """
+    
+    def __init__(self, name: str, window_size: int = 20, min_calls: int = 5,
+                 failure_rate_threshold: float = 0.5, slow_call_seconds: Optional[float] = None,
+                 recovery_timeout: float = 30.0, half_open_max_calls: int = 1, success_threshold: int = 2):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.state = CIRCUIT_CLOSED
+        self.opened_at = 0.0
+        self._window: deque = deque(maxlen=window_size)
+        self._failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+        self.stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+    
+    def allow(self) -> Optional[str]:
+        """Estado em que a chamada foi admitida (passar para record) ou None se rejeitada"""
+        if self.state == CIRCUIT_CLOSED:
+            return CIRCUIT_CLOSED
+        if self.state == CIRCUIT_OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.stats["rejected"] += 1
+                return None
+            self.state = CIRCUIT_HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+            logger.info(f"Circuit breaker {self.name} mudou para HALF_OPEN")
+        if self._probes >= self.half_open_max_calls:
+            self.stats["rejected"] += 1
+            return None
+        self._probes += 1
+        return CIRCUIT_HALF_OPEN
+    
+    def retry_after(self) -> float:
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+    
+    def _open(self) -> None:
+        self.state = CIRCUIT_OPEN
+        self.opened_at = time.monotonic()
+        self.stats["opened"] += 1
+        logger.warning(f"Circuit breaker {self.name} mudou para OPEN")
+    
+    def _close(self) -> None:
+        self.state = CIRCUIT_CLOSED
+        self._window.clear()
+        self._failures = 0
+        logger.info(f"Circuit breaker {self.name} mudou para CLOSED")
+    
+    def abandon(self, admitted: Optional[str]) -> None:
+        """Chamada admitida que terminou sem resultado (cancelada): libera a sonda"""
+        if admitted == CIRCUIT_HALF_OPEN and self.state == CIRCUIT_HALF_OPEN:
+            self._probes -= 1
+    
+    def record(self, admitted: Optional[str], success: bool, duration: float) -> None:
+        """Registra o resultado de uma chamada admitida em allow()"""
+        self.stats["calls"] += 1
+        if success and self.slow_call_seconds is not None and duration > self.slow_call_seconds:
+            self.stats["slow_calls"] += 1
+            success = False
+        if not success:
+            self.stats["failures"] += 1
+        
+        if admitted == CIRCUIT_HALF_OPEN:
+            if self.state != CIRCUIT_HALF_OPEN:
+                return
+            self._probes -= 1
+            if not success:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.success_threshold:
+                self._close()
+            return
+        if self.state != CIRCUIT_CLOSED:
+            return  # Resultado tardio de uma chamada admitida antes de abrir
+        
+        window = self._window
+        if len(window) == window.maxlen and not window[0]:
+            self._failures -= 1
+        window.append(success)
+        if not success:
+            self._failures += 1
+            if len(window) >= self.min_calls and self._failures / len(window) >= self.failure_rate_threshold:
+                self._open()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "state": self.state,
+            "failure_rate": self._failures / len(self._window) if self._window else 0.0,
+            "retry_after": self.retry_after() if self.state == CIRCUIT_OPEN else 0.0
+        }
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de requests simultâneos ajustado por AIMD a partir da latência
+    Sucesso com latência até latency_tolerance × latência base soma 1/limite (cerca de +1
+    por limite de chamadas); falha ou latência acima disso multiplica o limite por
+    backoff_ratio. A latência base é a menor observada, esquecida aos poucos para seguir
+    mudanças permanentes. Quem excede o limite espera até queue_timeout por uma vaga.
+    """
+    
+    def __init__(self, name: str, initial_limit: int = 10, min_limit: int = 1, max_limit: int = 100,
+                 backoff_ratio: float = 0.9, latency_tolerance: float = 2.0, queue_timeout: float = 1.0):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._waiters: deque = deque()
+        self.stats = {"acquired": 0, "queued": 0, "rejected": 0, "increases": 0, "decreases": 0}
+    
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.stats["acquired"] += 1
+            return
+        self.stats["queued"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise ConcurrencyLimitError(
+                f"Limite de concorrência para {self.name} atingido ({int(self.limit)} em andamento)"
+            ) from None
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1  # Vaga entregue a quem foi cancelado: devolve
+                self._wake()
+            raise
+        self.stats["acquired"] += 1
+    
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+    
+    def release(self, success: bool, latency: float, sample: bool = True) -> None:
+        """Devolve a vaga; com sample=True o resultado ajusta o limite"""
+        self.in_flight -= 1
+        if sample:
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * 0.01
+            if not success or latency > self.baseline * self.latency_tolerance:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+                self.stats["decreases"] += 1
+            elif self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                self.stats["increases"] += 1
+        self._wake()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "baseline_latency": self.baseline
+        }
+
+class HostGuardedClient:
+    """
+    Aplica o limitador e o circuit breaker do host a cada request enviado ao upstream
+    Fica abaixo do CachedHTTPClient: hits do cache não passam por aqui, então não
+    esperam vaga no limitador, não são barrados por breaker aberto e não viram amostras.
+    host_controls(host) devolve (breaker, limiter); qualquer um pode ser None.
+    """
+    
+    def __init__(self, client: HTTPConnectionPool, host_controls):
+        self.client = client
+        self.host_controls = host_controls
+    
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[bytes] = None, timeout: float = 30.0) -> HTTPResponse:
+        host = urlsplit(url).netloc
+        breaker, limiter = self.host_controls(host)
+        if limiter is not None:
+            await limiter.acquire()
+        admitted = breaker.allow() if breaker is not None else CIRCUIT_CLOSED
+        if admitted is None:
+            if limiter is not None:
+                limiter.release(False, 0.0, sample=False)
+            raise CircuitOpenError(
+                f"Circuit breaker aberto para {host}; nova tentativa em {breaker.retry_after():.1f}s"
+            )
+        
+        # outcome: None = sem resultado do upstream (cancelado ou erro local)
+        outcome: Optional[bool] = None
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers, body, timeout=timeout)
+            outcome = response.status < 500 and response.status != 429
+            return response
+        except (OSError, asyncio.IncompleteReadError):
+            outcome = False  # Inclui TimeoutError e falhas de conexão
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if outcome is None:
+                if breaker is not None:
+                    breaker.abandon(admitted)
+                if limiter is not None:
+                    limiter.release(False, elapsed, sample=False)
+            else:
+                if breaker is not None:
+                    breaker.record(admitted, outcome, elapsed)
+                if limiter is not None:
+                    limiter.release(outcome, elapsed)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.client.get_metrics()
+    
+    async def close(self) -> None:
+        await self.client.close()
+
 class WebAPITool(BaseMCPTool):
     """Ferramenta para chamadas de API web"""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 cpu_executor: Optional[CPUBoundExecutor] = None):
         super().__init__(
             name="web_api",
             description="Realiza chamadas para APIs web com validação",
-            config=config
+            config=config,
+            cpu_executor=cpu_executor
         )
         self.allowed_domains = self.config.get("allowed_domains", [])
         self.default_headers = self.config.get("default_headers", {
             "User-Agent": "MCP-WebAPI-Tool/1.0"
         })
+        # Pool compartilhado por todas as chamadas desta ferramenta
+        self.http = self.config.get("http_client") or HTTPConnectionPool(
+            max_connections_per_host=self.config.get("pool_size", 10),
+            idle_timeout=self.config.get("pool_idle_timeout", 30.0),
+            dns_ttl=self.config.get("dns_cache_ttl", 300.0),
+            max_response_bytes=self.config.get("max_response_bytes", 10 * 1024 * 1024)
+        )
+        # Um circuit breaker e um limitador por host, criados sob demanda
+        # (config "circuit_breaker"/"adaptive_concurrency": parâmetros, ou False para desligar)
+        self.breakers: Dict[str, HostCircuitBreaker] = {}
+        self.limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self.upstream = HostGuardedClient(self.http, self._host_controls)
+        self.cache: Optional[CachedHTTPClient] = None
+        if self.config.get("response_cache", True):
+            self.cache = CachedHTTPClient(
+                self.upstream,
+                max_entries=self.config.get("cache_max_entries", 1024),
+                max_entry_bytes=self.config.get("cache_max_entry_bytes", 1024 * 1024),
+                stale_while_revalidate=self.config.get("stale_while_revalidate", 0.0),
+                **({"cache_key_headers": tuple(self.config["cache_key_headers"])}
+                   if "cache_key_headers" in self.config else {})
+            )
     
     def get_parameters(self) -> List[ToolParameter]:
         return [
@@ -352,42 +2149,61 @@ class WebAPITool(BaseMCPTool):
     async def execute(self, url: str, method: str = "GET", headers: Dict[str, str] = None, data: Dict[str, Any] = None, timeout: int = 30) -> ToolResult:
         """Executa chamada de API"""
         try:
-            # Valida request usando Pydantic
-            api_request = APICallRequest(
-                url=url,
-                method=method,
-                headers=headers or {},
-                data=data,
-                timeout=timeout
-            )
+            # Valida request usando Pydantic (requests sem corpo em cache)
+            api_request = validate_api_request(url, method, headers, data, timeout)
             
             # Verifica domínio se lista de permitidos estiver configurada
             if self.allowed_domains:
-                from urllib.parse import urlparse
-                domain = urlparse(api_request.url).netloc
+                domain = urlsplit(api_request.url).netloc
                 if domain not in self.allowed_domains:
                     raise ValueError(f"Domínio não permitido: {domain}")
             
-            # Simula chamada HTTP (substitua por implementação real com aiohttp)
-            await asyncio.sleep(0.1)  # Simula latência
+            request_headers = {**self.default_headers, **api_request.headers}
+            body = None
+            if api_request.data is not None:
+                body = _dumps_json(api_request.data, "compact").encode()
+                if not any(name.lower() == "content-type" for name in request_headers):
+                    request_headers["Content-Type"] = "application/json"
+            
+            start = time.perf_counter()
+            response = await (self.cache or self.upstream).request(
+                api_request.method, api_request.url, request_headers, body, timeout=api_request.timeout
+            )
+            elapsed = time.perf_counter() - start
+            
+            content_type = response.headers.get("content-type", "")
+            try:
+                response_data = response.json() if "json" in content_type else response.text()
+            except ValueError:
+                response_data = response.text()
             
-            # Mock response para demonstração
-            mock_response = {
-                "status": "success",
+            metadata = {
                 "method": api_request.method,
                 "url": api_request.url,
-                "timestamp": time.time(),
-                "data": "Mock response data"
+                "timeout": api_request.timeout,
+                "status_code": response.status,
+                "elapsed": elapsed,
+                "connection_reused": response.connection_reused,
+                "cache": response.cache_status
             }
+            if response.status >= 400:
+                return ToolResult(
+                    success=False,
+                    content=None,
+                    error=f"HTTP {response.status} {response.reason}".rstrip(),
+                    metadata=metadata
+                )
             
             return ToolResult(
                 success=True,
-                content=json.dumps(mock_response, indent=2),
-                metadata={
+                content=json.dumps({
+                    "status": "success",
+                    "status_code": response.status,
                     "method": api_request.method,
                     "url": api_request.url,
-                    "timeout": api_request.timeout
-                }
+                    "data": response_data
+                }, indent=2),
+                metadata=metadata
             )
             
         except Exception as e:
@@ -396,15 +2212,764 @@ class WebAPITool(BaseMCPTool):
                 content=None,
                 error=str(e)
             )
+    
+    def _host_controls(self, host: str) -> Tuple[Optional[HostCircuitBreaker], Optional[AdaptiveConcurrencyLimiter]]:
+        breaker = self.breakers.get(host)
+        breaker_config = self.config.get("circuit_breaker", {})
+        if breaker is None and breaker_config is not False:
+            breaker = self.breakers[host] = HostCircuitBreaker(host, **breaker_config)
+        limiter = self.limiters.get(host)
+        limiter_config = self.config.get("adaptive_concurrency", {})
+        if limiter is None and limiter_config is not False:
+            limiter = self.limiters[host] = AdaptiveConcurrencyLimiter(host, **limiter_config)
+        return breaker, limiter
+    
+    def get_host_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Estado do circuit breaker e do limitador de cada host"""
+        hosts = {}
+        for host in self.breakers.keys() | self.limiters.keys():
+            hosts[host] = {
+                "circuit_breaker": self.breakers[host].get_stats() if host in self.breakers else None,
+                "concurrency": self.limiters[host].get_stats() if host in self.limiters else None
+            }
+        return hosts
+    
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Utilização do pool de conexões HTTP"""
+        return self.http.get_metrics()
+    
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Hit ratio, revalidações e requests coalescidos do cache de respostas"""
+        return self.cache.get_metrics() if self.cache is not None else {}
+    
+    async def close(self) -> None:
+        if self.cache is not None:
+            await self.cache.close()
+        else:
+            await self.upstream.close()
+
+OUTPUT_FORMATS = ("pretty", "compact")
+
+def _loads_json(text: str) -> Any:
+    """Decodifica JSON com orjson quando disponível"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # Inteiros fora de 64 bits, NaN etc.: o módulo json decide (e formata o erro)
+    return json.loads(text)
+
+def _dumps_json(value: Any, output_format: str = "pretty") -> str:
+    """Serializa JSON no formato pedido ("pretty" com indentação 2 ou "compact")"""
+    if orjson is not None:
+        try:
+            if output_format == "pretty":
+                return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass  # Chaves não-string ou inteiros grandes: cai para o módulo json
+    if output_format == "pretty":
+        return json.dumps(value, indent=2)
+    return json.dumps(value, separators=(",", ":"))
+
+def _utf8_size(text: str) -> int:
+    """Tamanho em bytes (UTF-8) de um texto; ASCII puro dispensa a cópia do encode"""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+class JSONStreamError(ValueError):
+    """Erro de sintaxe encontrado pelo parser incremental"""
+
+class JSONPullParser:
+    """
+    Parser JSON incremental (pull) sobre uma string
+    Percorre o documento sem montar o grafo de objetos: o chamador decide, valor a
+    valor, se lê (read_value), desce (iter_object/iter_array) ou pula (skip_value).
+    Trechos pulados só têm a estrutura (aspas e colchetes) verificada.
+    """
+    
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+    _STRING_TAIL = re.compile(r'(?:[^"\\]|\\.)*"', re.S)
+    _STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.S)
+    _SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?|true|false|null")
+    _TYPE_NAMES = {'"': "str", "{": "dict", "[": "list", "t": "bool", "f": "bool", "n": "NoneType"}
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self._decoder = json.JSONDecoder()
+    
+    def _error(self, message: str) -> JSONStreamError:
+        return JSONStreamError(f"{message}: char {self.pos}")
+    
+    def _skip_whitespace(self) -> None:
+        self.pos = self._WHITESPACE.match(self.text, self.pos).end()
+    
+    def peek(self) -> str:
+        """Primeiro caractere do próximo valor ('' no fim do texto)"""
+        self._skip_whitespace()
+        return self.text[self.pos:self.pos + 1]
+    
+    def peek_type(self) -> str:
+        """Nome do tipo Python do próximo valor, sem decodificá-lo"""
+        char = self.peek()
+        type_name = self._TYPE_NAMES.get(char)
+        if type_name is not None:
+            return type_name
+        match = self._SCALAR.match(self.text, self.pos)
+        if match is None:
+            raise self._error("Valor JSON esperado")
+        return "float" if match.group(1) or match.group(2) else "int"
+    
+    def read_value(self) -> Any:
+        """Decodifica o próximo valor por completo (usar só para valores pequenos)"""
+        self._skip_whitespace()
+        try:
+            value, self.pos = self._decoder.raw_decode(self.text, self.pos)
+        except json.JSONDecodeError as e:
+            raise JSONStreamError(str(e)) from None
+        return value
+    
+    def skip_value(self) -> None:
+        """Avança sobre o próximo valor sem construí-lo"""
+        char = self.peek()
+        if char == '"':
+            match = self._STRING_TAIL.match(self.text, self.pos + 1)
+            if match is None:
+                raise self._error("String não terminada")
+            self.pos = match.end()
+        elif char in ("{", "["):
+            depth = 0
+            for match in self._STRUCTURE.finditer(self.text, self.pos):
+                token = match.group(0)
+                if token in ("{", "["):
+                    depth += 1
+                elif token in ("}", "]"):
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = match.end()
+                        return
+            raise self._error("Estrutura não terminada")
+        else:
+            match = self._SCALAR.match(self.text, self.pos)
+            if match is None:
+                raise self._error("Valor JSON esperado")
+            self.pos = match.end()
+    
+    def _expect(self, char: str) -> None:
+        self._skip_whitespace()
+        if self.text[self.pos:self.pos + 1] != char:
+            raise self._error(f"Esperado '{char}'")
+        self.pos += 1
+    
+    def iter_object(self):
+        """Itera as chaves de um objeto; após cada chave o valor deve ser consumido"""
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Chave de objeto esperada")
+            key = self.read_value()
+            self._expect(":")
+            self._skip_whitespace()
+            start = self.pos
+            yield key
+            if self.pos == start:
+                self.skip_value()
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._error("Esperado ',' ou '}'")
+    
+    def iter_array(self):
+        """Itera os índices de um array; após cada índice o item deve ser consumido"""
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            self._skip_whitespace()
+            start = self.pos
+            yield index
+            if self.pos == start:
+                self.skip_value()
+            index += 1
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error("Esperado ',' ou ']'")
+    
+    def finish(self) -> None:
+        """Garante que não há dados após o valor de topo"""
+        if self.peek():
+            raise self._error("Dados extras após o valor JSON")
+
+class _Reservoir:
+    """
+    Amostra de tamanho fixo de uma sequência de tamanho desconhecido
+    Em modo "reservoir" usa o algoritmo L: o próximo índice aceito é sorteado de
+    antemão (next_index), então quem tem acesso aleatório pode pular direto para ele.
+    Em modo "head" mantém apenas os primeiros itens.
+    """
+    
+    def __init__(self, size: int, mode: str, seed: str):
+        self.size = size
+        self.items: List[Tuple[int, Any]] = []
+        self.next_index = 0 if size > 0 else sys.maxsize
+        self._mode = mode
+        self._seed = seed
+        self._rng: Optional[random.Random] = None
+        self._weight = 0.0
+        self.sampled = False
+    
+    def _uniform(self) -> float:
+        return self._rng.random() or sys.float_info.min
+    
+    def _advance(self) -> None:
+        if self._weight >= 1.0:
+            self.next_index += 1
+        else:
+            self.next_index += int(math.log(self._uniform()) / math.log1p(-self._weight)) + 1
+    
+    def offer(self, index: int, item: Any) -> None:
+        if index != self.next_index:
+            self.sampled = True
+            return
+        if len(self.items) < self.size:
+            self.items.append((index, item))
+            if len(self.items) < self.size:
+                self.next_index += 1
+            elif self._mode == "head":
+                self.next_index = sys.maxsize
+            else:
+                # RNG por contêiner: a amostra não depende da ordem de travessia
+                self._rng = random.Random(self._seed)
+                self._weight = math.exp(math.log(self._uniform()) / self.size)
+                self._advance()
+            return
+        self.sampled = True
+        self.items[self._rng.randrange(self.size)] = (index, item)
+        self._weight *= math.exp(math.log(self._uniform()) / self.size)
+        self._advance()
+    
+    def result(self) -> List[Any]:
+        """Itens amostrados na ordem original"""
+        return [item for _, item in sorted(self.items, key=operator.itemgetter(0))]
+
+class StructureAnalyzer:
+    """
+    Análise estrutural iterativa (em largura) de documentos JSON
+    Limita profundidade (max_depth), largura (max_keys chaves e sample_items itens
+    amostrados por contêiner) e o total de nós visitados (max_nodes), de modo que a
+    latência não depende da forma da entrada. Também agrega contagens por tipo.
+    Funciona sobre dados já decodificados (analyze) ou sobre o texto (analyze_text).
+    """
+    
+    DEFAULTS = {
+        "max_depth": 3,
+        "max_keys": 100,
+        "sample_items": 3,
+        "max_nodes": 10000,
+        "sampling": "reservoir",
+        "seed": 0
+    }
+    SAMPLING_MODES = ("reservoir", "head")
+    _CONTAINER_TYPES = {"dict": "object", "list": "array"}
+    
+    def __init__(self, max_depth: int = 3, max_keys: int = 100, sample_items: int = 3,
+                 max_nodes: int = 10000, sampling: str = "reservoir", seed: Any = 0):
+        for name, value, minimum in (("max_depth", max_depth, 0), ("max_keys", max_keys, 0),
+                                     ("sample_items", sample_items, 0), ("max_nodes", max_nodes, 1)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                raise ValueError(f"{name} deve ser um inteiro >= {minimum}")
+        if sampling not in self.SAMPLING_MODES:
+            raise ValueError(f"Amostragem '{sampling}' não suportada (use {', '.join(self.SAMPLING_MODES)})")
+        self.max_depth = max_depth
+        self.max_keys = max_keys
+        self.sample_items = sample_items
+        self.max_nodes = max_nodes
+        self.sampling = sampling
+        self.seed = seed
+    
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], config: Dict[str, Any]) -> "StructureAnalyzer":
+        """Opções da chamada têm precedência sobre a configuração da ferramenta"""
+        return cls(**{name: options.get(name, config.get(name, default))
+                      for name, default in cls.DEFAULTS.items()})
+    
+    def _reservoir(self, size: int, path: str) -> _Reservoir:
+        return _Reservoir(size, self.sampling, f"{self.seed}{path}")
+    
+    def analyze(self, data: Any) -> Dict[str, Any]:
+        """Analisa dados já decodificados"""
+        return self._run(data, self._expand_value, self._value_type)
+    
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """Analisa o texto JSON sem decodificar valores fora da amostra"""
+        parser = JSONPullParser(text)
+        parser.peek()
+        root_end = []
+        
+        def expand(pos, depth, path, node, stats):
+            parser.pos = pos
+            children = self._expand_text(parser, depth, path, node, stats)
+            if not root_end:
+                root_end.append(parser.pos)
+            return children
+        
+        def type_of(pos):
+            parser.pos = pos
+            type_name = parser.peek_type()
+            return self._CONTAINER_TYPES.get(type_name, type_name)
+        
+        analysis = self._run(parser.pos, expand, type_of)
+        parser.pos = root_end[0]
+        parser.finish()
+        return analysis
+    
+    def _run(self, root: Any, expand, type_of) -> Dict[str, Any]:
+        stats: Dict[str, Dict[str, Any]] = {}
+        analysis: Dict[str, Any] = {}
+        queue = deque([(root, 0, "", analysis)])
+        visited = 0
+        while queue and visited < self.max_nodes:
+            handle, depth, path, node = queue.popleft()
+            visited += 1
+            for child in expand(handle, depth, path, node, stats) or ():
+                queue.append(child)
+        
+        # Nós enfileirados além do orçamento ficam só com o tipo
+        for handle, depth, _, node in queue:
+            node.update(type=type_of(handle), depth=depth, truncated=True)
+        
+        nulls = stats.get("NoneType", {}).get("count", 0)
+        analysis.update({
+            "nodes_visited": visited,
+            "truncated": bool(queue),
+            "aggregates": {
+                "types": stats,
+                "null_ratio": round(nulls / visited, 4)
+            }
+        })
+        return analysis
+    
+    @staticmethod
+    def _record(stats: Dict[str, Dict[str, Any]], type_name: str, value: Any = None) -> str:
+        """Acumula contagem por tipo, min/max numéricos e maior string"""
+        entry = stats.get(type_name)
+        if entry is None:
+            entry = stats[type_name] = {"count": 0}
+        entry["count"] += 1
+        if type_name in ("int", "float"):
+            entry["min"] = value if entry.get("min") is None else min(entry["min"], value)
+            entry["max"] = value if entry.get("max") is None else max(entry["max"], value)
+        elif type_name == "str":
+            entry["max_length"] = max(entry.get("max_length", 0), len(value))
+        return type_name
+    
+    @staticmethod
+    def _scalar_node(node: Dict[str, Any], type_name: str, value: Any, depth: int) -> None:
+        node.update(type=type_name, value=str(value)[:100], depth=depth)
+    
+    def _value_type(self, value: Any) -> str:
+        type_name = type(value).__name__
+        return self._CONTAINER_TYPES.get(type_name, type_name)
+    
+    def _expand_value(self, value, depth, path, node, stats):
+        """Expande um valor Python; devolve os filhos a enfileirar"""
+        type_name = self._record(stats, type(value).__name__, value)
+        if isinstance(value, dict):
+            keys = list(value)
+            reservoir = self._reservoir(self.max_keys, path)
+            while reservoir.next_index < len(keys):
+                reservoir.offer(reservoir.next_index, keys[reservoir.next_index])
+            reservoir.sampled = len(keys) > self.max_keys
+            entries = [(key, value[key]) for key in reservoir.result()]
+            return self._link(node, "object", len(keys), depth, path, entries, reservoir)
+        if isinstance(value, list):
+            if depth < self.max_depth:
+                reservoir = self._reservoir(self.sample_items, path)
+                while reservoir.next_index < len(value):
+                    reservoir.offer(reservoir.next_index, reservoir.next_index)
+                entries = [(index, value[index]) for index in reservoir.result()]
+            else:
+                reservoir = self._reservoir(0, path)
+                entries = []
+            reservoir.sampled = len(value) > len(entries)
+            return self._link(node, "array", len(value), depth, path, entries, reservoir)
+        self._scalar_node(node, type_name, value, depth)
+        return None
+    
+    def _expand_text(self, parser: "JSONPullParser", depth, path, node, stats):
+        """Expande o valor na posição atual do parser; filhos são posições no texto"""
+        char = parser.peek()
+        if char == "{":
+            self._record(stats, "dict")
+            reservoir = self._reservoir(self.max_keys, path)
+            count = 0
+            for key in parser.iter_object():
+                reservoir.offer(count, (key, parser.pos))
+                count += 1
+            return self._link(node, "object", count, depth, path, reservoir.result(), reservoir)
+        if char == "[":
+            self._record(stats, "list")
+            size = self.sample_items if depth < self.max_depth else 0
+            reservoir = self._reservoir(size, path)
+            count = 0
+            for index in parser.iter_array():
+                reservoir.offer(index, (index, parser.pos))
+                count += 1
+            reservoir.sampled = count > len(reservoir.items)
+            return self._link(node, "array", count, depth, path, reservoir.result(), reservoir)
+        value = parser.read_value()
+        self._scalar_node(node, self._record(stats, type(value).__name__, value), value, depth)
+        return None
+    
+    def _link(self, node, kind, count, depth, path, entries, reservoir):
+        """Preenche o nó do contêiner e devolve os filhos amostrados para a fila"""
+        node["type"] = kind
+        if kind == "object":
+            node["keys"] = [key for key, _ in entries]
+            node["key_count"] = count
+        else:
+            node["length"] = count
+        node["depth"] = depth
+        if reservoir.sampled:
+            node["sampled"] = True
+        children: List[Tuple[Any, int, str, Dict[str, Any]]] = []
+        if kind == "object":
+            node["children"] = {}
+            if depth < self.max_depth:
+                for key, handle in entries:
+                    child = node["children"][key] = {}
+                    children.append((handle, depth + 1, f"{path}/{key}", child))
+        else:
+            node["sample_items"] = []
+            for index, handle in entries:
+                child = {}
+                node["sample_items"].append(child)
+                children.append((handle, depth + 1, f"{path}/{index}", child))
+        return children
+
+# Tipos JSON-Schema aceitos por SchemaValidator
+_SCHEMA_TYPES = {**_PARAMETER_TYPES, "array": (list,), "null": (type(None),)}
+SCHEMA_CACHE_SIZE = 256
+DEFAULT_ERROR_SAMPLES = 20
+
+class SchemaValidator:
+    """
+    Validador compilado de um subconjunto de JSON Schema
+    Suporta type, enum, required, properties, additionalProperties, items, minimum,
+    maximum, minLength, maxLength, pattern, minItems e maxItems. Cada nó vira uma
+    função com caminho ("$.user.name", "$.tags[*]") resolvido na compilação, então
+    validar um registro não monta strings a não ser quando há erro.
+    """
+    
+    __slots__ = ("schema", "_check")
+    
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self._check = self._compile(schema, "$")
+    
+    def _compile(self, schema: Any, path: str):
+        if not isinstance(schema, dict):
+            raise ValueError(f"Schema inválido em {path}: esperado objeto")
+        checks = []
+        
+        type_spec = schema.get("type")
+        type_check = None
+        if type_spec is not None:
+            names = type_spec if isinstance(type_spec, list) else [type_spec]
+            unknown = [name for name in names if name not in _SCHEMA_TYPES]
+            if unknown:
+                raise ValueError(f"Schema inválido em {path}: tipo desconhecido {unknown[0]!r}")
+            python_types = tuple({t for name in names for t in _SCHEMA_TYPES[name]})
+            allow_bool = "boolean" in names
+            type_message = f"tipo esperado {' ou '.join(names)}"
+            
+            def type_check(value, errors):
+                if not isinstance(value, python_types) or (value.__class__ is bool and not allow_bool):
+                    errors.append((path, "type", type_message))
+                    return False
+                return True
+        
+        if "enum" in schema:
+            enum = schema["enum"]
+            try:
+                allowed = frozenset(enum)
+            except TypeError:
+                allowed = enum
+            enum_message = f"valor fora de {enum}"
+            
+            def check_enum(value, errors):
+                try:
+                    ok = value in allowed
+                except TypeError:
+                    ok = value in enum
+                if not ok:
+                    errors.append((path, "enum", enum_message))
+            checks.append(check_enum)
+        
+        for keyword, compare, label in (("minimum", operator.lt, "menor que"), ("maximum", operator.gt, "maior que")):
+            if keyword in schema:
+                def check_bound(value, errors, limit=schema[keyword], compare=compare,
+                                keyword=keyword, message=f"{label} {schema[keyword]}"):
+                    if isinstance(value, (int, float)) and value.__class__ is not bool and compare(value, limit):
+                        errors.append((path, keyword, message))
+                checks.append(check_bound)
+        
+        for keyword, kinds, compare, label in (
+            ("minLength", str, operator.lt, "comprimento menor que"),
+            ("maxLength", str, operator.gt, "comprimento maior que"),
+            ("minItems", list, operator.lt, "menos itens que"),
+            ("maxItems", list, operator.gt, "mais itens que"),
+        ):
+            if keyword in schema:
+                def check_size(value, errors, limit=schema[keyword], kinds=kinds, compare=compare,
+                               keyword=keyword, message=f"{label} {schema[keyword]}"):
+                    if isinstance(value, kinds) and compare(len(value), limit):
+                        errors.append((path, keyword, message))
+                checks.append(check_size)
+        
+        if "pattern" in schema:
+            search = re.compile(schema["pattern"]).search
+            pattern_message = f"não corresponde a {schema['pattern']!r}"
+            
+            def check_pattern(value, errors):
+                if isinstance(value, str) and search(value) is None:
+                    errors.append((path, "pattern", pattern_message))
+            checks.append(check_pattern)
+        
+        required = tuple(schema.get("required", ()))
+        properties = tuple(
+            (name, self._compile(child, f"{path}.{name}"))
+            for name, child in schema.get("properties", {}).items()
+        )
+        closed = schema.get("additionalProperties", True) is False
+        known = frozenset(schema.get("properties", {}))
+        if required or properties or closed:
+            def check_object(value, errors):
+                if not isinstance(value, dict):
+                    return
+                for name in required:
+                    if name not in value:
+                        errors.append((path, "required", f"Campo obrigatório ausente: {name}"))
+                for name, check in properties:
+                    if name in value:
+                        check(value[name], errors)
+                if closed:
+                    for name in value.keys() - known:
+                        errors.append((path, "additionalProperties", f"campo não permitido: {name}"))
+            checks.append(check_object)
+        
+        if "items" in schema:
+            item_check = self._compile(schema["items"], f"{path}[*]")
+            
+            def check_items(value, errors):
+                if isinstance(value, list):
+                    for item in value:
+                        item_check(item, errors)
+            checks.append(check_items)
+        
+        checks = tuple(checks)
+        
+        def check(value, errors):
+            if type_check is not None and not type_check(value, errors):
+                return
+            for rule in checks:
+                rule(value, errors)
+        return check
+    
+    def errors(self, value: Any) -> List[Tuple[str, str, str]]:
+        """Lista de (caminho, regra, mensagem) para um valor"""
+        errors: List[Tuple[str, str, str]] = []
+        self._check(value, errors)
+        return errors
+    
+    def validate_many(self, records: List[Any], max_samples: int = DEFAULT_ERROR_SAMPLES) -> Dict[str, Any]:
+        """Valida registros em lote: contagens por caminho/regra e amostra das falhas"""
+        check = self._check
+        counts: Dict[str, int] = {}
+        samples: List[str] = []
+        invalid = 0
+        total = 0
+        errors: List[Tuple[str, str, str]] = []
+        for index, record in enumerate(records):
+            check(record, errors)
+            if not errors:
+                continue
+            invalid += 1
+            total += len(errors)
+            for path, keyword, message in errors:
+                key = f"{path}: {keyword}"
+                counts[key] = counts.get(key, 0) + 1
+                if len(samples) < max_samples:
+                    samples.append(f"[{index}] {path}: {message}")
+            errors.clear()
+        return {
+            "record_count": len(records),
+            "invalid_records": invalid,
+            "error_count": total,
+            "error_counts": counts,
+            "errors": samples
+        }
+
+_compiled_schemas: "OrderedDict[str, SchemaValidator]" = OrderedDict()
+_compiled_schemas_lock = threading.Lock()
+
+def compile_schema(schema: Dict[str, Any]) -> SchemaValidator:
+    """Compila o schema uma vez; validadores ficam em cache LRU pelo hash do schema canônico"""
+    digest = hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+    with _compiled_schemas_lock:
+        validator = _compiled_schemas.get(digest)
+        if validator is not None:
+            _compiled_schemas.move_to_end(digest)
+            return validator
+    validator = SchemaValidator(schema)
+    with _compiled_schemas_lock:
+        _compiled_schemas[digest] = validator
+        if len(_compiled_schemas) > SCHEMA_CACHE_SIZE:
+            _compiled_schemas.popitem(last=False)
+    return validator
+
+class RecordTransformer:
+    """
+    Transformações de chaves (flatten, uppercase_keys) sobre um registro ou lotes de registros
+    Os caminhos de chave ("a.b.c") e as chaves em maiúsculas ficam em cache entre
+    registros, então lotes grandes reutilizam as mesmas strings em vez de recriá-las.
+    Com fields, só os caminhos pedidos são extraídos; com layout="columnar", a saída
+    é um dicionário de colunas (listas alinhadas, None onde o registro não tem o campo)
+    preenchido direto, sem dicionário intermediário por registro.
+    """
+    
+    TRANSFORMS = ("uppercase_keys", "flatten")
+    LAYOUTS = ("records", "columnar")
+    _MISSING = object()
+    
+    def __init__(self, transform_type: str, fields: Optional[List[str]] = None, layout: str = "records"):
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Layout '{layout}' não suportado (use {', '.join(self.LAYOUTS)})")
+        if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) and f for f in fields)):
+            raise ValueError("fields deve ser uma lista de caminhos de chave (ex.: 'user.name')")
+        self.transform_type = transform_type
+        self.layout = layout
+        # Árvore de caminhos: chave -> [nome de saída, subárvore]
+        self._paths: Dict[str, List[Any]] = {}
+        self._fields = None
+        if fields is not None:
+            self._fields = [(self._output_name(field), tuple(field.split("."))) for field in fields]
+    
+    def _output_name(self, path: str) -> str:
+        return path.upper() if self.transform_type == "uppercase_keys" else path
+    
+    def _entry(self, node: Dict[str, List[Any]], key: str, prefix: Optional[str]) -> List[Any]:
+        entry = node[key] = [self._output_name(key if prefix is None else f"{prefix}.{key}"), {}]
+        return entry
+    
+    def _flatten_into(self, record: Dict[str, Any], node: Dict[str, List[Any]],
+                      prefix: Optional[str], result: Dict[str, Any]) -> None:
+        for key, value in record.items():
+            entry = node.get(key) or self._entry(node, key, prefix)
+            if isinstance(value, dict):
+                self._flatten_into(value, entry[1], entry[0], result)
+            else:
+                result[entry[0]] = value
+    
+    def _flatten_columns(self, record: Dict[str, Any], node: Dict[str, List[Any]],
+                         prefix: Optional[str], row: int, columns: Dict[str, List[Any]]) -> None:
+        for key, value in record.items():
+            entry = node.get(key) or self._entry(node, key, prefix)
+            if isinstance(value, dict):
+                self._flatten_columns(value, entry[1], entry[0], row, columns)
+                continue
+            column = columns.setdefault(entry[0], [])
+            if len(column) > row:
+                # Chave literal "a.b" colidindo com {"a": {"b": ...}}: o último valor vence,
+                # como no layout records
+                column[row] = value
+                continue
+            if len(column) < row:
+                column.extend([None] * (row - len(column)))
+            column.append(value)
+    
+    def _project(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        result = {}
+        missing = self._MISSING
+        for name, path in self._fields:
+            value = record
+            for key in path:
+                value = value.get(key, missing) if isinstance(value, dict) else missing
+                if value is missing:
+                    break
+            if value is not missing:
+                result[name] = value
+        return result
+    
+    def transform_record(self, record: Any) -> Any:
+        """Transforma um registro; valores que não são objetos passam inalterados"""
+        if not isinstance(record, dict):
+            return record
+        if self._fields is not None:
+            return self._project(record)
+        if self.transform_type == "flatten":
+            result = {}
+            self._flatten_into(record, self._paths, None, result)
+            return result
+        paths = self._paths
+        return {(paths.get(key) or self._entry(paths, key, None))[0]: value for key, value in record.items()}
+    
+    def transform(self, data: Any) -> Any:
+        """Transforma um objeto ou uma lista de registros no layout configurado"""
+        if self.transform_type not in self.TRANSFORMS:
+            return data
+        if self.layout == "records":
+            if not isinstance(data, list):
+                return self.transform_record(data)
+            transform_record = self.transform_record
+            return [transform_record(record) for record in data]
+        
+        records = data if isinstance(data, list) else [data]
+        columns: Dict[str, List[Any]] = {}
+        if self._fields is not None:
+            for name, _ in self._fields:
+                columns[name] = []
+        flatten_columns = self.transform_type == "flatten" and self._fields is None
+        for row, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise ValueError(f"Registro {row} não é um objeto; layout columnar exige objetos")
+            if flatten_columns:
+                self._flatten_columns(record, self._paths, None, row, columns)
+                continue
+            for name, value in self.transform_record(record).items():
+                column = columns.setdefault(name, [])
+                if len(column) < row:
+                    column.extend([None] * (row - len(column)))
+                column.append(value)
+        row_count = len(records)
+        for column in columns.values():
+            if len(column) < row_count:
+                column.extend([None] * (row_count - len(column)))
+        return {"row_count": row_count, "columns": columns}
 
 class DataProcessingTool(BaseMCPTool):
     """Ferramenta para processamento de dados"""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    cpu_bound = True
+    cpu_offload_min_bytes = 256 * 1024
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 cpu_executor: Optional[CPUBoundExecutor] = None):
         super().__init__(
             name="data_processor",
             description="Processa e analisa dados estruturados",
-            config=config
+            config=config,
+            cpu_executor=cpu_executor
         )
     
     def get_parameters(self) -> List[ToolParameter]:
@@ -430,113 +2995,173 @@ class DataProcessingTool(BaseMCPTool):
             )
         ]
     
+    STREAMING_OPERATIONS = ("analyze", "summarize")
+    DEFAULT_STREAM_THRESHOLD = 64 * 1024 * 1024
+    
+    def _use_streaming(self, operation: str, data_size: int, options: Dict[str, Any]) -> bool:
+        """Decide se a operação percorre o JSON sem materializá-lo"""
+        if operation not in self.STREAMING_OPERATIONS:
+            return False
+        if "stream" in options:
+            return bool(options["stream"])
+        threshold = self.config.get("stream_threshold_bytes", self.DEFAULT_STREAM_THRESHOLD)
+        return threshold is not None and data_size >= threshold
+    
+    def _output_format(self, options: Dict[str, Any]) -> str:
+        output_format = options.get("output_format", self.config.get("output_format", "pretty"))
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Formato de saída '{output_format}' não suportado (use {', '.join(OUTPUT_FORMATS)})")
+        return output_format
+    
     async def execute(self, operation: str, data: str, options: Dict[str, Any] = None) -> ToolResult:
         """Executa processamento de dados"""
         try:
+            options = options or {}
+            output_format = self._output_format(options)
+            # Tamanhos reportados em bytes da origem, não em caracteres
+            data_size = _utf8_size(data)
+            
+            if self._use_streaming(operation, data_size, options):
+                try:
+                    if operation == "analyze":
+                        result = self._analyze_stream(data, options, data_size)
+                    else:
+                        result = self._summarize_stream(data, data_size)
+                except JSONStreamError as e:
+                    return ToolResult(success=False, content=None, error=f"Dados JSON inválidos: {e}")
+                return ToolResult(
+                    success=True,
+                    content=_dumps_json(result, output_format),
+                    metadata={"operation": operation, "data_size": data_size, "streamed": True}
+                )
+            
             # Parse dos dados JSON
             try:
-                parsed_data = json.loads(data)
+                parsed_data = _loads_json(data)
             except json.JSONDecodeError as e:
                 return ToolResult(success=False, content=None, error=f"Dados JSON inválidos: {e}")
             
-            options = options or {}
-            
             if operation == "analyze":
-                result = await self._analyze_data(parsed_data, options)
+                result = await self._analyze_data(parsed_data, options, data_size=data_size)
             elif operation == "transform":
                 result = await self._transform_data(parsed_data, options)
             elif operation == "validate":
                 result = await self._validate_data(parsed_data, options)
             elif operation == "summarize":
-                result = await self._summarize_data(parsed_data, options)
+                result = await self._summarize_data(parsed_data, options, data_size=data_size)
             else:
                 raise ValueError(f"Operação '{operation}' não suportada")
             
             return ToolResult(
                 success=True,
-                content=json.dumps(result, indent=2),
-                metadata={"operation": operation, "data_size": len(data)}
+                content=_dumps_json(result, output_format),
+                metadata={"operation": operation, "data_size": data_size}
             )
             
         except Exception as e:
             return ToolResult(success=False, content=None, error=str(e))
     
-    async def _analyze_data(self, data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
-        """Analisa estrutura dos dados"""
-        def analyze_structure(obj, depth=0):
-            if isinstance(obj, dict):
-                return {
-                    "type": "object",
-                    "keys": list(obj.keys()),
-                    "key_count": len(obj),
-                    "depth": depth,
-                    "children": {k: analyze_structure(v, depth + 1) for k, v in obj.items()} if depth < 3 else {}
-                }
-            elif isinstance(obj, list):
-                return {
-                    "type": "array",
-                    "length": len(obj),
-                    "depth": depth,
-                    "sample_items": [analyze_structure(item, depth + 1) for item in obj[:3]] if obj else []
-                }
-            else:
-                return {
-                    "type": type(obj).__name__,
-                    "value": str(obj)[:100] if len(str(obj)) > 100 else str(obj),
-                    "depth": depth
-                }
-        
-        analysis = analyze_structure(data)
-        analysis["total_size"] = len(json.dumps(data))
-        
+    async def _analyze_data(self, data: Any, options: Dict[str, Any], data_size: Optional[int] = None) -> Dict[str, Any]:
+        """Analisa estrutura dos dados (data_size: bytes do texto de origem, se conhecido)"""
+        analysis = StructureAnalyzer.from_options(options, self.config).analyze(data)
+        analysis["total_size"] = data_size if data_size is not None else _utf8_size(_dumps_json(data, "compact"))
         return analysis
     
-    async def _transform_data(self, data: Any, options: Dict[str, Any]) -> Any:
-        """Transforma dados baseado nas opções"""
-        transform_type = options.get("type", "uppercase_keys")
+    def _analyze_stream(self, data: str, options: Dict[str, Any], data_size: int) -> Dict[str, Any]:
+        """Versão incremental de _analyze_data: só materializa escalares amostrados"""
+        analysis = StructureAnalyzer.from_options(options, self.config).analyze_text(data)
+        analysis["total_size"] = data_size
+        return analysis
+    
+    def _summarize_stream(self, data: str, data_size: int) -> Dict[str, Any]:
+        """Versão incremental de _summarize_data: valores não amostrados são apenas pulados"""
+        parser = JSONPullParser(data)
+        summary = {"data_type": parser.peek_type(), "size": data_size}
         
-        if transform_type == "uppercase_keys" and isinstance(data, dict):
-            return {k.upper(): v for k, v in data.items()}
-        elif transform_type == "flatten" and isinstance(data, dict):
-            result = {}
-            def flatten(obj, prefix=""):
-                for k, v in obj.items():
-                    key = f"{prefix}.{k}" if prefix else k
-                    if isinstance(v, dict):
-                        flatten(v, key)
-                    else:
-                        result[key] = v
-            flatten(data)
-            return result
+        if summary["data_type"] == "dict":
+            keys = []
+            key_count = 0
+            has_nested = False
+            for key in parser.iter_object():
+                key_count += 1
+                if len(keys) < 10:
+                    keys.append(key)
+                if not has_nested and parser.peek() in ("{", "["):
+                    has_nested = True
+            summary.update({
+                "key_count": key_count,
+                "keys": keys,
+                "has_nested_objects": has_nested
+            })
+        elif summary["data_type"] == "list":
+            length = 0
+            item_types = set()
+            samples = []
+            for index in parser.iter_array():
+                length += 1
+                item_types.add(parser.peek_type())
+                if index < 3:
+                    samples.append(parser.read_value())
+            summary.update({
+                "length": length,
+                "item_types": list(item_types),
+                "sample_items": samples
+            })
         else:
-            return data
+            parser.skip_value()
+        
+        parser.finish()
+        return summary
+    
+    async def _transform_data(self, data: Any, options: Dict[str, Any]) -> Any:
+        """Transforma dados baseado nas opções (objeto único ou lista de registros)"""
+        transformer = RecordTransformer(
+            options.get("type", "uppercase_keys"),
+            fields=options.get("fields"),
+            layout=options.get("layout", "records")
+        )
+        return transformer.transform(data)
     
     async def _validate_data(self, data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
-        """Valida dados contra schema"""
-        errors = []
+        """
+        Valida dados contra schema (options["schema"], ou apenas options["required_fields"])
+        Listas validadas com schema que não seja do tipo array são tratadas como lote de registros
+        """
         warnings = []
+        schema = options.get("schema")
+        if schema is None:
+            schema = {"required": options.get("required_fields", [])}
+        validator = compile_schema(schema)
+        max_samples = options.get("max_error_samples", DEFAULT_ERROR_SAMPLES)
         
-        # Validações básicas
-        if isinstance(data, dict):
-            required_fields = options.get("required_fields", [])
-            for field in required_fields:
-                if field not in data:
-                    errors.append(f"Campo obrigatório ausente: {field}")
+        if isinstance(data, list) and schema.get("type") != "array":
+            report = validator.validate_many(data, max_samples)
+        else:
+            errors = validator.errors(data)
+            counts: Dict[str, int] = {}
+            for path, keyword, _ in errors:
+                counts[f"{path}: {keyword}"] = counts.get(f"{path}: {keyword}", 0) + 1
+            report = {
+                "error_count": len(errors),
+                "error_counts": counts,
+                "errors": [f"{path}: {message}" for path, _, message in errors[:max_samples]]
+            }
         
-        # Mais validações podem ser adicionadas aqui
+        if report["error_count"] > len(report["errors"]):
+            warnings.append(f"{report['error_count'] - len(report['errors'])} erros omitidos da amostra")
         
         return {
-            "valid": len(errors) == 0,
-            "errors": errors,
+            "valid": report["error_count"] == 0,
+            **report,
             "warnings": warnings,
             "data_type": type(data).__name__
         }
     
-    async def _summarize_data(self, data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
-        """Cria resumo dos dados"""
+    async def _summarize_data(self, data: Any, options: Dict[str, Any], data_size: Optional[int] = None) -> Dict[str, Any]:
+        """Cria resumo dos dados (data_size: bytes do texto de origem, se conhecido)"""
         summary = {
             "data_type": type(data).__name__,
-            "size": len(json.dumps(data))
+            "size": data_size if data_size is not None else _utf8_size(_dumps_json(data, "compact"))
         }
         
         if isinstance(data, dict):
@@ -4,22 +4,51 @@ Exemplo prático de servidor MCP básico
 Demonstra o uso dos templates da coleção
 """
 
+import argparse
 import asyncio
+import functools
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import ipaddress
+import json
 import logging
-from typing import Any, Dict, List
-
-from mcp import types
-from mcp.server import Server
-from mcp.server.models import InitializationOptions
-from mcp.server.stdio import stdio_server
-from mcp.types import (
-    CallToolRequest,
-    CallToolResult,
-    ListToolsRequest,
-    ListToolsResult,
-    TextContent,
-    Tool,
-)
+import math
+import multiprocessing
+import operator
+import os
+import pickle
+import socket
+import stat
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: calculator_batch usa laço Python sem ela
+    np = None
+
+try:
+    from cpu_executor import CPUBoundExecutor
+except ImportError:
+    # Execução fora do diretório dos exemplos: carrega cpu_executor.py ao lado deste arquivo; o
+    # registro em sys.modules permite que os workers do pool resolvam as funções por nome no pickle
+    _cpu_spec = importlib.util.spec_from_file_location("cpu_executor", Path(__file__).with_name("cpu_executor.py"))
+    _cpu_module = importlib.util.module_from_spec(_cpu_spec)
+    sys.modules["cpu_executor"] = _cpu_module
+    _cpu_spec.loader.exec_module(_cpu_module)
+    from cpu_executor import CPUBoundExecutor
+
+# O SDK do MCP (e o Pydantic por trás dele) domina o tempo de import; o transporte em lote
+# não precisa dele, então só é importado ao usar a API do SDK (ver BasicMCPServer.server)
+if TYPE_CHECKING:
+    from mcp.types import CallToolRequest, CallToolResult, ListToolsResult, Tool
 
 # Configuração de logging estruturado
 logging.basicConfig(
@@ -28,16 +57,1192 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Operações da calculadora (construídas uma vez, não a cada chamada)
+CALCULATOR_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv
+}
+
+MAX_BATCH_SIZE = 100_000
+
+_OPERAND_ERROR = "Operandos 'a' e 'b' devem ser números finitos"
+_OVERFLOW_ERROR = "Resultado não finito (overflow)"
+
+def _finite_operand(value: Any) -> bool:
+    # type() e não isinstance: bool é subclasse de int e não é operando válido
+    if type(value) not in (int, float):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:  # int grande demais para float
+        return False
+
+def calculate_batch(a: List[float], b: List[float], operations: List[str]) -> Dict[str, Any]:
+    """
+    Avalia operações elemento a elemento sobre colunas de operandos
+    Erros (operando ausente ou não finito, operação inválida, divisão por zero, resultado
+    não finito por overflow) são reportados por índice, iguais com e sem NumPy
+    """
+    count = len(a)
+    if len(b) != count or len(operations) != count:
+        raise ValueError("'a', 'b' e as operações devem ter o mesmo tamanho")
+    if count > MAX_BATCH_SIZE:
+        raise ValueError(f"Lote excede o máximo de {MAX_BATCH_SIZE} operações")
+    
+    # Validação antes de avaliar: None, strings, bool, NaN e infinitos viram erro do índice
+    operands_ok = [_finite_operand(x) and _finite_operand(y) for x, y in zip(a, b)]
+    errors: Dict[int, str] = {}
+    
+    if np is not None and count:
+        if not all(operands_ok):
+            a = [x if ok else 0.0 for x, ok in zip(a, operands_ok)]
+            b = [y if ok else 0.0 for y, ok in zip(b, operands_ok)]
+        left = np.asarray(a, dtype=np.float64)
+        right = np.asarray(b, dtype=np.float64)
+        ops = np.asarray(operations, dtype=object)
+        checked = np.asarray(operands_ok, dtype=bool)
+        values = np.full(count, np.nan)
+        valid = np.zeros(count, dtype=bool)
+        
+        with np.errstate(over="ignore", invalid="ignore"):
+            for name, func in (("add", np.add), ("subtract", np.subtract), ("multiply", np.multiply)):
+                mask = ops == name
+                values[mask] = func(left[mask], right[mask])
+                valid |= mask
+            
+            divide = ops == "divide"
+            zero_division = divide & (right == 0)
+            safe_divide = divide & ~zero_division
+            values[safe_divide] = left[safe_divide] / right[safe_divide]
+            valid |= safe_divide
+        
+        for index in np.flatnonzero(~checked).tolist():
+            errors[index] = _OPERAND_ERROR
+        for index in np.flatnonzero(checked & ~valid).tolist():
+            errors[index] = _batch_error(operations[index])
+        for index in np.flatnonzero(checked & valid & ~np.isfinite(values)).tolist():
+            errors[index] = _OVERFLOW_ERROR
+        
+        results = values.tolist()
+        for index in errors:
+            results[index] = None
+    else:
+        results = []
+        for index, (x, y, name) in enumerate(zip(a, b, operations)):
+            results.append(None)
+            if not operands_ok[index]:
+                errors[index] = _OPERAND_ERROR
+                continue
+            func = CALCULATOR_OPERATIONS.get(name)
+            if func is None or (name == "divide" and y == 0):
+                errors[index] = _batch_error(name)
+                continue
+            try:
+                value = float(func(float(x), float(y)))
+            except OverflowError:
+                value = math.inf
+            if math.isfinite(value):
+                results[index] = value
+            else:
+                errors[index] = _OVERFLOW_ERROR
+    
+    return {
+        "count": count,
+        "results": results,
+        "errors": [{"index": index, "error": errors[index]} for index in sorted(errors)]
+    }
+
+def _batch_error(operation: str) -> str:
+    if operation == "divide":
+        return "Divisão por zero não é permitida"
+    return f"Operação '{operation}' não suportada"
+
+# Tamanho dos blocos lidos pelo analisador de texto em streaming
+TEXT_CHUNK_SIZE = 1024 * 1024
+
+class StreamingTextAnalyzer:
+    """
+    Analisador de texto em passada única, por blocos
+    Mantém memória limitada ao tamanho do bloco, independente do tamanho da entrada
+    """
+    
+    def __init__(self, include_words: bool = True):
+        self.include_words = include_words
+        self.characters = 0
+        self.newlines = 0
+        self.spaces = 0
+        self.words = 0
+        self.word_characters = 0
+        self._in_word = False
+    
+    def feed(self, chunk: str) -> None:
+        """Processa um bloco de texto"""
+        if not chunk:
+            return
+        
+        self.characters += len(chunk)
+        self.newlines += chunk.count('\n')
+        self.spaces += chunk.count(' ')
+        
+        if self.include_words:
+            parts = chunk.split()
+            if parts:
+                self.words += len(parts)
+                self.word_characters += sum(map(len, parts))
+                # Palavra quebrada na fronteira entre blocos conta uma vez só
+                if self._in_word and not chunk[0].isspace():
+                    self.words -= 1
+            self._in_word = not chunk[-1].isspace()
+    
+    def result(self) -> Dict[str, Any]:
+        """Retorna as estatísticas acumuladas"""
+        analysis = {
+            "characters": self.characters,
+            "lines": self.newlines + 1,
+            "characters_no_spaces": self.characters - self.spaces
+        }
+        if self.include_words:
+            analysis["words"] = self.words
+            analysis["avg_word_length"] = self.word_characters / self.words if self.words else 0
+        return analysis
+    
+    @classmethod
+    def analyze(cls, source, include_words: bool = True, chunk_size: int = TEXT_CHUNK_SIZE) -> Dict[str, Any]:
+        """Analisa uma string, arquivo aberto (read) ou iterável de blocos"""
+        analyzer = cls(include_words=include_words)
+        if isinstance(source, str):
+            for offset in range(0, len(source), chunk_size):
+                analyzer.feed(source[offset:offset + chunk_size])
+        elif hasattr(source, "read"):
+            for chunk in iter(functools.partial(source.read, chunk_size), ""):
+                analyzer.feed(chunk)
+        else:
+            for chunk in source:
+                analyzer.feed(chunk)
+        return analyzer.result()
+
+def _format_analysis(analysis: Dict[str, Any]) -> str:
+    """Formata o resultado do text_analyzer"""
+    if not analysis["characters"]:
+        raise ValueError("Texto não pode estar vazio")
+    
+    result_lines = []
+    result_lines.append("=== Análise de Texto ===")
+    for key, value in analysis.items():
+        if isinstance(value, float):
+            result_lines.append(f"{key.replace('_', ' ').title()}: {value:.2f}")
+        else:
+            result_lines.append(f"{key.replace('_', ' ').title()}: {value}")
+    
+    return "\n".join(result_lines)
+
+def analyze_text(text: str, include_words: bool = True) -> str:
+    """
+    Análise de texto da ferramenta text_analyzer
+    Função de módulo (picklable) para poder rodar no pool de processos
+    """
+    if not text:
+        raise ValueError("Texto não pode estar vazio")
+    
+    return _format_analysis(StreamingTextAnalyzer.analyze(text, include_words=include_words))
+
+class TextAnalyzerHandler:
+    """
+    Handler picklable do text_analyzer
+    Aceita texto inline ou um arquivo dentro de files_root, lido em blocos no worker.
+    Sem files_root (padrão) só texto inline é aceito: ler arquivos exige uma raiz explícita.
+    """
+    
+    def __init__(self, files_root: Optional[str] = None):
+        self.files_root = Path(files_root).resolve() if files_root is not None else None
+    
+    def __call__(self, text: Optional[str] = None, include_words: bool = True,
+                 file_path: Optional[str] = None, encoding: str = "utf-8") -> str:
+        if file_path is None:
+            if text is None:
+                raise ValueError("Informe 'text' ou 'file_path'")
+            return analyze_text(text, include_words)
+        if self.files_root is None:
+            raise ValueError("Leitura de arquivos desabilitada: inicie o servidor com files_root (--files-root)")
+        
+        full_path = (self.files_root / file_path).resolve()
+        if not full_path.is_relative_to(self.files_root):
+            raise ValueError("Caminho fora do diretório permitido")
+        if not full_path.is_file():
+            raise ValueError(f"Arquivo não encontrado: {file_path}")
+        
+        with open(full_path, "r", encoding=encoding, newline="") as source:
+            analysis = StreamingTextAnalyzer.analyze(source, include_words=include_words)
+        return _format_analysis(analysis)
+
+class ToolDispatcher:
+    """
+    Despachante concorrente para chamadas de ferramentas
+    Aplica limite global e limites por ferramenta, com métricas de fila
+    """
+    
+    def __init__(self, max_concurrency: int = 32):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency deve ser maior que zero")
+        self.max_concurrency = max_concurrency
+        self._global_slots = asyncio.Semaphore(max_concurrency)
+        self._tool_slots: Dict[str, asyncio.Semaphore] = {}
+        self._tool_limits: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+    
+    def set_tool_limit(self, tool_name: str, limit: Optional[int]) -> None:
+        """Define limite de concorrência para uma ferramenta (None = apenas limite global)"""
+        if limit is None:
+            self._tool_slots.pop(tool_name, None)
+            self._tool_limits.pop(tool_name, None)
+            return
+        if limit <= 0:
+            raise ValueError(f"Limite de concorrência inválido para '{tool_name}': {limit}")
+        self._tool_slots[tool_name] = asyncio.Semaphore(limit)
+        self._tool_limits[tool_name] = limit
+    
+    def _tool_stats(self, tool_name: str) -> Dict[str, Any]:
+        stats = self._stats.get(tool_name)
+        if stats is None:
+            stats = self._stats[tool_name] = {
+                "calls": 0,
+                "queued": 0,
+                "in_flight": 0,
+                "total_wait_time": 0.0,
+                "max_wait_time": 0.0
+            }
+        return stats
+    
+    @asynccontextmanager
+    async def slot(self, tool_name: str):
+        """Reserva um slot de execução para a ferramenta, aguardando na fila se necessário"""
+        stats = self._tool_stats(tool_name)
+        tool_slots = self._tool_slots.get(tool_name)
+        
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        stats["queued"] += 1
+        start_time = time.perf_counter()
+        acquired_tool = acquired_global = False
+        try:
+            # Limite por ferramenta primeiro para não ocupar slot global enquanto espera
+            if tool_slots is not None:
+                await tool_slots.acquire()
+                acquired_tool = True
+            await self._global_slots.acquire()
+            acquired_global = True
+        except BaseException:
+            if acquired_tool:
+                tool_slots.release()
+            raise
+        finally:
+            wait_time = time.perf_counter() - start_time
+            self.queue_depth -= 1
+            stats["queued"] -= 1
+            stats["total_wait_time"] += wait_time
+            stats["max_wait_time"] = max(stats["max_wait_time"], wait_time)
+        
+        self.in_flight += 1
+        stats["in_flight"] += 1
+        stats["calls"] += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            stats["in_flight"] -= 1
+            if acquired_global:
+                self._global_slots.release()
+            if acquired_tool:
+                tool_slots.release()
+    
+    async def run(self, tool_name: str, handler, **arguments) -> Any:
+        """Executa handler respeitando os limites de concorrência"""
+        async with self.slot(tool_name):
+            return await handler(**arguments)
+    
+    def submit(self, tool_name: str, handler, **arguments) -> asyncio.Task:
+        """Agenda execução sem bloquear o chamador e retorna a task"""
+        return asyncio.create_task(self.run(tool_name, handler, **arguments))
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna métricas de fila e tempo de espera"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "tools": {
+                name: {
+                    **stats,
+                    "limit": self._tool_limits.get(name),
+                    "avg_wait_time": stats["total_wait_time"] / stats["calls"] if stats["calls"] else 0.0
+                }
+                for name, stats in self._stats.items()
+            }
+        }
+
+# JSON-RPC 2.0 sobre stdio com lotes e leitura em pipeline
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+STDIO_READ_CHUNK = 64 * 1024
+STDIO_MAX_LINE = 32 * 1024 * 1024
+MCP_PROTOCOL_VERSION = "2025-06-18"
+
+def _jsonrpc_result(request_id: Any, result: bytes) -> bytes:
+    """Resposta JSON-RPC com o resultado já serializado (evita re-encode)"""
+    return b'{"jsonrpc":"2.0","id":' + json.dumps(request_id).encode() + b',"result":' + result + b"}"
+
+def _jsonrpc_error(request_id: Any, code: int, message: str) -> bytes:
+    return json.dumps(
+        {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}},
+        separators=(",", ":")
+    ).encode()
+
+class _FileStreamWriter:
+    """Writer mínimo (write/drain/close) para stdout redirecionado a arquivo comum"""
+    
+    def __init__(self, file):
+        self._file = file
+        self._buffer: List[bytes] = []
+    
+    def write(self, data: bytes) -> None:
+        self._buffer.append(data)
+    
+    async def drain(self) -> None:
+        data, self._buffer = b"".join(self._buffer), []
+        await asyncio.get_running_loop().run_in_executor(None, self._write, data)
+    
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+    
+    def close(self) -> None:
+        self._file.flush()
+
+async def open_stdio_streams():
+    """
+    StreamReader/StreamWriter assíncronos sobre stdin/stdout
+    Pipes e terminais usam transportes do event loop; arquivos comuns (redirecionamento)
+    não são suportados por eles e são lidos/escritos em thread
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    except ValueError:
+        reader.feed_data(await loop.run_in_executor(None, sys.stdin.buffer.read))
+        reader.feed_eof()
+    try:
+        write_transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout.buffer)
+    except ValueError:
+        return reader, _FileStreamWriter(sys.stdout.buffer)
+    return reader, asyncio.StreamWriter(write_transport, protocol, reader, loop)
+
+class _LineBuffer:
+    """
+    Separa linhas de um fluxo de bytes sem recopiar o que ainda não tem fim de linha
+    Os bytes ficam num bytearray e a busca pela quebra de linha recomeça de onde parou, então uma
+    linha grande chegando em muitos pedaços custa O(tamanho), não O(tamanho²).
+    Linhas acima de max_line são descartadas e aparecem como None em feed().
+    """
+    
+    def __init__(self, max_line: int = STDIO_MAX_LINE):
+        self.max_line = max_line
+        self._data = bytearray()
+        self._scanned = 0
+        self._discarding = False
+    
+    def feed(self, chunk: bytes) -> List[Optional[bytes]]:
+        data = self._data
+        data += chunk
+        lines: List[Optional[bytes]] = []
+        start = 0
+        search = self._scanned
+        while True:
+            end = data.find(b"\n", search)
+            if end < 0:
+                break
+            if self._discarding:
+                self._discarding = False
+            elif end - start > self.max_line:
+                lines.append(None)
+            else:
+                lines.append(bytes(data[start:end]))
+            start = search = end + 1
+        del data[:start]
+        if len(data) > self.max_line or (self._discarding and data):
+            # Linha sem fim ainda e já acima do limite: descarta até o próximo \n
+            if not self._discarding:
+                lines.append(None)
+                self._discarding = True
+            data.clear()
+        self._scanned = len(data)
+        return lines
+    
+    def rest(self) -> bytes:
+        """Bytes após a última quebra de linha (mensagem final sem quebra de linha)"""
+        return b"" if self._discarding else bytes(self._data)
+
+class BatchedStdioTransport:
+    """
+    Transporte JSON-RPC delimitado por linhas com leitura em pipeline
+    Cada leitura de até read_chunk bytes é quebrada em todas as mensagens completas,
+    que são despachadas concorrentemente (até max_in_flight). As respostas prontas são
+    acumuladas e escritas juntas: uma escrita + drain por rodada, não por mensagem.
+    O slot de uma mensagem só é liberado depois que a resposta foi escrita: um cliente
+    que não lê as respostas faz a leitura da entrada parar (backpressure).
+    """
+    
+    def __init__(self, server: "BasicMCPServer", max_in_flight: int = 256, read_chunk: int = STDIO_READ_CHUNK,
+                 max_line: int = STDIO_MAX_LINE):
+        self.server = server
+        self.read_chunk = read_chunk
+        self.max_line = max_line
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._out: List[bytes] = []
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._broken = False
+        self.stats = {"reads": 0, "messages_in": 0, "messages_out": 0, "writes": 0, "bytes_out": 0}
+    
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atende até EOF na entrada; espera as respostas pendentes serem escritas"""
+        writer_task = asyncio.create_task(self._write_loop(writer))
+        pending = set()
+        buffer = _LineBuffer(self.max_line)
+        try:
+            while True:
+                try:
+                    chunk = await reader.read(self.read_chunk)
+                except ConnectionError:
+                    chunk = b""
+                if not chunk:
+                    break
+                self.stats["reads"] += 1
+                for line in buffer.feed(chunk):
+                    if line is None:
+                        await self._slots.acquire()
+                        self._reject_oversized()
+                    elif line.strip():
+                        await self._slots.acquire()
+                        task = asyncio.create_task(self._process(line))
+                        pending.add(task)
+                        task.add_done_callback(pending.discard)
+            rest = buffer.rest()
+            if rest.strip():
+                await self._slots.acquire()
+                await self._process(rest)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            self._closing = True
+            self._wake.set()
+            await writer_task
+    
+    def _reject_oversized(self) -> None:
+        self.stats["messages_in"] += 1
+        if not self._broken:
+            self._out.append(_jsonrpc_error(
+                None, JSONRPC_INVALID_REQUEST, f"Mensagem acima de {self.max_line} bytes"
+            ) + b"\n")
+            self._wake.set()
+        else:
+            self._slots.release()
+    
+    async def _process(self, line: bytes) -> None:
+        self.stats["messages_in"] += 1
+        queued = False
+        try:
+            response = await self.server.handle_jsonrpc_line(line)
+            if response is not None and not self._broken:
+                self._out.append(response + b"\n")
+                self._wake.set()
+                queued = True
+        finally:
+            # Resposta enfileirada mantém o slot até ser escrita (_write_loop)
+            if not queued:
+                self._slots.release()
+    
+    async def _write_loop(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            if not self._out:
+                if self._closing:
+                    return
+                await self._wake.wait()
+                self._wake.clear()
+                # Uma volta no loop: respostas que ficam prontas juntas saem na mesma escrita
+                await asyncio.sleep(0)
+                continue
+            batch, self._out = self._out, []
+            if not self._broken:
+                data = b"".join(batch)
+                try:
+                    writer.write(data)
+                    self.stats["writes"] += 1
+                    self.stats["messages_out"] += len(batch)
+                    self.stats["bytes_out"] += len(data)
+                    await writer.drain()
+                except ConnectionError as e:
+                    # Cliente foi embora: respostas seguintes são descartadas
+                    self._broken = True
+                    logger.warning(f"Conexão do cliente perdida: {e}")
+            for _ in batch:
+                self._slots.release()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        writes = self.stats["writes"]
+        return {**self.stats, "messages_per_write": self.stats["messages_out"] / writes if writes else 0.0}
+
+# Transportes em socket local: um servidor de longa duração atende vários clientes
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "basic-mcp-example.sock")
+DEFAULT_TCP_HOST = "127.0.0.1"
+DEFAULT_TCP_PORT = 8765
+DEFAULT_MAX_CONNECTIONS = 64
+CONNECTION_MAX_IN_FLIGHT = 64
+SOCKET_WRITE_BUFFER_LIMIT = 256 * 1024
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove socket Unix abandonado; recusa se houver servidor ativo no caminho"""
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise FileExistsError(f"Caminho existe e não é socket: {path}")
+    except FileNotFoundError:
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        raise OSError(f"Já existe um servidor ativo em {path}")
+    finally:
+        probe.close()
+
+def _bind_private_unix(sock: socket.socket, path: str) -> None:
+    """
+    Faz bind do socket já com permissão 0600 sem mexer no umask (estado do processo inteiro):
+    bind e chmod acontecem num diretório 0700 nosso, e só então o socket é ligado ao caminho final
+    """
+    staging = os.path.join(os.path.dirname(path), f".mcp-{os.getpid()}-{os.urandom(4).hex()}")
+    os.mkdir(staging, 0o700)
+    try:
+        info = os.lstat(staging)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+            raise PermissionError(f"Diretório temporário do socket não é privado: {staging}")
+        staged = os.path.join(staging, "s")
+        sock.bind(staged)
+        try:
+            os.chmod(staged, 0o600)
+            # link (e não rename) falha se outro servidor ocupou o caminho entretanto, como o bind direto
+            os.link(staged, path)
+        finally:
+            os.unlink(staged)
+    finally:
+        os.rmdir(staging)
+
+class SocketTransportServer:
+    """
+    Servidor JSON-RPC em socket local (Unix domain socket ou TCP em loopback)
+    Vários clientes compartilham o mesmo BasicMCPServer (um processo, caches quentes);
+    cada conexão é uma sessão com seu próprio BatchedStdioTransport no event loop comum.
+    Backpressure por conexão: até max_in_flight mensagens entre leitura e resposta escrita
+    e buffer de escrita limitado a write_buffer_limit; um cliente lento não afeta os demais.
+    """
+    
+    def __init__(self, server: "BasicMCPServer", max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_in_flight: int = CONNECTION_MAX_IN_FLIGHT,
+                 write_buffer_limit: int = SOCKET_WRITE_BUFFER_LIMIT):
+        if max_connections <= 0:
+            raise ValueError("max_connections deve ser maior que zero")
+        self.server = server
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.write_buffer_limit = write_buffer_limit
+        self.socket_path: Optional[str] = None
+        self._listeners: List[asyncio.AbstractServer] = []
+        self._connections: Dict[BatchedStdioTransport, asyncio.StreamWriter] = {}
+        self._handlers = set()
+        self.stats = {"accepted": 0, "rejected": 0, "closed": 0, "messages_in": 0, "messages_out": 0}
+    
+    async def start_unix(self, path: str = DEFAULT_SOCKET_PATH) -> str:
+        """Escuta em um Unix domain socket (permissão 0600: apenas o usuário dono)"""
+        path = os.path.abspath(path)
+        _remove_stale_socket(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _bind_private_unix(sock, path)
+        except OSError:
+            sock.close()
+            raise
+        listener = await asyncio.start_unix_server(self._handle_connection, sock=sock)
+        self._listeners.append(listener)
+        self.socket_path = path
+        logger.info(f"Transporte Unix socket escutando em {path}")
+        return path
+    
+    async def start_tcp(self, host: str = DEFAULT_TCP_HOST, port: int = DEFAULT_TCP_PORT) -> Tuple[str, int]:
+        """Escuta em TCP; apenas loopback (o protocolo não tem autenticação)"""
+        if not _is_loopback(host):
+            raise ValueError(f"Transporte TCP aceita apenas endereços de loopback, recebido: {host}")
+        listener = await asyncio.start_server(self._handle_connection, host=host, port=port)
+        self._listeners.append(listener)
+        address = listener.sockets[0].getsockname()[:2]
+        logger.info(f"Transporte TCP escutando em {address[0]}:{address[1]}")
+        return address
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self._connections) >= self.max_connections:
+            self.stats["rejected"] += 1
+            writer.write(_jsonrpc_error(None, JSONRPC_INTERNAL_ERROR, "Limite de conexões atingido") + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+            return
+        
+        writer.transport.set_write_buffer_limits(high=self.write_buffer_limit)
+        transport = BatchedStdioTransport(self.server, max_in_flight=self.max_in_flight)
+        self._connections[transport] = writer
+        self._handlers.add(asyncio.current_task())
+        self.stats["accepted"] += 1
+        try:
+            await transport.serve(reader, writer)
+        except Exception as e:
+            logger.warning(f"Sessão encerrada com erro: {e}")
+        finally:
+            del self._connections[transport]
+            self._handlers.discard(asyncio.current_task())
+            self.stats["closed"] += 1
+            self.stats["messages_in"] += transport.stats["messages_in"]
+            self.stats["messages_out"] += transport.stats["messages_out"]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def serve_forever(self) -> None:
+        """Atende até ser cancelado"""
+        await asyncio.gather(*(listener.serve_forever() for listener in self._listeners))
+    
+    async def close(self) -> None:
+        """Para de aceitar conexões e encerra as sessões ativas"""
+        for listener in self._listeners:
+            listener.close()
+        for writer in list(self._connections.values()):
+            writer.close()
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        for listener in self._listeners:
+            await listener.wait_closed()
+        self._listeners = []
+        if self.socket_path is not None:
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self.socket_path = None
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas de conexões; mensagens incluem sessões ativas e encerradas"""
+        active = list(self._connections)
+        return {
+            **self.stats,
+            "active": len(active),
+            "messages_in": self.stats["messages_in"] + sum(t.stats["messages_in"] for t in active),
+            "messages_out": self.stats["messages_out"] + sum(t.stats["messages_out"] for t in active)
+        }
+
+# Modo multi-processo: front roteia tools/call para N workers com o mesmo registry
+WORKER_JOIN_TIMEOUT = 10.0
+_WORKER_RESULT_PREFIX = b'{"jsonrpc":"2.0","id":'
+_WORKER_RESULT_MARKER = b',"result":'
+
+class WorkerUnavailableError(RuntimeError):
+    """Worker encerrado (crash ou restart) antes de responder"""
+
+def _worker_server(tools_registry: Optional[Dict[str, Dict[str, Any]]] = None,
+                   files_root: Optional[str] = None) -> "BasicMCPServer":
+    """
+    Servidor de um worker: o processo já é a unidade de paralelismo, então
+    ferramentas CPU-bound rodam em thread local em vez de abrir outro pool de processos
+    """
+    server = BasicMCPServer(cpu_executor=CPUBoundExecutor(max_workers=1, use_processes=False),
+                            files_root=files_root)
+    for name, tool_info in (tools_registry or {}).items():
+        if "loader" in tool_info:
+            # Instância herdada do front (fork) está ligada ao pool do front: o worker carrega a sua
+            server.register_lazy_tool(name, **{key: value for key, value in tool_info.items() if key != "handler"})
+        elif "handler" in tool_info:
+            server.register_tool(name, **tool_info)
+        else:
+            # Ferramenta padrão vinda de spawn: handler do próprio worker, opções do front
+            server.register_tool(name, server.tools_registry[name]["handler"], **tool_info)
+    return server
+
+def _worker_main(sock: socket.socket, server_factory, inherited_fds: List[int]) -> None:
+    """Ponto de entrada do processo worker: atende JSON-RPC no socket até EOF"""
+    # Descritores do front herdados no fork seguram os canais dos outros workers abertos
+    for fd in inherited_fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+    # stdout pertence ao protocolo do front: nada do worker pode ir para lá
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+    os.close(devnull)
+    
+    async def serve():
+        server = server_factory()
+        reader, writer = await asyncio.open_connection(sock=sock)
+        try:
+            await BatchedStdioTransport(server).serve(reader, writer)
+        finally:
+            writer.close()
+            server.cpu_executor.shutdown()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+class _WorkerHandle:
+    """Processo worker e o canal JSON-RPC (socketpair) até ele"""
+    
+    def __init__(self, pool: "WorkerPool", slot: int, process, sock: socket.socket,
+                 reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.pool = pool
+        self.slot = slot
+        self.process = process
+        self.sock = sock
+        self.reader = reader
+        self.writer = writer
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.calls = 0
+        self.draining = False
+        self.alive = True
+        self._next_id = 0
+        self._read_task = asyncio.create_task(self._read_loop())
+    
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+    
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+    
+    async def request(self, method: str, params: Dict[str, Any]) -> bytes:
+        """Envia uma requisição e devolve o campo result ainda serializado"""
+        if not self.alive or self.draining:
+            raise WorkerUnavailableError(f"Worker {self.slot} indisponível")
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(json.dumps(
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params},
+            separators=(",", ":")
+        ).encode() + b"\n")
+        try:
+            await self.writer.drain()
+            return await future
+        finally:
+            self.pending.pop(request_id, None)
+    
+    async def _read_loop(self) -> None:
+        buffer = _LineBuffer(STDIO_MAX_LINE)
+        try:
+            while True:
+                chunk = await self.reader.read(STDIO_READ_CHUNK)
+                if not chunk:
+                    break
+                lines = buffer.feed(chunk)
+                if None in lines:
+                    # Sem como saber a qual chamada a resposta pertencia: o canal não é confiável
+                    raise ConnectionError(f"resposta acima de {STDIO_MAX_LINE} bytes")
+                for line in lines:
+                    if line:
+                        self._on_response(line)
+        except (ConnectionError, OSError) as e:
+            logger.warning(f"Canal do worker {self.slot} falhou: {e}")
+        except ValueError as e:
+            # Linha malformada: o canal perdeu o enquadramento e o worker é descartado (e recriado)
+            logger.error(f"Resposta inválida do worker {self.slot} (pid {self.pid}): {e}")
+            self.process.terminate()
+        finally:
+            self.alive = False
+            error = WorkerUnavailableError(f"Worker {self.slot} (pid {self.pid}) encerrou com chamadas pendentes")
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pool._on_worker_exit(self)
+    
+    def _on_response(self, line: bytes) -> None:
+        # Respostas do worker saem de _jsonrpc_result: o result é repassado sem re-decodificar
+        if line.startswith(_WORKER_RESULT_PREFIX):
+            id_end = line.find(b",", len(_WORKER_RESULT_PREFIX))
+            if id_end > 0 and line.startswith(_WORKER_RESULT_MARKER, id_end):
+                future = self.pending.get(int(line[len(_WORKER_RESULT_PREFIX):id_end]))
+                if future is not None and not future.done():
+                    future.set_result(line[id_end + len(_WORKER_RESULT_MARKER):-1])
+                return
+        message = json.loads(line)
+        if not isinstance(message, dict) or not isinstance(message.get("error"), dict):
+            raise ValueError(f"mensagem JSON-RPC inesperada: {line[:80]!r}")
+        future = self.pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_exception(RuntimeError(message["error"].get("message", "Erro no worker")))
+    
+    async def drain(self, timeout: float = WORKER_JOIN_TIMEOUT) -> None:
+        """Encerramento gracioso: EOF no canal, worker conclui as chamadas em andamento e sai"""
+        self.draining = True
+        if self.alive:
+            try:
+                self.writer.write_eof()
+            except (ConnectionError, OSError):
+                pass
+        try:
+            await asyncio.wait_for(asyncio.shield(self._read_task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Worker {self.slot} não encerrou em {timeout}s; finalizando")
+            self.process.terminate()
+        await asyncio.get_running_loop().run_in_executor(None, self.process.join, timeout)
+        self.writer.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {"slot": self.slot, "pid": self.pid, "alive": self.alive,
+                "in_flight": self.in_flight, "calls": self.calls}
+
+class WorkerPool:
+    """
+    Pool de processos worker para tools/call (modo pre-fork)
+    O front mantém o transporte, initialize e tools/list; cada tools/call vai para o worker
+    com menos chamadas em andamento. Ferramentas com estado registradas com
+    sticky_key="<argumento>" são roteadas por hash desse argumento para um slot fixo.
+    Com start method "fork" os workers herdam o tools_registry do front no momento em que
+    são criados; com "spawn" recebem uma cópia serializada: ferramentas do manifesto (loader),
+    handlers importáveis por pickle e as opções de cada uma (max_concurrency, sticky_key).
+    Ferramentas registradas com handlers que não podem ser serializados impedem o spawn
+    (ValueError). Nos dois casos restart_all() propaga mudanças do registry.
+    Workers que caem são recriados no mesmo slot; as chamadas pendentes neles falham.
+    """
+    
+    def __init__(self, server: "BasicMCPServer", num_workers: Optional[int] = None,
+                 server_factory=None, start_method: Optional[str] = None):
+        self.server = server
+        self.num_workers = num_workers or os.cpu_count() or 1
+        if self.num_workers <= 0:
+            raise ValueError("num_workers deve ser maior que zero")
+        self._context = multiprocessing.get_context(start_method)
+        self._fork = self._context.get_start_method() == "fork"
+        self.server_factory = server_factory
+        self.workers: List[_WorkerHandle] = []
+        self._next = 0
+        self._running = False
+        self._respawns = set()
+        self.stats = {"calls": 0, "sticky_calls": 0, "restarts": 0, "crashes": 0}
+    
+    async def start(self) -> None:
+        """Cria os workers (um por vez: cada fork precisa saber quais canais fechar)"""
+        for slot in range(self.num_workers):
+            self.workers.append(await self._spawn(slot))
+        self._running = True
+        logger.info(f"Pool de workers iniciado: {[worker.pid for worker in self.workers]}")
+    
+    def _worker_registry(self) -> Dict[str, Dict[str, Any]]:
+        """Registry enviado a workers spawn: ferramentas padrão e do manifesto vão sem o handler"""
+        builtin = self.server._builtin_handlers
+        registry = {}
+        for name, tool_info in self.server.tools_registry.items():
+            if "loader" in tool_info:
+                # Handler já carregado no front fica de fora: o worker importa pelo loader
+                registry[name] = {key: value for key, value in tool_info.items() if key != "handler"}
+                continue
+            if builtin.get(name) is tool_info["handler"]:
+                registry[name] = {key: value for key, value in tool_info.items() if key != "handler"}
+                continue
+            try:
+                pickle.dumps(tool_info)
+            except Exception as e:
+                raise ValueError(
+                    f"Ferramenta '{name}' não pode ser enviada a workers spawn ({e}); "
+                    f"use start method 'fork' ou registre-a por manifesto"
+                ) from e
+            registry[name] = tool_info
+        return registry
+    
+    def _make_server_factory(self):
+        if self.server_factory is not None:
+            return self.server_factory
+        if self._fork:
+            return functools.partial(_worker_server, self.server.tools_registry, self.server.files_root)
+        # Calculado a cada spawn: restart_all() leva as mudanças do registry aos workers novos
+        return functools.partial(_worker_server, self._worker_registry(), self.server.files_root)
+    
+    async def _spawn(self, slot: int) -> _WorkerHandle:
+        server_factory = self._make_server_factory()
+        parent_sock, child_sock = socket.socketpair()
+        inherited_fds = [parent_sock.fileno()] + [worker.sock.fileno() for worker in self.workers if worker.alive]
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_sock, server_factory, inherited_fds if self._fork else []),
+            name=f"mcp-worker-{slot}",
+            daemon=True
+        )
+        process.start()
+        child_sock.close()
+        reader, writer = await asyncio.open_connection(sock=parent_sock)
+        return _WorkerHandle(self, slot, process, parent_sock, reader, writer)
+    
+    def _select(self, tool_name: str, arguments: Dict[str, Any]) -> _WorkerHandle:
+        sticky_key = (self.server.tools_registry.get(tool_name) or {}).get("sticky_key")
+        if sticky_key is not None:
+            # crc32 (não hash()): estável entre execuções e entre processos
+            key = f"{tool_name}:{json.dumps(arguments.get(sticky_key), sort_keys=True, default=str)}"
+            self.stats["sticky_calls"] += 1
+            return self.workers[zlib.crc32(key.encode()) % len(self.workers)]
+        # Menos chamadas em andamento; empates resolvidos em rodízio
+        count = len(self.workers)
+        start, self._next = self._next, (self._next + 1) % count
+        candidates = [self.workers[(start + i) % count] for i in range(count)]
+        return min(candidates, key=lambda worker: (not worker.alive, worker.in_flight))
+    
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> bytes:
+        """Executa tools/call em um worker; devolve o CallToolResult serializado"""
+        if not self._running:
+            raise WorkerUnavailableError("Pool de workers não iniciado")
+        worker = self._select(tool_name, arguments)
+        worker.calls += 1
+        self.stats["calls"] += 1
+        return await worker.request("tools/call", {"name": tool_name, "arguments": arguments})
+    
+    async def restart_worker(self, slot: int) -> None:
+        """Substitui o worker do slot: o novo recebe as chamadas novas, o antigo termina as suas"""
+        old = self.workers[slot]
+        self.workers[slot] = await self._spawn(slot)
+        self.stats["restarts"] += 1
+        await old.drain()
+        logger.info(f"Worker {slot} reiniciado: pid {old.pid} -> {self.workers[slot].pid}")
+    
+    async def restart_all(self) -> None:
+        """Restart em rodízio: no máximo um slot em troca por vez"""
+        for slot in range(len(self.workers)):
+            await self.restart_worker(slot)
+    
+    def _on_worker_exit(self, worker: _WorkerHandle) -> None:
+        if worker.draining or not self._running:
+            return
+        self.stats["crashes"] += 1
+        logger.error(f"Worker {worker.slot} (pid {worker.pid}) encerrou inesperadamente; recriando")
+        task = asyncio.create_task(self._respawn(worker))
+        self._respawns.add(task)
+        task.add_done_callback(self._respawns.discard)
+    
+    async def _respawn(self, worker: _WorkerHandle) -> None:
+        await worker.drain()
+        if self._running and self.workers[worker.slot] is worker:
+            self.workers[worker.slot] = await self._spawn(worker.slot)
+    
+    async def stop(self) -> None:
+        """Encerra todos os workers de forma graciosa"""
+        self._running = False
+        if self._respawns:
+            await asyncio.gather(*self._respawns, return_exceptions=True)
+        await asyncio.gather(*(worker.drain() for worker in self.workers))
+        self.workers = []
+    
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Métricas do pool com as métricas de dispatcher de cada worker somadas por ferramenta"""
+        replies = await asyncio.gather(
+            *(worker.request("server/metrics", {}) for worker in self.workers),
+            return_exceptions=True
+        )
+        tools: Dict[str, Dict[str, Any]] = {}
+        per_worker = []
+        for worker, reply in zip(self.workers, replies):
+            entry = worker.get_stats()
+            if isinstance(reply, Exception):
+                entry["error"] = str(reply)
+            else:
+                dispatcher = json.loads(reply)["dispatcher"]
+                entry["dispatcher"] = dispatcher
+                for name, stats in dispatcher["tools"].items():
+                    total = tools.setdefault(name, {"calls": 0, "in_flight": 0, "total_wait_time": 0.0, "max_wait_time": 0.0})
+                    total["calls"] += stats["calls"]
+                    total["in_flight"] += stats["in_flight"]
+                    total["total_wait_time"] += stats["total_wait_time"]
+                    total["max_wait_time"] = max(total["max_wait_time"], stats["max_wait_time"])
+            per_worker.append(entry)
+        for total in tools.values():
+            total["avg_wait_time"] = total["total_wait_time"] / total["calls"] if total["calls"] else 0.0
+        return {"num_workers": len(self.workers), **self.stats, "tools": tools, "workers": per_worker}
+
+# Registry sob demanda: schemas vêm de um manifesto, handlers são importados na primeira chamada
+DEFAULT_MANIFEST_LOADERS = [
+    "advanced-tool-implementation.py:FileManagerTool",
+    "advanced-tool-implementation.py:WebAPITool",
+    "advanced-tool-implementation.py:DataProcessingTool"
+]
+
+def _tool_schema_dict(schema: Union[Dict[str, Any], "Tool"]) -> Dict[str, Any]:
+    """Aceita o Tool do SDK ou um dict; o registry guarda sempre o dict JSON"""
+    if hasattr(schema, "model_dump"):
+        return schema.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return schema
+
+def _tool_result_json(text: str) -> bytes:
+    """CallToolResult com um único TextContent, serializado direto"""
+    return json.dumps(
+        {"content": [{"type": "text", "text": text}], "isError": False},
+        separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+def _import_loader_target(loader: str):
+    """Resolve "modulo:atributo" ou "caminho/arquivo.py:atributo" (importado uma vez por processo)"""
+    module_ref, _, attr = loader.rpartition(":")
+    if not module_ref or not attr:
+        raise ValueError(f"Loader inválido (esperado 'modulo:atributo'): {loader}")
+    if module_ref.endswith(".py"):
+        path = Path(module_ref).resolve()
+        module_name = "_mcp_tool_" + hashlib.sha256(str(path).encode()).hexdigest()[:8] + "_" + path.stem.replace("-", "_")
+        module = sys.modules.get(module_name)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[module_name]
+                raise
+    else:
+        module = importlib.import_module(module_ref)
+    return getattr(module, attr)
+
+class _ToolAdapter:
+    """Adapta ferramentas no estilo BaseMCPTool (safe_execute -> ToolResult) ao contrato de handler"""
+    
+    def __init__(self, tool):
+        self.tool = tool
+    
+    async def __call__(self, **arguments) -> str:
+        result = await self.tool.safe_execute(**arguments)
+        if not result.success:
+            raise RuntimeError(result.error)
+        if isinstance(result.content, str):
+            return result.content
+        return json.dumps(result.content, ensure_ascii=False, default=str)
+
+def load_tool_handler(loader: str, cpu_executor: Optional[CPUBoundExecutor] = None):
+    """
+    Importa e constrói o handler de uma ferramenta
+    Classes são instanciadas sem argumentos (mais cpu_executor, se o construtor o aceitar,
+    para que a ferramenta use o pool do servidor); instâncias com safe_execute são adaptadas
+    """
+    target = _import_loader_target(loader)
+    if inspect.isclass(target):
+        if cpu_executor is not None and "cpu_executor" in inspect.signature(target).parameters:
+            target = target(cpu_executor=cpu_executor)
+        else:
+            target = target()
+    if hasattr(target, "safe_execute"):
+        return _ToolAdapter(target)
+    return target
+
+def _parameters_schema(parameters) -> Dict[str, Any]:
+    """inputSchema a partir de get_parameters() (ToolParameter: name, type, description, ...)"""
+    properties = {}
+    for parameter in parameters:
+        prop = {"type": parameter.type, "description": parameter.description}
+        if parameter.enum is not None:
+            prop["enum"] = list(parameter.enum)
+        if parameter.default is not None:
+            prop["default"] = parameter.default
+        properties[parameter.name] = prop
+    required = [parameter.name for parameter in parameters if parameter.required]
+    return {"type": "object", "properties": properties, **({"required": required} if required else {})}
+
+def write_tools_manifest(path: Union[str, Path], loaders: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Gera o manifesto (nome + schema + loader) importando cada ferramenta uma vez, fora do startup
+    Loaders de arquivo são gravados relativos ao diretório do manifesto
+    """
+    path = Path(path).resolve()
+    base_dir = Path(__file__).resolve().parent
+    tools = []
+    for loader in loaders or DEFAULT_MANIFEST_LOADERS:
+        module_ref, _, attr = loader.rpartition(":")
+        if module_ref.endswith(".py"):
+            module_path = (base_dir / module_ref).resolve()
+            tool = _import_loader_target(f"{module_path}:{attr}")
+            loader = f"{os.path.relpath(module_path, path.parent)}:{attr}"
+        else:
+            tool = _import_loader_target(loader)
+        if inspect.isclass(tool):
+            tool = tool()
+        entry = {
+            "loader": loader,
+            "schema": {
+                "name": tool.name,
+                "description": tool.description,
+                "inputSchema": _parameters_schema(tool.get_parameters())
+            }
+        }
+        tools.append(entry)
+    manifest = {"version": 1, "tools": tools}
+    path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    logger.info(f"Manifesto gravado em {path}: {len(tools)} ferramentas")
+    return manifest
+
 class BasicMCPServer:
     """
     Exemplo de servidor MCP básico implementando os templates da coleção
     """
     
-    def __init__(self):
-        self.server = Server("basic-mcp-example")
+    def __init__(self, max_concurrency: int = 32, cpu_executor: Optional[CPUBoundExecutor] = None,
+                 files_root: Optional[str] = None, workers: int = 0, worker_start_method: Optional[str] = None):
+        self._sdk_server = None
+        # None: text_analyzer não lê arquivos (só texto inline)
+        self.files_root = Path(files_root).resolve() if files_root is not None else None
         self.tools_registry = {}
-        self._setup_handlers()
+        self.registry_version = 0
+        self._tools_list_cache: Optional["ListToolsResult"] = None
+        self._tools_list_bytes: Optional[bytes] = None
+        self._tools_etag: Optional[str] = None
+        self.dispatcher = ToolDispatcher(max_concurrency=max_concurrency)
+        self.cpu_executor = cpu_executor or CPUBoundExecutor()
         self._register_tools()
+        # workers > 0: tools/call é executado em processos worker (ver WorkerPool)
+        self.worker_pool = WorkerPool(self, workers, start_method=worker_start_method) if workers else None
+    
+    @property
+    def server(self):
+        """Server do SDK, criado (e o SDK importado) no primeiro acesso"""
+        if self._sdk_server is None:
+            from mcp.server import Server
+            self._sdk_server = Server("basic-mcp-example")
+            self._setup_handlers()
+        return self._sdk_server
     
     def _setup_handlers(self):
         """Configura handlers do servidor"""
@@ -49,10 +1254,11 @@ class BasicMCPServer:
         self.tools_registry = {
             "echo": {
                 "handler": self._handle_echo,
-                "schema": Tool(
-                    name="echo",
-                    description="Ecoa a mensagem fornecida pelo usuário",
-                    inputSchema={
+                "max_concurrency": None,
+                "schema": {
+                    "name": "echo",
+                    "description": "Ecoa a mensagem fornecida pelo usuário",
+                    "inputSchema": {
                         "type": "object",
                         "properties": {
                             "message": {
@@ -62,14 +1268,15 @@ class BasicMCPServer:
                         },
                         "required": ["message"]
                     }
-                )
+                }
             },
             "calculator": {
                 "handler": self._handle_calculator,
-                "schema": Tool(
-                    name="calculator",
-                    description="Realiza operações matemáticas básicas",
-                    inputSchema={
+                "max_concurrency": None,
+                "schema": {
+                    "name": "calculator",
+                    "description": "Realiza operações matemáticas básicas",
+                    "inputSchema": {
                         "type": "object",
                         "properties": {
                             "operation": {
@@ -88,68 +1295,296 @@ class BasicMCPServer:
                         },
                         "required": ["operation", "a", "b"]
                     }
-                )
+                }
+            },
+            "calculator_batch": {
+                "handler": self._handle_calculator_batch,
+                "max_concurrency": None,
+                "schema": {
+                    "name": "calculator_batch",
+                    "description": "Realiza muitas operações matemáticas em uma chamada (erros reportados por elemento)",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "a": {
+                                "type": "array",
+                                "items": {"type": "number"},
+                                "description": "Coluna com os primeiros operandos"
+                            },
+                            "b": {
+                                "type": "array",
+                                "items": {"type": "number"},
+                                "description": "Coluna com os segundos operandos"
+                            },
+                            "operation": {
+                                "type": "string",
+                                "enum": ["add", "subtract", "multiply", "divide"],
+                                "description": "Operação aplicada a todos os elementos"
+                            },
+                            "operations": {
+                                "type": "array",
+                                "items": {"type": "string", "enum": ["add", "subtract", "multiply", "divide"]},
+                                "description": "Operação por elemento (alternativa a 'operation')"
+                            },
+                            "items": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "operation": {"type": "string"},
+                                        "a": {"type": "number"},
+                                        "b": {"type": "number"}
+                                    },
+                                    "required": ["operation", "a", "b"]
+                                },
+                                "description": "Formato por linhas (alternativa às colunas)"
+                            }
+                        }
+                    }
+                }
             },
             "text_analyzer": {
-                "handler": self._handle_text_analyzer,
-                "schema": Tool(
-                    name="text_analyzer",
-                    description="Analisa texto fornecendo estatísticas básicas",
-                    inputSchema={
+                "handler": TextAnalyzerHandler(self.files_root),
+                "cpu_bound": True,
+                "max_concurrency": 4,
+                "schema": {
+                    "name": "text_analyzer",
+                    "description": "Analisa texto fornecendo estatísticas básicas",
+                    "inputSchema": {
                         "type": "object",
                         "properties": {
                             "text": {
                                 "type": "string",
-                                "description": "Texto para análise"
+                                "description": "Texto para análise (ou use 'file_path')"
+                            },
+                            "file_path": {
+                                "type": "string",
+                                "description": "Arquivo para análise (alternativa a 'text', relativo a --files-root; desabilitado sem ele)"
+                            },
+                            "encoding": {
+                                "type": "string",
+                                "description": "Encoding do arquivo",
+                                "default": "utf-8"
                             },
                             "include_words": {
                                 "type": "boolean",
                                 "description": "Incluir contagem de palavras",
                                 "default": True
                             }
-                        },
-                        "required": ["text"]
+                        }
                     }
-                )
+                }
             }
         }
+        
+        for tool_name, tool_info in self.tools_registry.items():
+            self.dispatcher.set_tool_limit(tool_name, tool_info.get("max_concurrency"))
+        # Ferramentas padrão: todo BasicMCPServer as cria, então workers spawn não precisam recebê-las
+        self._builtin_handlers = {name: info["handler"] for name, info in self.tools_registry.items()}
+        self.invalidate_tools_cache()
+    
+    def register_tool(self, name: str, handler, schema: Union[Dict[str, Any], "Tool"], **options) -> None:
+        """Registra (ou substitui) uma ferramenta e invalida o cache de tools/list"""
+        self.tools_registry[name] = {"handler": handler, "schema": _tool_schema_dict(schema), **options}
+        self.dispatcher.set_tool_limit(name, options.get("max_concurrency"))
+        self.invalidate_tools_cache()
+    
+    def register_lazy_tool(self, name: str, loader: str, schema: Union[Dict[str, Any], "Tool"], **options) -> None:
+        """Registra uma ferramenta pelo schema; o handler só é importado/construído na primeira chamada"""
+        self.tools_registry[name] = {"loader": loader, "schema": _tool_schema_dict(schema), **options}
+        self.dispatcher.set_tool_limit(name, options.get("max_concurrency"))
+        self.invalidate_tools_cache()
+    
+    def load_tools_manifest(self, path: Union[str, Path]) -> int:
+        """
+        Registra as ferramentas de um manifesto (ver write_tools_manifest) sem importá-las
+        Loaders de arquivo (.py) são resolvidos relativos ao diretório do manifesto
+        """
+        path = Path(path).resolve()
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        for entry in manifest["tools"]:
+            entry = dict(entry)
+            schema = entry.pop("schema")
+            loader = entry.pop("loader")
+            module_ref, _, attr = loader.rpartition(":")
+            if module_ref.endswith(".py"):
+                loader = f"{path.parent / module_ref}:{attr}"
+            self.register_lazy_tool(schema["name"], loader, schema, **entry)
+        logger.info(f"Manifesto {path}: {len(manifest['tools'])} ferramentas registradas (carregamento sob demanda)")
+        return len(manifest["tools"])
     
-    async def list_tools(self) -> ListToolsResult:
-        """Lista todas as ferramentas disponíveis"""
+    def _resolve_handler(self, tool_name: str, tool_info: Dict[str, Any]):
+        handler = tool_info.get("handler")
+        if handler is None:
+            start_time = time.perf_counter()
+            handler = tool_info["handler"] = load_tool_handler(tool_info["loader"], self.cpu_executor)
+            logger.info(f"Ferramenta {tool_name} carregada em {(time.perf_counter() - start_time) * 1000:.1f}ms")
+        return handler
+    
+    def unregister_tool(self, name: str) -> None:
+        """Remove uma ferramenta e invalida o cache de tools/list"""
+        if self.tools_registry.pop(name, None) is not None:
+            self.dispatcher.set_tool_limit(name, None)
+            self.invalidate_tools_cache()
+    
+    def invalidate_tools_cache(self) -> None:
+        """Incrementa a versão do registry; a resposta é reconstruída no próximo tools/list"""
+        self.registry_version += 1
+        self._tools_list_cache = None
+        self._tools_list_bytes = None
+        self._tools_etag = None
+    
+    def _build_tools_list(self) -> bytes:
+        # Schemas são dicts JSON: a resposta é serializada sem passar pelos modelos do SDK
         tools = [tool_info["schema"] for tool_info in self.tools_registry.values()]
-        logger.info(f"Listando {len(tools)} ferramentas disponíveis")
-        return ListToolsResult(tools=tools)
+        tools_bytes = json.dumps(tools, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self._tools_etag = f'{self.registry_version}-{hashlib.sha256(tools_bytes).hexdigest()[:16]}'
+        self._tools_list_bytes = b'{"tools":' + tools_bytes + b',"_meta":{"etag":"' + self._tools_etag.encode() + b'"}}'
+        logger.info(f"Cache de tools/list reconstruído: {len(tools)} ferramentas (etag {self._tools_etag})")
+        return self._tools_list_bytes
+    
+    @property
+    def tools_etag(self) -> str:
+        """Versão (estilo ETag) da lista de ferramentas atual"""
+        if self._tools_etag is None:
+            self._build_tools_list()
+        return self._tools_etag
     
-    async def call_tool(self, request: CallToolRequest) -> CallToolResult:
+    def get_tools_list_bytes(self) -> bytes:
+        """Resposta de tools/list já serializada em JSON"""
+        if self._tools_list_bytes is None:
+            self._build_tools_list()
+        return self._tools_list_bytes
+    
+    def tools_list_changed(self, etag: Optional[str]) -> bool:
+        """Indica se o cliente com este etag precisa buscar a lista novamente"""
+        return etag != self.tools_etag
+    
+    def get_tools_list_response(self, params: Any) -> bytes:
+        """
+        Resposta de tools/list; com params._meta.etag igual ao atual, devolve só
+        {"tools": [], "_meta": {"etag": ..., "notModified": true}} em vez da lista inteira
+        """
+        meta = params.get("_meta") if isinstance(params, dict) else None
+        etag = meta.get("etag") if isinstance(meta, dict) else None
+        if etag is None or self.tools_list_changed(etag):
+            return self.get_tools_list_bytes()
+        return b'{"tools":[],"_meta":{"etag":' + json.dumps(etag).encode() + b',"notModified":true}}'
+    
+    async def list_tools(self) -> "ListToolsResult":
+        """Lista todas as ferramentas disponíveis (resposta em cache até o registry mudar)"""
+        if self._tools_list_cache is None:
+            from mcp.types import ListToolsResult
+            self._tools_list_cache = ListToolsResult.model_validate_json(self.get_tools_list_bytes())
+        return self._tools_list_cache
+    
+    async def call_tool(self, request: "CallToolRequest") -> "CallToolResult":
         """Executa uma ferramenta específica"""
-        tool_name = request.params.name
-        arguments = request.params.arguments or {}
+        return await self.execute_tool(request.params.name, request.params.arguments or {})
+    
+    async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> "CallToolResult":
+        """Executa uma ferramenta pelo nome e devolve o resultado como modelo do SDK"""
+        from mcp.types import CallToolResult
+        return CallToolResult.model_validate_json(await self.execute_tool_json(tool_name, arguments))
+    
+    async def execute_tool_json(self, tool_name: str, arguments: Dict[str, Any]) -> bytes:
+        """Executa uma ferramenta pelo nome; devolve o CallToolResult serializado (transporte em lote)"""
+        if self.worker_pool is not None:
+            return await self.worker_pool.call_tool(tool_name, arguments)
         
         logger.info(f"Executando ferramenta: {tool_name} com argumentos: {arguments}")
         
         if tool_name not in self.tools_registry:
             error_msg = f"Ferramenta '{tool_name}' não encontrada"
             logger.error(error_msg)
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Erro: {error_msg}")]
-            )
+            return _tool_result_json(f"Erro: {error_msg}")
         
         try:
-            # Executa o handler da ferramenta
-            handler = self.tools_registry[tool_name]["handler"]
-            result = await handler(**arguments)
+            # Executa o handler da ferramenta via dispatcher concorrente
+            tool_info = self.tools_registry[tool_name]
+            handler = self._resolve_handler(tool_name, tool_info)
+            if tool_info.get("cpu_bound"):
+                # Handlers CPU-bound são funções síncronas executadas no pool
+                handler = functools.partial(self.cpu_executor.run, handler)
+            result = await self.dispatcher.run(tool_name, handler, **arguments)
             
             logger.info(f"Ferramenta {tool_name} executada com sucesso")
-            return CallToolResult(
-                content=[TextContent(type="text", text=str(result))]
-            )
+            return _tool_result_json(str(result))
             
         except Exception as e:
             error_msg = f"Erro na execução da ferramenta '{tool_name}': {str(e)}"
             logger.error(error_msg, exc_info=True)
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Erro: {error_msg}")]
-            )
+            return _tool_result_json(f"Erro: {error_msg}")
+    
+    async def handle_jsonrpc_message(self, message: Any) -> Optional[bytes]:
+        """Processa uma mensagem JSON-RPC; devolve a resposta serializada (None para notificações)"""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            request_id = message.get("id") if isinstance(message, dict) else None
+            return _jsonrpc_error(request_id, JSONRPC_INVALID_REQUEST, "Requisição JSON-RPC inválida")
+        
+        method = message["method"]
+        is_notification = "id" not in message
+        request_id = message.get("id")
+        params = message.get("params") or {}
+        
+        try:
+            if method == "tools/call":
+                if not isinstance(params, dict) or not isinstance(params.get("name"), str):
+                    return _jsonrpc_error(request_id, JSONRPC_INVALID_PARAMS, "Parâmetro 'name' obrigatório")
+                payload = await self.execute_tool_json(params["name"], params.get("arguments") or {})
+            elif method == "tools/list":
+                payload = self.get_tools_list_response(params)
+            elif method == "initialize":
+                payload = json.dumps({
+                    "protocolVersion": params.get("protocolVersion", MCP_PROTOCOL_VERSION),
+                    # O servidor não envia notifications/tools/list_changed; mudanças aparecem no etag
+                    "capabilities": {"tools": {"listChanged": False}},
+                    "serverInfo": {"name": "basic-mcp-example", "version": "1.0.0"}
+                }, separators=(",", ":")).encode()
+            elif method == "ping":
+                payload = b"{}"
+            elif method == "server/metrics":
+                payload = json.dumps(await self.get_metrics(), separators=(",", ":")).encode()
+            elif method.startswith("notifications/"):
+                return None
+            else:
+                return None if is_notification else _jsonrpc_error(
+                    request_id, JSONRPC_METHOD_NOT_FOUND, f"Método '{method}' não encontrado"
+                )
+        except Exception as e:
+            logger.error(f"Erro ao processar '{method}': {e}", exc_info=True)
+            return None if is_notification else _jsonrpc_error(request_id, JSONRPC_INTERNAL_ERROR, str(e))
+        
+        return None if is_notification else _jsonrpc_result(request_id, payload)
+    
+    async def handle_jsonrpc_line(self, line: bytes) -> Optional[bytes]:
+        """Decodifica uma linha (mensagem ou lote JSON-RPC) e devolve a resposta serializada"""
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            return _jsonrpc_error(None, JSONRPC_PARSE_ERROR, f"JSON inválido: {e}")
+        
+        if not isinstance(payload, list):
+            return await self.handle_jsonrpc_message(payload)
+        if not payload:
+            return _jsonrpc_error(None, JSONRPC_INVALID_REQUEST, "Lote JSON-RPC vazio")
+        # Itens do lote rodam concorrentemente; notificações não geram resposta
+        responses = [
+            response for response in await asyncio.gather(*map(self.handle_jsonrpc_message, payload))
+            if response is not None
+        ]
+        return b"[" + b",".join(responses) + b"]" if responses else None
+    
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Métricas do processo; no modo multi-worker inclui as métricas agregadas dos workers"""
+        metrics = {
+            "pid": os.getpid(),
+            "dispatcher": self.dispatcher.get_metrics(),
+            "cpu_executor": self.cpu_executor.get_metrics()
+        }
+        if self.worker_pool is not None:
+            metrics["worker_pool"] = await self.worker_pool.get_metrics()
+        return metrics
     
     async def _handle_echo(self, message: str) -> str:
         """Handler para ferramenta echo"""
@@ -160,56 +1595,89 @@ class BasicMCPServer:
     
     async def _handle_calculator(self, operation: str, a: float, b: float) -> str:
         """Handler para ferramenta calculator"""
-        operations = {
-            "add": lambda x, y: x + y,
-            "subtract": lambda x, y: x - y,
-            "multiply": lambda x, y: x * y,
-            "divide": lambda x, y: x / y if y != 0 else None
-        }
-        
-        if operation not in operations:
+        if operation not in CALCULATOR_OPERATIONS:
             raise ValueError(f"Operação '{operation}' não suportada")
         
         if operation == "divide" and b == 0:
             raise ValueError("Divisão por zero não é permitida")
         
-        result = operations[operation](a, b)
+        result = CALCULATOR_OPERATIONS[operation](a, b)
         return f"{a} {operation} {b} = {result}"
     
-    async def _handle_text_analyzer(self, text: str, include_words: bool = True) -> str:
-        """Handler para ferramenta text_analyzer"""
-        if not text:
-            raise ValueError("Texto não pode estar vazio")
-        
-        # Análise básica do texto
-        char_count = len(text)
-        line_count = text.count('\n') + 1
+    async def _handle_calculator_batch(self, a: Optional[List[float]] = None, b: Optional[List[float]] = None,
+                                       operation: Optional[str] = None, operations: Optional[List[str]] = None,
+                                       items: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Handler para ferramenta calculator_batch"""
+        if items is not None:
+            # Formato por linhas: [{"operation": ..., "a": ..., "b": ...}, ...]
+            a = [item.get("a") for item in items]
+            b = [item.get("b") for item in items]
+            operations = [item.get("operation") for item in items]
+        else:
+            if a is None or b is None:
+                raise ValueError("Informe 'a' e 'b' (colunar) ou 'items'")
+            if operations is None:
+                if operation is None:
+                    raise ValueError("Informe 'operation' ou 'operations'")
+                operations = [operation] * len(a)
         
-        analysis = {
-            "characters": char_count,
-            "lines": line_count,
-            "characters_no_spaces": len(text.replace(' ', ''))
-        }
+        # allow_nan=False: NaN/Infinity não são JSON válido (não devem escapar da validação)
+        return json.dumps(calculate_batch(a, b, operations), separators=(",", ":"), allow_nan=False)
+    
+    async def run(self, transport: str = "batched", socket_path: str = DEFAULT_SOCKET_PATH,
+                  host: str = DEFAULT_TCP_HOST, port: int = DEFAULT_TCP_PORT):
+        """
+        Inicia o servidor MCP
+        transport="batched" usa BatchedStdioTransport (lotes, pipeline e escritas agrupadas);
+        transport="sdk" usa o stdio_server do SDK (uma mensagem por vez);
+        transport="unix"/"tcp" atende vários clientes em socket local (SocketTransportServer)
+        """
+        logger.info("Iniciando servidor MCP básico...")
+        if self.worker_pool is not None:
+            # Workers são criados antes de qualquer pool local para não herdá-lo no fork
+            await self.worker_pool.start()
+        else:
+            await self.cpu_executor.warm_up()
         
-        if include_words:
-            words = text.split()
-            analysis["words"] = len(words)
-            analysis["avg_word_length"] = sum(len(word) for word in words) / len(words) if words else 0
-        
-        # Formata resultado
-        result_lines = []
-        result_lines.append("=== Análise de Texto ===")
-        for key, value in analysis.items():
-            if isinstance(value, float):
-                result_lines.append(f"{key.replace('_', ' ').title()}: {value:.2f}")
+        try:
+            if transport == "sdk":
+                await self._serve_stdio()
+            elif transport in ("unix", "tcp"):
+                await self._serve_socket(transport, socket_path, host, port)
             else:
-                result_lines.append(f"{key.replace('_', ' ').title()}: {value}")
-        
-        return "\n".join(result_lines)
+                await self._serve_stdio_batched()
+        finally:
+            if self.worker_pool is not None:
+                await self.worker_pool.stop()
+            self.cpu_executor.shutdown()
     
-    async def run(self):
-        """Inicia o servidor MCP"""
-        logger.info("Iniciando servidor MCP básico...")
+    async def _serve_stdio_batched(self):
+        """Atende requisições JSON-RPC via stdio com BatchedStdioTransport"""
+        reader, writer = await open_stdio_streams()
+        transport = BatchedStdioTransport(self)
+        try:
+            await transport.serve(reader, writer)
+        finally:
+            logger.info(f"Transporte stdio encerrado: {transport.get_metrics()}")
+            writer.close()
+    
+    async def _serve_socket(self, transport: str, socket_path: str, host: str, port: int):
+        """Atende clientes em Unix socket ou TCP loopback até ser cancelado"""
+        socket_server = SocketTransportServer(self)
+        if transport == "unix":
+            await socket_server.start_unix(socket_path)
+        else:
+            await socket_server.start_tcp(host, port)
+        try:
+            await socket_server.serve_forever()
+        finally:
+            await socket_server.close()
+            logger.info(f"Transporte {transport} encerrado: {socket_server.get_metrics()}")
+    
+    async def _serve_stdio(self):
+        """Atende requisições via stdio"""
+        from mcp.server.models import InitializationOptions
+        from mcp.server.stdio import stdio_server
         
         async with stdio_server(
             server=self.server,
@@ -227,10 +1695,32 @@ class BasicMCPServer:
                 )
             )
 
-async def main():
+async def main(argv: Optional[List[str]] = None):
     """Função principal"""
-    server = BasicMCPServer()
-    await server.run()
+    parser = argparse.ArgumentParser(description="Servidor MCP básico")
+    parser.add_argument("--transport", choices=["batched", "sdk", "unix", "tcp"], default="batched",
+                        help="Transporte: stdio (batched/sdk) ou socket local (unix/tcp)")
+    parser.add_argument("--socket-path", default=DEFAULT_SOCKET_PATH,
+                        help=f"Caminho do Unix socket (padrão: {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("--host", default=DEFAULT_TCP_HOST, help="Endereço TCP (somente loopback)")
+    parser.add_argument("--port", type=int, default=DEFAULT_TCP_PORT, help="Porta TCP")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Processos worker para tools/call (0 = processo único)")
+    parser.add_argument("--manifest", help="Manifesto de ferramentas carregadas sob demanda")
+    parser.add_argument("--files-root", metavar="DIR",
+                        help="Diretório que text_analyzer pode ler via file_path (padrão: nenhum)")
+    parser.add_argument("--write-manifest", metavar="PATH",
+                        help="Gera o manifesto das ferramentas avançadas em PATH e sai")
+    args = parser.parse_args(argv)
+    
+    if args.write_manifest:
+        write_tools_manifest(args.write_manifest)
+        return
+    
+    server = BasicMCPServer(workers=args.workers, files_root=args.files_root)
+    if args.manifest:
+        server.load_tools_manifest(args.manifest)
+    await server.run(transport=args.transport, socket_path=args.socket_path, host=args.host, port=args.port)
 
 if __name__ == "__main__":
     try:
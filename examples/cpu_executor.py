@@ -0,0 +1,151 @@
+"""
+Pool CPU-bound compartilhado pelos exemplos
+Usado por basic-mcp-server.py e advanced-tool-implementation.py sem que um importe o outro
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Strings acima deste tamanho vão para os workers via memória compartilhada
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+class SharedText:
+    """Referência a um texto em memória compartilhada (evita pickle do conteúdo)"""
+    
+    __slots__ = ("name", "size")
+    
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+    
+    @classmethod
+    def create(cls, text: str):
+        """Copia o texto para um bloco de memória compartilhada"""
+        data = text.encode("utf-8")
+        shm = SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[:len(data)] = data
+        return cls(shm.name, len(data)), shm
+    
+    def load(self) -> str:
+        """Lê o texto no processo worker"""
+        shm = SharedMemory(name=self.name)
+        try:
+            return bytes(shm.buf[:self.size]).decode("utf-8")
+        finally:
+            shm.close()
+
+def _noop() -> int:
+    return os.getpid()
+
+def _run_cpu_bound(func, arguments: Dict[str, Any]) -> Any:
+    """Executa função CPU-bound no worker, materializando textos compartilhados"""
+    arguments = {
+        key: value.load() if isinstance(value, SharedText) else value
+        for key, value in arguments.items()
+    }
+    return func(**arguments)
+
+class CPUBoundExecutor:
+    """
+    Pool gerenciado para handlers CPU-bound
+    Usa ProcessPoolExecutor com workers aquecidos e cai para ThreadPoolExecutor
+    quando processos não estão disponíveis. O servidor cria um e o repassa às
+    ferramentas que carrega (BaseMCPTool(cpu_executor=...)): um único pool por processo.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = True,
+                 shared_memory_threshold: int = SHARED_MEMORY_THRESHOLD):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.shared_memory_threshold = shared_memory_threshold
+        self._pool = None
+        self.mode = None
+        self.stats = {"tasks": 0, "shared_memory_transfers": 0, "fallbacks": 0}
+    
+    def _ensure_pool(self):
+        if self._pool is not None:
+            return self._pool
+        
+        if self.use_processes:
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                self.mode = "process"
+                return self._pool
+            except (OSError, NotImplementedError, ImportError) as e:
+                logger.warning(f"Pool de processos indisponível, usando threads: {e}")
+                self.stats["fallbacks"] += 1
+        
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-cpu")
+        self.mode = "thread"
+        return self._pool
+    
+    def _fallback_to_threads(self, reason: Exception) -> None:
+        logger.warning(f"Pool de processos falhou, usando threads: {reason}")
+        self.stats["fallbacks"] += 1
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self.use_processes = False
+    
+    async def warm_up(self) -> None:
+        """Inicia todos os workers antes da primeira chamada real"""
+        loop = asyncio.get_running_loop()
+        pool = self._ensure_pool()
+        try:
+            await asyncio.gather(*(loop.run_in_executor(pool, _noop) for _ in range(self.max_workers)))
+        except BrokenProcessPool as e:
+            self._fallback_to_threads(e)
+    
+    async def run(self, func, **arguments) -> Any:
+        """Executa func(**arguments) fora do event loop"""
+        return await self.call(func, arguments)
+    
+    async def call(self, func, arguments: Dict[str, Any], thread_call=None) -> Any:
+        """
+        Como run, com os argumentos em um dicionário
+        thread_call (sem argumentos) substitui func(**arguments) no modo thread, onde o
+        chamador pode usar seus próprios objetos em vez de reconstruí-los no worker
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._ensure_pool()
+        self.stats["tasks"] += 1
+        
+        if self.mode == "thread":
+            return await loop.run_in_executor(pool, thread_call or functools.partial(func, **arguments))
+        
+        shared_blocks = []
+        try:
+            prepared = {}
+            for key, value in arguments.items():
+                if isinstance(value, str) and len(value) >= self.shared_memory_threshold:
+                    prepared[key], shm = SharedText.create(value)
+                    shared_blocks.append(shm)
+                    self.stats["shared_memory_transfers"] += 1
+                else:
+                    prepared[key] = value
+            return await loop.run_in_executor(pool, _run_cpu_bound, func, prepared)
+        except BrokenProcessPool as e:
+            self._fallback_to_threads(e)
+            return await self.call(func, arguments, thread_call)
+        finally:
+            for shm in shared_blocks:
+                shm.close()
+                shm.unlink()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerra o pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Retorna métricas do pool"""
+        return {"mode": self.mode, "max_workers": self.max_workers, **self.stats}
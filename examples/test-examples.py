@@ -6,15 +6,31 @@ Demonstra uso dos templates de teste da coleção
 
 import asyncio
 import json
+import os
 import pytest
+import signal
+import stat
+import sys
 import tempfile
+import threading
+import time
 import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import parse_qs
 
 # Imports simulados dos templates (ajuste conforme necessário)
-from advanced_tool_implementation import FileManagerTool, WebAPITool, DataProcessingTool, ToolResult
+from advanced_tool_implementation import FileManagerTool, WebAPITool, DataProcessingTool, ToolResult, CPUBoundExecutor
+from advanced_tool_implementation import APICallRequest, FileOperationRequest, validate_api_request, validate_file_request
+from advanced_tool_implementation import PathGuard, RecordTransformer, compile_schema
+from advanced_tool_implementation import AdaptiveConcurrencyLimiter, ConcurrencyLimitError, HostCircuitBreaker
+from advanced_tool_implementation import HTTPConnectionPool
+from basic_mcp_server import BasicMCPServer, BatchedStdioTransport, StreamingTextAnalyzer, ToolDispatcher
+from basic_mcp_server import SocketTransportServer, WorkerUnavailableError
+from basic_mcp_server import CPUBoundExecutor as ServerCPUBoundExecutor
+from mcp.types import CallToolRequest, CallToolRequestParams
 
 class MCPTestHelper:
     """Helper class para testes MCP"""
@@ -32,6 +48,14 @@ class MCPTestHelper:
             }
         }
     
+    @staticmethod
+    def create_call_tool_request(tool_name: str, arguments: Dict[str, Any] = None) -> CallToolRequest:
+        """Cria CallToolRequest tipado para o BasicMCPServer"""
+        return CallToolRequest(
+            method="tools/call",
+            params=CallToolRequestParams(name=tool_name, arguments=arguments or {})
+        )
+    
     @staticmethod
     def assert_valid_tool_result(result: ToolResult, should_succeed: bool = True):
         """Valida resultado de ferramenta"""
@@ -87,11 +111,104 @@ def web_api_tool():
     }
     return WebAPITool(config=config)
 
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Servidor HTTP local para testes do WebAPITool (keep-alive habilitado)"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+    
+    def _cached(self, path: str):
+        """Endpoints com headers de cache; o corpo carrega quantas vezes o path foi servido"""
+        self.server.hits[path] = self.server.hits.get(path, 0) + 1
+        if path == "/slow-cached":
+            time.sleep(0.1)
+        if path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if path == "/vary-cookie":
+            self._respond(200, {"served": self.server.hits[path], "cookie": self.headers.get("Cookie")},
+                          {"Cache-Control": "max-age=60", "Vary": "Accept, Cookie"})
+            return
+        cache_control = {
+            "/cached": "max-age=60",
+            "/slow-cached": "no-store",
+            "/etag": "no-cache",
+            "/swr": "max-age=0, stale-while-revalidate=30",
+            "/private": "private, max-age=60"
+        }[path]
+        self._respond(200, {"served": self.server.hits[path]}, {"Cache-Control": cache_control, "ETag": '"v1"'})
+    
+    def _respond(self, status: int, payload: Dict[str, Any], extra_headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path in ("/cached", "/slow-cached", "/etag", "/swr", "/private", "/vary-cookie"):
+            self._cached(path)
+            return
+        if path == "/slow":
+            time.sleep(float(parse_qs(query).get("delay", ["0.2"])[0]))
+        if path.startswith("/status/"):
+            self._respond(int(path.rsplit("/", 1)[1]), {"error": "stub"})
+            return
+        self.server.hits[path] = self.server.hits.get(path, 0) + 1
+        headers = {"Connection": "close"} if path == "/close" else None
+        self._respond(200, {"method": "GET", "path": self.path, "user_agent": self.headers["User-Agent"]}, headers)
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond(201, {"method": "POST", "received": json.loads(body), "content_type": self.headers["Content-Type"]})
+
+@pytest.fixture
+def stub_http_server():
+    """Fixture com servidor HTTP local; expõe base_url e contagem de conexões TCP"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPIHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.hits = {}
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def stub_api_tool(stub_http_server):
+    """Fixture com WebAPITool restrito ao servidor local"""
+    config = {
+        "allowed_domains": [stub_http_server.base_url.split("//", 1)[1]],
+        "default_headers": {"User-Agent": "MCP-Test/1.0"},
+        "pool_size": 2
+    }
+    return WebAPITool(config=config)
+
 @pytest.fixture
 def data_processing_tool():
     """Fixture com DataProcessingTool"""
     return DataProcessingTool()
 
+@pytest.fixture
+def basic_server():
+    """Fixture com BasicMCPServer"""
+    return BasicMCPServer()
+
 # Testes para FileManagerTool
 class TestFileManagerTool:
     """Testes para FileManagerTool"""
@@ -127,6 +244,66 @@ class TestFileManagerTool:
         assert read_result.content == test_content
         assert read_result.metadata["file_size"] == len(test_content.encode("utf-8"))
     
+    @pytest.mark.asyncio
+    async def test_write_many_atomic_batch(self, file_manager_tool, temp_dir):
+        """Testa escrita em lote de vários arquivos"""
+        files = [{"path": f"pacote/mod_{i}.py", "content": f"VALOR = {i}\n"} for i in range(20)]
+        files.append({"path": "pacote/sub/leia.md", "content": "# Título"})
+        
+        result = await file_manager_tool.safe_execute(operation="write_many", file_path="gerado", files=files)
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert result.metadata["file_count"] == 21
+        assert result.metadata["directories"] == 2
+        assert (temp_dir / "gerado" / "pacote" / "mod_7.py").read_text() == "VALOR = 7\n"
+        assert (temp_dir / "gerado" / "pacote" / "sub" / "leia.md").read_text() == "# Título"
+        assert not list((temp_dir / "gerado").rglob("*.tmp"))
+    
+    @pytest.mark.asyncio
+    async def test_write_many_file_modes_follow_current_umask(self, file_manager_tool, temp_dir):
+        """Testa modos: arquivo novo segue o umask atual, existente mantém o próprio modo"""
+        existing = temp_dir / "existente.txt"
+        existing.write_text("antigo")
+        existing.chmod(0o644)
+        
+        umask = os.umask(0o027)
+        try:
+            result = await file_manager_tool.safe_execute(
+                operation="write_many", file_path=".",
+                files=[{"path": "novo.txt", "content": "novo"}, {"path": "existente.txt", "content": "novo"}]
+            )
+        finally:
+            os.umask(umask)
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert stat.S_IMODE((temp_dir / "novo.txt").stat().st_mode) == 0o640
+        assert stat.S_IMODE(existing.stat().st_mode) == 0o644
+    
+    @pytest.mark.asyncio
+    async def test_write_many_failure_leaves_no_partial_files(self, file_manager_tool, temp_dir):
+        """Testa que falha no lote não deixa temporários nem arquivos novos"""
+        (temp_dir / "ocupado.txt").mkdir()
+        files = [
+            {"path": "novo.txt", "content": "novo"},
+            {"path": "ocupado.txt", "content": "não pode substituir diretório"}
+        ]
+        
+        result = await file_manager_tool.safe_execute(operation="write_many", file_path=".", files=files)
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert not list(temp_dir.glob(".*.tmp"))
+        assert not (temp_dir / "novo.txt").exists()
+    
+    @pytest.mark.asyncio
+    async def test_write_many_rejects_paths_outside_base(self, file_manager_tool):
+        """Testa validação de caminhos em write_many"""
+        result = await file_manager_tool.safe_execute(
+            operation="write_many", file_path=".", files=[{"path": "../fora.txt", "content": "x"}]
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "proibido" in result.error
+    
     @pytest.mark.asyncio
     async def test_read_nonexistent_file(self, file_manager_tool):
         """Testa leitura de arquivo inexistente"""
@@ -177,6 +354,46 @@ class TestFileManagerTool:
         assert "file2.json" in file_names
         assert "subdir" in file_names
     
+    @pytest.mark.asyncio
+    async def test_list_directory_pagination(self, file_manager_tool, temp_dir):
+        """Testa paginação da listagem com cursor"""
+        for i in range(25):
+            (temp_dir / f"arquivo_{i:02d}.txt").write_text(str(i))
+        
+        names = []
+        cursor = None
+        while True:
+            result = await file_manager_tool.safe_execute(operation="list", file_path=".", limit=10, cursor=cursor)
+            MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+            page = json.loads(result.content)
+            assert len(page) <= 10
+            assert result.metadata["total_entries"] == 25
+            names.extend(item["name"] for item in page)
+            cursor = result.metadata["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert names == [f"arquivo_{i:02d}.txt" for i in range(25)]
+    
+    @pytest.mark.asyncio
+    async def test_list_directory_recursive_with_pattern(self, file_manager_tool, temp_dir):
+        """Testa listagem recursiva com limite de profundidade e filtro glob"""
+        (temp_dir / "a" / "b" / "c").mkdir(parents=True)
+        (temp_dir / "raiz.py").write_text("")
+        (temp_dir / "a" / "nivel1.py").write_text("")
+        (temp_dir / "a" / "b" / "nivel2.py").write_text("")
+        (temp_dir / "a" / "b" / "c" / "nivel3.py").write_text("")
+        (temp_dir / "a" / "notas.txt").write_text("")
+        
+        result = await file_manager_tool.safe_execute(
+            operation="list", file_path=".", recursive=True, max_depth=3, pattern="*.py"
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        items = json.loads(result.content)
+        assert [item["name"] for item in items] == ["a/b/nivel2.py", "a/nivel1.py", "raiz.py"]
+        assert all(item["type"] == "file" and item["size"] == 0 for item in items)
+    
     @pytest.mark.asyncio
     async def test_create_directory(self, file_manager_tool, temp_dir):
         """Testa criação de diretório"""
@@ -207,6 +424,186 @@ class TestFileManagerTool:
         MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
         assert not test_file.exists()
     
+    @pytest.mark.asyncio
+    async def test_read_byte_range_pages(self, file_manager_tool, temp_dir):
+        """Testa leitura paginada por bytes sem cortar caracteres multibyte"""
+        content = "ação-çãõ-" * 50
+        (temp_dir / "paginas.txt").write_text(content, encoding="utf-8")
+        
+        pages = []
+        result = await file_manager_tool.safe_execute(operation="read", file_path="paginas.txt", offset=0, length=7)
+        while True:
+            MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+            pages.append(result.content)
+            cursor = result.metadata["next_cursor"]
+            if cursor is None:
+                break
+            result = await file_manager_tool.safe_execute(operation="read", file_path="paginas.txt", cursor=cursor, length=7)
+        
+        assert "".join(pages) == content
+        assert len(pages) > 1
+    
+    @pytest.mark.asyncio
+    async def test_read_byte_range_always_advances(self, file_manager_tool, temp_dir):
+        """Testa páginas menores que um caractere, offset no meio de caractere e line_count inválido"""
+        (temp_dir / "cedilha.txt").write_text("çççç", encoding="utf-8")
+        
+        pages = []
+        cursor = None
+        for _ in range(10):
+            kwargs = {"cursor": cursor} if cursor else {"offset": 0}
+            result = await file_manager_tool.safe_execute(operation="read", file_path="cedilha.txt", length=1, **kwargs)
+            MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+            pages.append(result.content)
+            cursor = result.metadata["next_cursor"]
+            if cursor is None:
+                break
+        assert pages == ["ç"] * 4
+        
+        result = await file_manager_tool.safe_execute(operation="read", file_path="cedilha.txt", offset=1, length=2)
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert result.content == "ç"
+        assert result.metadata["offset"] == 2
+        
+        result = await file_manager_tool.safe_execute(operation="read", file_path="cedilha.txt", line_count=-3)
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "line_count" in result.error
+    
+    @pytest.mark.asyncio
+    async def test_read_line_range(self, file_manager_tool, temp_dir):
+        """Testa leitura por intervalo de linhas com cursor"""
+        (temp_dir / "log.txt").write_text("".join(f"linha {i}\n" for i in range(1, 11)))
+        
+        result = await file_manager_tool.safe_execute(operation="read", file_path="log.txt", start_line=3, line_count=2)
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert result.content == "linha 3\nlinha 4\n"
+        
+        result = await file_manager_tool.safe_execute(
+            operation="read", file_path="log.txt", cursor=result.metadata["next_cursor"], line_count=10
+        )
+        assert result.content.splitlines() == [f"linha {i}" for i in range(5, 11)]
+        assert result.metadata["next_cursor"] is None
+    
+    @pytest.mark.asyncio
+    async def test_read_enforces_max_size(self, file_manager_tool, temp_dir):
+        """Testa que leituras completas respeitam max_size"""
+        (temp_dir / "grande.txt").write_text("x" * 2048)
+        
+        result = await file_manager_tool.safe_execute(operation="read", file_path="grande.txt", max_size=1024)
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "max_size" in result.error
+        
+        result = await file_manager_tool.safe_execute(operation="read", file_path="grande.txt", offset=0, max_size=1024)
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert len(result.content) == 1024
+        assert result.metadata["next_cursor"] == "b:1024"
+    
+    @pytest.mark.asyncio
+    async def test_read_cache_hits_and_invalidation(self, file_manager_tool, temp_dir):
+        """Testa cache de leitura validado por (inode, mtime, tamanho)"""
+        target = temp_dir / "config.json"
+        target.write_text('{"versao": 1}')
+        
+        first = await file_manager_tool.safe_execute(operation="read", file_path="config.json")
+        second = await file_manager_tool.safe_execute(operation="read", file_path="config.json")
+        assert first.metadata["cache"] == "miss"
+        assert second.metadata["cache"] == "hit"
+        assert second.content == '{"versao": 1}'
+        
+        # Alteração externa muda a assinatura e invalida a entrada
+        target.write_text('{"versao": 22}')
+        third = await file_manager_tool.safe_execute(operation="read", file_path="config.json")
+        assert third.metadata["cache"] == "miss"
+        assert third.content == '{"versao": 22}'
+        
+        metrics = file_manager_tool.read_cache.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["invalidations"] == 1
+    
+    def test_read_cache_byte_budget(self):
+        """Testa despejo LRU pelo orçamento de bytes"""
+        from advanced_tool_implementation import FileReadCache
+        
+        content = "x" * 1000
+        cache = FileReadCache(max_bytes=2500)
+        file_stat = Path(__file__).stat()
+        for name in ("a", "b", "c"):
+            cache.put(name, "utf-8", file_stat, content)
+        
+        assert cache.get("a", "utf-8", file_stat) is None
+        assert cache.get("c", "utf-8", file_stat) == content
+        assert cache.get_metrics()["evictions"] == 1
+        assert cache.current_bytes <= 2500
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify só existe no Linux")
+    async def test_read_cache_inotify(self, temp_dir):
+        """Testa hits sem stat e invalidação por inotify"""
+        tool = FileManagerTool(config={"base_directory": str(temp_dir), "read_cache_inotify": True})
+        target = temp_dir / "fonte.py"
+        target.write_text("a = 1")
+        
+        await tool.safe_execute(operation="read", file_path="fonte.py")
+        hit = await tool.safe_execute(operation="read", file_path="fonte.py")
+        assert hit.metadata["cache"] == "hit"
+        assert tool.read_cache.get_metrics()["inotify"] is True
+        
+        target.write_text("a = 2")
+        changed = await tool.safe_execute(operation="read", file_path="fonte.py")
+        assert changed.metadata["cache"] == "miss"
+        assert changed.content == "a = 2"
+    
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify só existe no Linux")
+    def test_read_cache_inotify_change_before_watch(self, temp_dir):
+        """Testa que uma escrita entre a leitura e o watch não fica em cache"""
+        from advanced_tool_implementation import FileReadCache
+        
+        cache = FileReadCache(use_inotify=True)
+        target = temp_dir / "corrida.py"
+        target.write_text("a = 1")
+        path = str(target.resolve())
+        stale_stat = os.stat(path)
+        
+        # Escrita concorrente antes de o diretório passar a ser observado
+        target.write_text("a = 22")
+        cache.put(path, "utf-8", stale_stat, "a = 1")
+        
+        assert cache.get_watched(path, "utf-8") is None
+        assert cache.get(path, "utf-8", os.stat(path)) is None
+    
+    @pytest.mark.asyncio
+    async def test_io_runs_off_event_loop(self, temp_dir):
+        """Testa que o I/O roda no pool de threads e gera métricas de vazão"""
+        tool = FileManagerTool(config={"base_directory": str(temp_dir), "io_workers": 2})
+        content = "linha de teste\n" * 1000
+        
+        # Heartbeat no event loop continua rodando durante as operações de I/O
+        ticks = 0
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        heartbeat_task = asyncio.create_task(heartbeat())
+        
+        try:
+            write_result = await tool.safe_execute(operation="write", file_path="io/dados.txt", content=content)
+            read_result = await tool.safe_execute(operation="read", file_path="io/dados.txt")
+        finally:
+            heartbeat_task.cancel()
+            tool.io.shutdown()
+        
+        MCPTestHelper.assert_valid_tool_result(write_result, should_succeed=True)
+        assert read_result.content == content
+        assert ticks > 0
+        
+        metrics = tool.io.get_metrics()
+        assert metrics["reads"] == 1
+        assert metrics["writes"] == 1
+        assert metrics["bytes_read"] == metrics["bytes_written"] == len(content.encode("utf-8"))
+        assert metrics["read_throughput"] > 0
+        assert metrics["in_flight"] == 0
+    
     @pytest.mark.asyncio
     async def test_security_path_traversal(self, file_manager_tool):
         """Testa proteção contra path traversal"""
@@ -226,15 +623,162 @@ class TestFileManagerTool:
             MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
             assert any(forbidden in result.error.lower() for forbidden in ["proibido", "permitido", "fora"])
 
+# Testes de segurança para PathGuard
+class TestPathGuardSecurity:
+    """Testes de segurança do confinamento de caminhos"""
+    
+    @pytest.fixture
+    def sandbox(self, temp_dir):
+        base = temp_dir / "data"
+        (base / "docs").mkdir(parents=True)
+        (base / "docs" / "ok.txt").write_text("ok")
+        (temp_dir / "data2").mkdir()
+        (temp_dir / "data2" / "segredo.txt").write_text("segredo")
+        return base
+    
+    def test_accepts_paths_inside_base(self, sandbox):
+        """Testa caminhos válidos, inclusive absolutos dentro da base"""
+        guard = PathGuard(sandbox)
+        
+        assert guard.resolve("docs/ok.txt") == sandbox.resolve() / "docs" / "ok.txt"
+        assert guard.resolve(".") == sandbox.resolve()
+        assert guard.resolve(str(sandbox / "docs" / "ok.txt")) == sandbox.resolve() / "docs" / "ok.txt"
+    
+    def test_rejects_sibling_with_shared_prefix(self, sandbox, temp_dir):
+        """Testa que /base2 não é aceito como parte de /base (bug do startswith)"""
+        guard = PathGuard(sandbox)
+        
+        with pytest.raises(ValueError, match="fora do diretório"):
+            guard.resolve(str(temp_dir / "data2" / "segredo.txt"))
+    
+    @pytest.mark.parametrize("malicious_path", ["..", "docs/../../data2/segredo.txt", "/etc/passwd", "C:\\Windows", "c:arquivo.txt"])
+    def test_rejects_escapes(self, sandbox, malicious_path):
+        """Testa rejeição de travessia, caminhos absolutos externos e unidades Windows"""
+        guard = PathGuard(sandbox)
+        
+        with pytest.raises(ValueError, match="não permitido|fora do diretório"):
+            guard.resolve(malicious_path)
+        assert guard.get_metrics()["rejections"] == 1
+    
+    def test_rejects_symlink_escape(self, sandbox, temp_dir):
+        """Testa symlink dentro da base apontando para fora"""
+        (sandbox / "atalho").symlink_to(temp_dir / "data2")
+        guard = PathGuard(sandbox)
+        
+        with pytest.raises(ValueError, match="fora do diretório"):
+            guard.resolve("atalho/segredo.txt")
+    
+    def test_detects_directory_swapped_for_symlink(self, sandbox, temp_dir):
+        """Testa que trocar um diretório já aceito por symlink invalida o cache"""
+        import shutil
+        
+        guard = PathGuard(sandbox)
+        guard.resolve("docs/ok.txt")
+        assert guard.resolve("docs/ok.txt")
+        assert guard.get_metrics()["hits"] == 1
+        
+        shutil.rmtree(sandbox / "docs")
+        (sandbox / "docs").symlink_to(temp_dir / "data2")
+        
+        with pytest.raises(ValueError, match="fora do diretório"):
+            guard.resolve("docs/ok.txt")
+        assert guard.get_metrics()["revalidations"] == 1
+    
+    def test_detects_ancestor_moved_out_and_symlinked_back(self, sandbox, temp_dir):
+        """Testa que mover um ancestral para fora da base e criar symlink de volta invalida o cache"""
+        (sandbox / "a" / "b").mkdir(parents=True)
+        (sandbox / "a" / "b" / "f.txt").write_text("dentro")
+        guard = PathGuard(sandbox)
+        guard.resolve("a/b/f.txt")
+        
+        (sandbox / "a").rename(temp_dir / "fora")
+        (temp_dir / "fora" / "b" / "f.txt").write_text("fora")
+        (sandbox / "a").symlink_to(temp_dir / "fora")
+        
+        with pytest.raises(ValueError, match="fora do diretório"):
+            guard.resolve("a/b/f.txt")
+        with pytest.raises(ValueError, match="fora do diretório"):
+            PathGuard(sandbox).resolve("a/b/f.txt")
+    
+    def test_detects_file_swapped_for_symlink(self, sandbox, temp_dir):
+        """Testa que trocar o arquivo alvo por symlink invalida o cache"""
+        guard = PathGuard(sandbox)
+        guard.resolve("docs/ok.txt")
+        
+        (sandbox / "docs" / "ok.txt").unlink()
+        (sandbox / "docs" / "ok.txt").symlink_to(temp_dir / "data2" / "segredo.txt")
+        
+        with pytest.raises(ValueError, match="fora do diretório"):
+            guard.resolve("docs/ok.txt")
+    
+    @pytest.mark.asyncio
+    async def test_file_manager_rejects_sibling_directory(self, sandbox, temp_dir):
+        """Testa o guard integrado ao FileManagerTool"""
+        tool = FileManagerTool(config={"base_directory": str(sandbox)})
+        
+        result = await tool.safe_execute(operation="read", file_path=str(temp_dir / "data2" / "segredo.txt"))
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "fora do diretório" in result.error
+
+# Testes para validação de parâmetros
+class TestParameterValidation:
+    """Testes para o validador compilado de BaseMCPTool"""
+    
+    def test_defaults_and_optional_parameters(self, web_api_tool):
+        """Testa aplicação de defaults e parâmetros opcionais ausentes"""
+        validated = web_api_tool.validate_parameters(url="https://api.example.com")
+        
+        assert validated["method"] == "GET"
+        assert validated["timeout"] == 30
+        assert validated["headers"] is None
+    
+    @pytest.mark.parametrize("kwargs,expected", [
+        ({}, "obrigatório 'url'"),
+        ({"url": 123}, "'url' deve ser do tipo string"),
+        ({"url": "https://api.example.com", "timeout": "10"}, "'timeout' deve ser do tipo integer"),
+        ({"url": "https://api.example.com", "timeout": True}, "'timeout' deve ser do tipo integer"),
+        ({"url": "https://api.example.com", "method": "TRACE"}, "inválido para 'method'"),
+    ])
+    def test_validation_errors(self, web_api_tool, kwargs, expected):
+        """Testa erros de obrigatoriedade, tipo e enum"""
+        with pytest.raises(ValueError, match=expected):
+            web_api_tool.validate_parameters(**kwargs)
+    
+    def test_file_request_validation_cached(self):
+        """Testa cache de FileOperationRequest para argumentos idênticos"""
+        first = validate_file_request("dados/arquivo.txt", "utf-8")
+        assert validate_file_request("dados/arquivo.txt", "utf-8") is first
+        
+        with pytest.raises(ValueError, match="padrão proibido: ../"):
+            validate_file_request("dados/../segredo.txt")
+    
+    def test_api_request_fast_path(self):
+        """Testa que o caminho rápido produz o mesmo request do modelo completo"""
+        fast = validate_api_request("https://api.example.com", "post", {"X-Id": "1"}, {"a": 1}, 10)
+        full = APICallRequest(url="https://api.example.com", method="post", headers={"X-Id": "1"}, data={"a": 1}, timeout=10)
+        
+        assert fast == full
+        with pytest.raises(ValueError, match="headers"):
+            validate_api_request("https://api.example.com", headers={"X-Id": 1})
+        with pytest.raises(ValueError):
+            validate_api_request("https://api.example.com", timeout=0)
+    
+    def test_validator_cached_per_class(self, web_api_tool):
+        """Testa que o validador é compilado uma vez por classe"""
+        other_tool = WebAPITool()
+        assert web_api_tool.get_validator() is other_tool.get_validator()
+        assert web_api_tool.get_validator() is not DataProcessingTool().get_validator()
+
 # Testes para WebAPITool
 class TestWebAPITool:
     """Testes para WebAPITool"""
     
     @pytest.mark.asyncio
-    async def test_valid_api_call(self, web_api_tool):
+    async def test_valid_api_call(self, stub_api_tool, stub_http_server):
         """Testa chamada de API válida"""
-        result = await web_api_tool.safe_execute(
-            url="https://api.example.com/users",
+        result = await stub_api_tool.safe_execute(
+            url=f"{stub_http_server.base_url}/users",
             method="GET"
         )
         
@@ -244,7 +788,9 @@ class TestWebAPITool:
         response_data = json.loads(result.content)
         assert response_data["status"] == "success"
         assert response_data["method"] == "GET"
+        assert response_data["data"] == {"method": "GET", "path": "/users", "user_agent": "MCP-Test/1.0"}
         assert result.metadata["method"] == "GET"
+        assert result.metadata["status_code"] == 200
     
     @pytest.mark.asyncio
     async def test_invalid_url(self, web_api_tool):
@@ -269,12 +815,12 @@ class TestWebAPITool:
         assert "método" in result.error.lower() or "method" in result.error.lower()
     
     @pytest.mark.asyncio
-    async def test_post_with_data(self, web_api_tool):
+    async def test_post_with_data(self, stub_api_tool, stub_http_server):
         """Testa POST com dados"""
         post_data = {"name": "Test User", "email": "test@example.com"}
         
-        result = await web_api_tool.safe_execute(
-            url="https://api.example.com/users",
+        result = await stub_api_tool.safe_execute(
+            url=f"{stub_http_server.base_url}/users",
             method="POST",
             data=post_data,
             headers={"Content-Type": "application/json"}
@@ -284,6 +830,289 @@ class TestWebAPITool:
         
         response_data = json.loads(result.content)
         assert response_data["method"] == "POST"
+        assert response_data["status_code"] == 201
+        assert response_data["data"]["received"] == post_data
+    
+    @pytest.mark.asyncio
+    async def test_keep_alive_reuses_connection(self, stub_api_tool, stub_http_server):
+        """Testa que chamadas sequenciais reaproveitam a mesma conexão"""
+        for _ in range(5):
+            result = await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/ping")
+            MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        
+        metrics = stub_api_tool.get_pool_metrics()
+        host = metrics["hosts"][f"http://127.0.0.1:{stub_http_server.server_address[1]}"]
+        assert stub_http_server.connections == 1
+        assert host["created"] == 1
+        assert host["reused"] == 4
+        assert result.metadata["connection_reused"] is True
+        
+        # Servidor pede Connection: close -> próxima chamada abre conexão nova
+        await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/close")
+        await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/ping")
+        assert stub_http_server.connections == 2
+        assert stub_api_tool.get_pool_metrics()["dns_hits"] == 1
+        await stub_api_tool.close()
+    
+    @pytest.mark.asyncio
+    async def test_body_without_length_read_until_close(self):
+        """Testa corpo sem Content-Length lido até o servidor fechar (não só o primeiro chunk)"""
+        async def handle(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: text/plain\r\n\r\nfirst-part;")
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            writer.write(b"second-part")
+            writer.close()
+        
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pool = HTTPConnectionPool()
+        try:
+            port = server.sockets[0].getsockname()[1]
+            response = await pool.request("GET", f"http://127.0.0.1:{port}/")
+            assert response.body == b"first-part;second-part"
+        finally:
+            await pool.close()
+            server.close()
+    
+    @pytest.mark.asyncio
+    async def test_chunked_body_truncated_by_close_fails(self):
+        """Testa conexão fechada no meio de um corpo chunked: erro, não resposta completa"""
+        async def handle(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n")
+            await writer.drain()
+            writer.close()
+        
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pool = HTTPConnectionPool()
+        try:
+            port = server.sockets[0].getsockname()[1]
+            with pytest.raises(asyncio.IncompleteReadError):
+                await pool.request("GET", f"http://127.0.0.1:{port}/")
+            assert pool.get_metrics()["hosts"][f"http://127.0.0.1:{port}"]["idle"] == 0
+        finally:
+            await pool.close()
+            server.close()
+    
+    @pytest.mark.asyncio
+    async def test_interim_responses_skipped(self):
+        """Testa 100 Continue e 103 Early Hints ignorados até a resposta final"""
+        async def handle(reader, writer):
+            for body in (b"um", b"dois"):
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n"
+                             b"HTTP/1.1 103 Early Hints\r\nLink: </estilo.css>; rel=preload\r\n\r\n"
+                             b"HTTP/1.1 200 OK\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+            writer.close()
+        
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pool = HTTPConnectionPool()
+        try:
+            port = server.sockets[0].getsockname()[1]
+            first = await pool.request("GET", f"http://127.0.0.1:{port}/")
+            second = await pool.request("GET", f"http://127.0.0.1:{port}/")
+            assert (first.status, first.body) == (200, b"um")
+            assert (second.status, second.body) == (200, b"dois")
+            assert second.connection_reused
+        finally:
+            await pool.close()
+            server.close()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,retried", [("GET", True), ("POST", False)])
+    async def test_reused_connection_retry_only_idempotent(self, method, retried):
+        """Testa que só métodos idempotentes são reenviados quando a conexão reaproveitada cai"""
+        received = []
+        
+        async def handle(reader, writer):
+            # Cada conexão responde só ao primeiro request; no segundo, recebe e fecha sem responder
+            for index in range(2):
+                try:
+                    received.append((await reader.readuntil(b"\r\n\r\n")).split(b" ", 1)[0])
+                except asyncio.IncompleteReadError:
+                    break
+                if index == 1:
+                    break
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+            writer.close()
+        
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pool = HTTPConnectionPool()
+        try:
+            url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+            await pool.request("GET", url)
+            if retried:
+                assert (await pool.request(method, url, body=b"{}")).body == b"ok"
+                assert pool.get_metrics()["retries"] == 1
+            else:
+                with pytest.raises(ConnectionError):
+                    await pool.request(method, url, body=b"{}")
+                assert pool.get_metrics()["retries"] == 0
+            # GET: original + tentativa perdida + reenvio; POST: enviado uma única vez
+            assert received.count(method.encode()) == (3 if retried else 1)
+        finally:
+            await pool.close()
+            server.close()
+    
+    @pytest.mark.asyncio
+    async def test_pool_limits_connections_per_host(self, stub_api_tool, stub_http_server):
+        """Testa que o pool não abre mais conexões que pool_size por host"""
+        results = await asyncio.gather(*[
+            stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/slow?delay=0.05&n={i}")
+            for i in range(6)
+        ])
+        
+        assert all(result.success for result in results)
+        host = next(iter(stub_api_tool.get_pool_metrics()["hosts"].values()))
+        assert host["created"] == 2
+        assert host["waits"] == 4
+        assert host["active"] == 0 and host["idle"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_response_cache_fresh_and_revalidated(self, stub_api_tool, stub_http_server):
+        """Testa hits com max-age e revalidação por ETag (304)"""
+        base = stub_http_server.base_url
+        first = await stub_api_tool.safe_execute(url=f"{base}/cached")
+        second = await stub_api_tool.safe_execute(url=f"{base}/cached")
+        
+        assert first.metadata["cache"] == "miss"
+        assert second.metadata["cache"] == "hit"
+        assert json.loads(second.content)["data"] == {"served": 1}
+        assert stub_http_server.hits["/cached"] == 1
+        
+        await stub_api_tool.safe_execute(url=f"{base}/etag")
+        revalidated = await stub_api_tool.safe_execute(url=f"{base}/etag")
+        
+        assert revalidated.metadata["cache"] == "revalidated"
+        assert json.loads(revalidated.content)["data"] == {"served": 1}
+        assert stub_http_server.hits["/etag"] == 2
+        
+        metrics = stub_api_tool.get_cache_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["revalidated"] == 1
+        assert metrics["hit_ratio"] == 0.25
+    
+    @pytest.mark.asyncio
+    async def test_response_cache_vary_and_private(self, stub_api_tool, stub_http_server):
+        """Testa variantes por Vary (Cookie fora da chave) e respostas private não guardadas"""
+        url = f"{stub_http_server.base_url}/vary-cookie"
+        alice = await stub_api_tool.safe_execute(url=url, headers={"Cookie": "sessao=alice"})
+        bob = await stub_api_tool.safe_execute(url=url, headers={"Cookie": "sessao=bob"})
+        bob_again = await stub_api_tool.safe_execute(url=url, headers={"Cookie": "sessao=bob"})
+        
+        assert json.loads(alice.content)["data"]["cookie"] == "sessao=alice"
+        assert bob.metadata["cache"] == "miss"
+        assert json.loads(bob.content)["data"]["cookie"] == "sessao=bob"
+        assert bob_again.metadata["cache"] == "hit"
+        assert json.loads(bob_again.content)["data"] == {"served": 2, "cookie": "sessao=bob"}
+        
+        first = await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/private")
+        second = await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/private")
+        assert (first.metadata["cache"], second.metadata["cache"]) == ("miss", "miss")
+        assert stub_http_server.hits["/private"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, stub_api_tool, stub_http_server):
+        """Testa resposta stale imediata com atualização em segundo plano"""
+        url = f"{stub_http_server.base_url}/swr"
+        await stub_api_tool.safe_execute(url=url)
+        stale = await stub_api_tool.safe_execute(url=url)
+        
+        assert stale.metadata["cache"] == "stale"
+        assert json.loads(stale.content)["data"] == {"served": 1}
+        
+        for _ in range(50):
+            if stub_api_tool.get_cache_metrics()["inflight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        refreshed = await stub_api_tool.safe_execute(url=url)
+        
+        assert json.loads(refreshed.content)["data"] == {"served": 2}
+        assert stub_api_tool.get_cache_metrics()["background_refreshes"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_coalesced(self, stub_api_tool, stub_http_server):
+        """Testa que GETs idênticos simultâneos geram uma única chamada"""
+        results = await asyncio.gather(*[
+            stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/slow-cached") for _ in range(10)
+        ])
+        
+        assert all(result.success for result in results)
+        assert stub_http_server.hits["/slow-cached"] == 1
+        assert stub_api_tool.get_cache_metrics()["coalesced"] == 9
+        assert sorted(result.metadata["cache"] for result in results).count("coalesced") == 9
+        
+        # no-store: nada fica em cache
+        await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/slow-cached")
+        assert stub_http_server.hits["/slow-cached"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_per_host(self, stub_http_server):
+        """Testa abertura do circuito por host, rejeição rápida e recuperação"""
+        tool = WebAPITool(config={
+            "circuit_breaker": {"window_size": 5, "min_calls": 3, "recovery_timeout": 0.2, "success_threshold": 1}
+        })
+        base = stub_http_server.base_url
+        
+        for _ in range(3):
+            result = await tool.safe_execute(url=f"{base}/status/503")
+            assert result.metadata["status_code"] == 503
+        rejected = await tool.safe_execute(url=f"{base}/ping")
+        
+        MCPTestHelper.assert_valid_tool_result(rejected, should_succeed=False)
+        assert "circuit breaker aberto" in rejected.error.lower()
+        host = base.split("//", 1)[1]
+        assert tool.get_host_metrics()[host]["circuit_breaker"]["state"] == "open"
+        assert "/ping" not in stub_http_server.hits
+        
+        await asyncio.sleep(0.25)
+        recovered = await tool.safe_execute(url=f"{base}/ping")
+        
+        MCPTestHelper.assert_valid_tool_result(recovered, should_succeed=True)
+        assert tool.get_host_metrics()[host]["circuit_breaker"]["state"] == "closed"
+    
+    @pytest.mark.asyncio
+    async def test_cache_hits_bypass_breaker_and_limiter(self, stub_http_server):
+        """Testa que hits do cache não são barrados por breaker aberto nem esperam o limitador"""
+        tool = WebAPITool(config={
+            "circuit_breaker": {"window_size": 5, "min_calls": 3, "recovery_timeout": 60, "success_threshold": 1}
+        })
+        base = stub_http_server.base_url
+        host = base.split("//", 1)[1]
+        assert (await tool.safe_execute(url=f"{base}/cached")).metadata["cache"] == "miss"
+        for _ in range(3):
+            await tool.safe_execute(url=f"{base}/status/503")
+        assert tool.get_host_metrics()[host]["circuit_breaker"]["state"] == "open"
+        
+        # Ocupa todas as vagas do limitador do host
+        limiter = tool.limiters[host]
+        for _ in range(int(limiter.limit)):
+            await limiter.acquire()
+        
+        hit = await asyncio.wait_for(tool.safe_execute(url=f"{base}/cached"), timeout=1.0)
+        
+        MCPTestHelper.assert_valid_tool_result(hit, should_succeed=True)
+        assert hit.metadata["cache"] == "hit"
+        assert stub_http_server.hits["/cached"] == 1
+        await tool.close()
+    
+    @pytest.mark.asyncio
+    async def test_timeout_and_http_errors(self, stub_api_tool, stub_http_server):
+        """Testa timeout vindo do request e status HTTP de erro"""
+        result = await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/slow?delay=1.5", timeout=1)
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "timeout" in result.error.lower()
+        assert stub_api_tool.get_pool_metrics()["timeouts"] == 1
+        
+        result = await stub_api_tool.safe_execute(url=f"{stub_http_server.base_url}/status/503")
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert result.error.startswith("HTTP 503")
+        assert result.metadata["status_code"] == 503
     
     @pytest.mark.asyncio
     async def test_domain_restriction(self, web_api_tool):
@@ -296,6 +1125,59 @@ class TestWebAPITool:
         MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
         assert "domínio" in result.error.lower() or "domain" in result.error.lower()
 
+class TestAdaptiveConcurrency:
+    """Testes para HostCircuitBreaker e AdaptiveConcurrencyLimiter"""
+    
+    @pytest.mark.asyncio
+    async def test_limit_shrinks_when_latency_rises(self):
+        """Testa aumento aditivo com latência estável e redução multiplicativa quando ela sobe"""
+        limiter = AdaptiveConcurrencyLimiter("api", initial_limit=10, backoff_ratio=0.5)
+        
+        for _ in range(20):
+            await limiter.acquire()
+            limiter.release(True, 0.01)
+        grown = limiter.get_stats()["limit"]
+        assert grown > 10
+        
+        for _ in range(3):
+            await limiter.acquire()
+            limiter.release(True, 0.5)
+        
+        assert limiter.get_stats()["limit"] == max(1, int(grown * 0.125))
+        assert limiter.stats["decreases"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_waiters_queue_and_timeout(self):
+        """Testa fila por vaga e rejeição após queue_timeout"""
+        limiter = AdaptiveConcurrencyLimiter("api", initial_limit=1, queue_timeout=0.05)
+        await limiter.acquire()
+        
+        with pytest.raises(ConcurrencyLimitError):
+            await limiter.acquire()
+        
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release(True, 0.01, sample=False)
+        await waiter
+        
+        assert limiter.in_flight == 1
+        assert limiter.stats["queued"] == 2
+        assert limiter.stats["rejected"] == 1
+    
+    def test_breaker_counts_slow_calls_and_limits_probes(self):
+        """Testa chamadas lentas como falha e número de sondas em HALF_OPEN"""
+        breaker = HostCircuitBreaker("api", window_size=4, min_calls=2, slow_call_seconds=1.0,
+                                     recovery_timeout=0.0, half_open_max_calls=1)
+        for _ in range(2):
+            breaker.record(breaker.allow(), True, 2.0)
+        
+        assert breaker.state == "open"
+        probe = breaker.allow()
+        assert probe == "half_open"
+        assert breaker.allow() is None
+        breaker.abandon(probe)
+        assert breaker.allow() == "half_open"
+
 # Testes para DataProcessingTool
 class TestDataProcessingTool:
     """Testes para DataProcessingTool"""
@@ -316,6 +1198,61 @@ class TestDataProcessingTool:
         assert "metadata" in analysis["keys"]
         assert analysis["key_count"] == 2
     
+    @pytest.mark.asyncio
+    async def test_analyze_bounded_width_and_nodes(self, data_processing_tool):
+        """Testa amostragem de chaves/itens e orçamento de nós na análise"""
+        wide = {"wide": {f"key_{i}": i for i in range(5000)}, "items": list(range(1000))}
+        
+        result = await data_processing_tool.safe_execute(
+            operation="analyze",
+            data=json.dumps(wide),
+            options={"max_keys": 10, "sample_items": 5}
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        analysis = json.loads(result.content)
+        wide_node = analysis["children"]["wide"]
+        assert wide_node["key_count"] == 5000
+        assert wide_node["sampled"] is True
+        assert len(wide_node["keys"]) == len(wide_node["children"]) == 10
+        assert analysis["children"]["items"]["length"] == 1000
+        assert len(analysis["children"]["items"]["sample_items"]) == 5
+        assert analysis["aggregates"]["types"]["int"]["count"] == 15
+        
+        result = await data_processing_tool.safe_execute(
+            operation="analyze",
+            data=json.dumps(wide),
+            options={"max_nodes": 2}
+        )
+        
+        analysis = json.loads(result.content)
+        assert analysis["nodes_visited"] == 2
+        assert analysis["truncated"] is True
+        assert analysis["children"]["items"] == {"type": "array", "depth": 1, "truncated": True}
+    
+    @pytest.mark.asyncio
+    async def test_analyze_aggregates(self, data_processing_tool):
+        """Testa agregados por tipo e proporção de nulos"""
+        result = await data_processing_tool.safe_execute(
+            operation="analyze",
+            data=json.dumps([3, -1.5, None, "abc"]),
+            options={"sample_items": 10}
+        )
+        
+        analysis = json.loads(result.content)
+        types = analysis["aggregates"]["types"]
+        assert types["int"] == {"count": 1, "min": 3, "max": 3}
+        assert types["float"]["min"] == -1.5
+        assert types["str"]["max_length"] == 3
+        assert analysis["aggregates"]["null_ratio"] == 0.2
+    
+    @pytest.mark.asyncio
+    async def test_analyze_invalid_options(self, data_processing_tool):
+        """Testa limites de análise inválidos"""
+        for options in ({"max_nodes": 0}, {"sampling": "random"}, {"max_depth": "3"}):
+            result = await data_processing_tool.safe_execute(operation="analyze", data="{}", options=options)
+            MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+    
     @pytest.mark.asyncio
     async def test_transform_uppercase_keys(self, data_processing_tool):
         """Testa transformação de chaves para maiúscula"""
@@ -364,6 +1301,76 @@ class TestDataProcessingTool:
         assert "user.settings.theme" in flattened
         assert flattened["user.profile.name"] == "Alice"
     
+    @pytest.mark.asyncio
+    async def test_transform_record_batch(self, data_processing_tool):
+        """Testa flatten e uppercase_keys em lista de registros"""
+        records = [{"id": 1, "user": {"name": "Alice"}}, {"id": 2, "user": {"name": "Bob"}}, "não é objeto"]
+        
+        flattened = await data_processing_tool.safe_execute(
+            operation="transform", data=json.dumps(records), options={"type": "flatten"}
+        )
+        uppercased = await data_processing_tool.safe_execute(
+            operation="transform", data=json.dumps(records), options={"type": "uppercase_keys"}
+        )
+        
+        assert json.loads(flattened.content) == [
+            {"id": 1, "user.name": "Alice"}, {"id": 2, "user.name": "Bob"}, "não é objeto"
+        ]
+        assert json.loads(uppercased.content)[1] == {"ID": 2, "USER": {"name": "Bob"}}
+    
+    @pytest.mark.asyncio
+    async def test_transform_columnar_layout(self, data_processing_tool):
+        """Testa layout columnar com colunas alinhadas e seleção de caminhos"""
+        records = [{"id": 1, "user": {"name": "Alice"}}, {"id": 2, "extra": True}]
+        
+        result = await data_processing_tool.safe_execute(
+            operation="transform",
+            data=json.dumps(records),
+            options={"type": "flatten", "layout": "columnar"}
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert json.loads(result.content) == {
+            "row_count": 2,
+            "columns": {"id": [1, 2], "user.name": ["Alice", None], "extra": [None, True]}
+        }
+        
+        result = await data_processing_tool.safe_execute(
+            operation="transform",
+            data=json.dumps(records),
+            options={"type": "flatten", "layout": "columnar", "fields": ["user.name", "missing"]}
+        )
+        
+        assert json.loads(result.content)["columns"] == {"user.name": ["Alice", None], "missing": [None, None]}
+        
+        result = await data_processing_tool.safe_execute(
+            operation="transform",
+            data=json.dumps([1, 2]),
+            options={"type": "flatten", "layout": "columnar"}
+        )
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+    
+    def test_transform_reuses_key_paths(self):
+        """Testa que caminhos de chave são as mesmas strings entre registros"""
+        transformer = RecordTransformer("flatten")
+        first, second = transformer.transform([{"a": {"b": 1}}, {"a": {"b": 2}}])
+        
+        assert next(iter(first)) is next(iter(second))
+    
+    def test_transform_columnar_reused_and_colliding_keys(self):
+        """Testa reuso do transformer entre chamadas e colisão de chaves achatadas"""
+        transformer = RecordTransformer("flatten", layout="columnar")
+        first = transformer.transform([{"a": {"b": 1}}])
+        second = transformer.transform([{"a": {"b": 2}}, {"c": 3}])
+        
+        assert first["columns"] == {"a.b": [1]}
+        assert second["columns"] == {"a.b": [2, None], "c": [None, 3]}
+        
+        collided = transformer.transform([{"a.b": 1, "a": {"b": 2}}, {"a.b": 3}])
+        assert collided["columns"] == {"a.b": [2, 3]}
+        assert collided["columns"]["a.b"] == [RecordTransformer("flatten").transform(
+            {"a.b": 1, "a": {"b": 2}})["a.b"], 3]
+    
     @pytest.mark.asyncio
     async def test_validate_with_required_fields(self, data_processing_tool):
         """Testa validação com campos obrigatórios"""
@@ -396,6 +1403,67 @@ class TestDataProcessingTool:
         assert len(validation["errors"]) == 1
         assert "email" in validation["errors"][0]
     
+    @pytest.mark.asyncio
+    async def test_validate_schema_batch(self, data_processing_tool):
+        """Testa validação em lote com contagens e amostra de falhas"""
+        schema = {
+            "type": "object",
+            "required": ["id", "email"],
+            "properties": {
+                "id": {"type": "integer", "minimum": 1},
+                "email": {"type": "string", "pattern": "@"},
+                "tags": {"type": "array", "items": {"type": "string"}}
+            }
+        }
+        records = [{"id": i, "email": f"user{i}@example.com", "tags": ["a"]} for i in range(1, 101)]
+        records[10]["id"] = 0
+        records[20]["email"] = "sem-arroba"
+        records[30]["tags"] = ["a", 1]
+        del records[40]["email"]
+        records[50]["id"] = True
+        
+        result = await data_processing_tool.safe_execute(
+            operation="validate",
+            data=json.dumps(records),
+            options={"schema": schema, "max_error_samples": 3}
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        report = json.loads(result.content)
+        assert report["valid"] is False
+        assert report["record_count"] == 100
+        assert report["invalid_records"] == 5
+        assert report["error_counts"] == {
+            "$.id: minimum": 1,
+            "$.email: pattern": 1,
+            "$.tags[*]: type": 1,
+            "$: required": 1,
+            "$.id: type": 1
+        }
+        assert report["errors"][0].startswith("[10] $.id")
+        assert len(report["errors"]) == 3
+        assert "2 erros omitidos" in report["warnings"][0]
+    
+    @pytest.mark.asyncio
+    async def test_validate_invalid_schema(self, data_processing_tool):
+        """Testa schema com tipo desconhecido"""
+        result = await data_processing_tool.safe_execute(
+            operation="validate",
+            data="{}",
+            options={"schema": {"type": "texto"}}
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "texto" in result.error
+    
+    def test_compiled_schema_cached_by_hash(self):
+        """Testa que schemas equivalentes reutilizam o validador compilado"""
+        first = compile_schema({"type": "object", "required": ["a"]})
+        second = compile_schema({"required": ["a"], "type": "object"})
+        
+        assert first is second
+        assert first.errors({"a": 1}) == []
+    
     @pytest.mark.asyncio
     async def test_summarize_dict(self, data_processing_tool, sample_json_data):
         """Testa resumo de dicionário"""
@@ -433,6 +1501,127 @@ class TestDataProcessingTool:
         assert "dict" in summary["item_types"]
         assert "list" in summary["item_types"]
     
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_processes", [True, False])
+    async def test_large_payload_offloaded_to_cpu_pool(self, data_processing_tool, monkeypatch, use_processes):
+        """Testa que payloads grandes são processados fora do event loop, no executor injetado"""
+        executor = CPUBoundExecutor(max_workers=2, use_processes=use_processes, shared_memory_threshold=1024)
+        monkeypatch.setattr(data_processing_tool, "cpu_executor", executor)
+        large_data = {f"key_{i}": "x" * 100 for i in range(3000)}
+        
+        try:
+            result = await data_processing_tool.safe_execute(
+                operation="summarize",
+                data=json.dumps(large_data)
+            )
+            
+            MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+            assert json.loads(result.content)["key_count"] == 3000
+            assert executor.get_metrics()["tasks"] == 1
+        finally:
+            executor.shutdown()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("operation", ["analyze", "summarize"])
+    @pytest.mark.parametrize("sampling", ["reservoir", "head"])
+    async def test_streaming_matches_full_parse(self, data_processing_tool, operation, sampling):
+        """Testa que o modo streaming produz o mesmo resultado do parse completo"""
+        test_data = {
+            "users": [{"id": i, "name": f"user {i}", "score": i * 1.5, "tags": ["a", "b"]} for i in range(10)],
+            "deep": {"a": {"b": {"c": {"d": {"e": 1}}}}},
+            "escaped": "aspas \" e colchetes ]}",
+            "flags": [True, False, None, -2.5e3]
+        }
+        data = json.dumps(test_data)
+        
+        options = {"sampling": sampling, "max_keys": 3, "max_nodes": 40}
+        full = await data_processing_tool.safe_execute(operation=operation, data=data, options={**options, "stream": False})
+        streamed = await data_processing_tool.safe_execute(operation=operation, data=data, options={**options, "stream": True})
+        
+        MCPTestHelper.assert_valid_tool_result(streamed, should_succeed=True)
+        assert streamed.metadata["streamed"] is True
+        assert json.loads(streamed.content) == json.loads(full.content)
+    
+    @pytest.mark.asyncio
+    async def test_size_taken_from_source(self, data_processing_tool):
+        """Testa que o tamanho reportado é o do texto de entrada, sem re-serializar"""
+        data = '{ "name" : "Alice",\n  "tags": [1, 2] }'
+        
+        analyzed = await data_processing_tool.safe_execute(operation="analyze", data=data)
+        summarized = await data_processing_tool.safe_execute(operation="summarize", data=data)
+        
+        assert json.loads(analyzed.content)["total_size"] == len(data)
+        assert json.loads(summarized.content)["size"] == len(data)
+        
+        # Tamanho em bytes UTF-8, não em caracteres (inclusive no caminho em streaming)
+        data = '{"nome": "João", "cidade": "São Paulo", "emoji": "🚀"}'
+        byte_size = len(data.encode("utf-8"))
+        assert byte_size > len(data)
+        for stream in (False, True):
+            analyzed = await data_processing_tool.safe_execute(operation="analyze", data=data, options={"stream": stream})
+            summarized = await data_processing_tool.safe_execute(operation="summarize", data=data, options={"stream": stream})
+            assert json.loads(analyzed.content)["total_size"] == byte_size
+            assert json.loads(summarized.content)["size"] == byte_size
+            assert summarized.metadata["data_size"] == byte_size
+    
+    @pytest.mark.asyncio
+    async def test_output_format(self, data_processing_tool):
+        """Testa saída compacta, indentada e formato inválido"""
+        data = json.dumps({"name": "test", "value": 123})
+        
+        compact = await data_processing_tool.safe_execute(
+            operation="transform", data=data, options={"output_format": "compact"}
+        )
+        pretty = await data_processing_tool.safe_execute(operation="transform", data=data)
+        invalid = await data_processing_tool.safe_execute(
+            operation="transform", data=data, options={"output_format": "yaml"}
+        )
+        
+        assert compact.content == '{"NAME":"test","VALUE":123}'
+        assert pretty.content == json.dumps({"NAME": "test", "VALUE": 123}, indent=2)
+        MCPTestHelper.assert_valid_tool_result(invalid, should_succeed=False)
+        assert "yaml" in invalid.error
+    
+    @pytest.mark.asyncio
+    async def test_streaming_summarize_list(self, data_processing_tool):
+        """Testa resumo incremental de lista"""
+        test_list = [1, 2.5, "three", {"four": 4}, [5, 6], None]
+        
+        result = await data_processing_tool.safe_execute(
+            operation="summarize",
+            data=json.dumps(test_list),
+            options={"stream": True}
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        summary = json.loads(result.content)
+        assert summary["length"] == 6
+        assert set(summary["item_types"]) == {"int", "float", "str", "dict", "list", "NoneType"}
+        assert summary["sample_items"] == [1, 2.5, "three"]
+    
+    @pytest.mark.asyncio
+    async def test_streaming_threshold(self):
+        """Testa ativação automática do streaming por tamanho"""
+        tool = DataProcessingTool(config={"stream_threshold_bytes": 10})
+        
+        result = await tool.safe_execute(operation="analyze", data=json.dumps({"key": "value"}))
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=True)
+        assert result.metadata["streamed"] is True
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("invalid_json", ['{"name": "test", "age":}', '[1, 2', '{"a": 1} extra', '{"a": "x]'])
+    async def test_streaming_invalid_json(self, data_processing_tool, invalid_json):
+        """Testa JSON inválido no modo streaming"""
+        result = await data_processing_tool.safe_execute(
+            operation="analyze",
+            data=invalid_json,
+            options={"stream": True}
+        )
+        
+        MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
+        assert "JSON inválido" in result.error
+    
     @pytest.mark.asyncio
     async def test_invalid_json(self, data_processing_tool):
         """Testa JSON inválido"""
@@ -446,6 +1635,634 @@ class TestDataProcessingTool:
         MCPTestHelper.assert_valid_tool_result(result, should_succeed=False)
         assert "json" in result.error.lower() and "inválido" in result.error.lower()
 
+# Testes para BasicMCPServer
+async def open_pipe_streams():
+    """Par (StreamReader, StreamWriter) ligado por um pipe do sistema operacional"""
+    loop = asyncio.get_running_loop()
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(read_fd, "rb", 0))
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, os.fdopen(write_fd, "wb", 0))
+    return reader, asyncio.StreamWriter(transport, protocol, None, loop)
+
+async def start_piped_server(server: BasicMCPServer):
+    """Sobe BatchedStdioTransport sobre dois pipes; devolve (cliente_escrita, cliente_leitura, transporte, task)"""
+    server_in, client_out = await open_pipe_streams()
+    client_in, server_out = await open_pipe_streams()
+    transport = BatchedStdioTransport(server)
+    task = asyncio.create_task(transport.serve(server_in, server_out))
+    return client_out, client_in, transport, task
+
+def echo_request(request_id: int) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": "echo", "arguments": {"message": f"msg {request_id}"}}}
+
+class TestBasicMCPServer:
+    """Testes para BasicMCPServer"""
+    
+    @pytest.mark.asyncio
+    async def test_jsonrpc_batch(self, basic_server):
+        """Testa lote JSON-RPC com requests, notificação e erros"""
+        batch = [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"protocolVersion": "2025-06-18"}},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+            echo_request(3),
+            {"jsonrpc": "2.0", "id": 4, "method": "desconhecido"},
+            {"id": 5}
+        ]
+        
+        response = json.loads(await basic_server.handle_jsonrpc_line(json.dumps(batch).encode()))
+        by_id = {item["id"]: item for item in response}
+        
+        assert len(response) == 5
+        assert by_id[1]["result"]["protocolVersion"] == "2025-06-18"
+        # Sem notifications/tools/list_changed: clientes revalidam pelo etag de tools/list
+        assert by_id[1]["result"]["capabilities"]["tools"]["listChanged"] is False
+        assert by_id[2]["result"]["_meta"]["etag"] == basic_server.tools_etag
+        assert by_id[3]["result"]["content"][0]["text"] == "Echo: msg 3"
+        assert by_id[4]["error"]["code"] == -32601
+        assert by_id[5]["error"]["code"] == -32600
+        
+        
+        # Cliente com o etag atual recebe resposta curta; com etag antigo, a lista completa
+        etag = basic_server.tools_etag
+        not_modified = json.loads(await basic_server.handle_jsonrpc_message(
+            {"jsonrpc": "2.0", "id": 6, "method": "tools/list", "params": {"_meta": {"etag": etag}}}
+        ))["result"]
+        assert not_modified == {"tools": [], "_meta": {"etag": etag, "notModified": True}}
+        basic_server.unregister_tool("echo")
+        changed = json.loads(await basic_server.handle_jsonrpc_message(
+            {"jsonrpc": "2.0", "id": 7, "method": "tools/list", "params": {"_meta": {"etag": etag}}}
+        ))["result"]
+        assert changed["_meta"] == {"etag": basic_server.tools_etag}
+        assert changed["tools"] and "notModified" not in changed["_meta"]
+        
+        assert await basic_server.handle_jsonrpc_line(b'[{"jsonrpc": "2.0", "method": "notifications/x"}]') is None
+        assert json.loads(await basic_server.handle_jsonrpc_line(b"{quebrado"))["error"]["code"] == -32700
+        assert json.loads(await basic_server.handle_jsonrpc_line(b"[]"))["error"]["code"] == -32600
+    
+    @pytest.mark.asyncio
+    async def test_batched_stdio_transport_over_pipe(self, basic_server):
+        """Testa pipeline sobre pipe: mensagens de um chunk despachadas juntas e escritas agrupadas"""
+        client_out, client_in, transport, serve_task = await start_piped_server(basic_server)
+        
+        # Mensagens em uma escrita, última sem newline final antes do EOF
+        lines = [json.dumps(echo_request(i)) for i in range(50)]
+        client_out.write("\n".join(lines).encode())
+        await client_out.drain()
+        client_out.close()
+        
+        responses = [json.loads(line) for line in (await client_in.read()).splitlines()]
+        await serve_task
+        
+        assert sorted(item["id"] for item in responses) == list(range(50))
+        metrics = transport.get_metrics()
+        assert metrics["messages_in"] == metrics["messages_out"] == 50
+        assert metrics["writes"] < 50
+    
+    @pytest.mark.asyncio
+    async def test_batched_stdio_transport_rejects_oversized_line(self, basic_server):
+        """Testa linha acima de max_line recebida em pedaços: rejeitada sem derrubar a sessão"""
+        server_in, client_out = await open_pipe_streams()
+        client_in, server_out = await open_pipe_streams()
+        transport = BatchedStdioTransport(basic_server, read_chunk=16, max_line=256)
+        serve_task = asyncio.create_task(transport.serve(server_in, server_out))
+        
+        oversized = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping", "params": {"pad": "x" * 1000}})
+        client_out.write(oversized.encode() + b"\n" + json.dumps(echo_request(2)).encode() + b"\n")
+        await client_out.drain()
+        client_out.close()
+        
+        await serve_task
+        server_out.close()
+        responses = [json.loads(line) for line in (await client_in.read()).splitlines()]
+        
+        assert len(responses) == 2
+        rejected = next(item for item in responses if "error" in item)
+        assert rejected["id"] is None
+        assert rejected["error"]["code"] == -32600
+        assert any(item.get("id") == 2 and "result" in item for item in responses)
+        assert transport.stats["reads"] > 60
+    
+    @pytest.mark.asyncio
+    async def test_lazy_tool_loaded_on_first_call(self, basic_server, temp_dir):
+        """Testa ferramenta do manifesto: listada sem import, importada e construída na primeira chamada"""
+        (temp_dir / "greeter.py").write_text(
+            "IMPORTS = []\n"
+            "IMPORTS.append(1)\n"
+            "async def greet(name):\n"
+            "    return f'Olá, {name} ({len(IMPORTS)})'\n"
+        )
+        manifest = {"version": 1, "tools": [{
+            "loader": "greeter.py:greet",
+            "max_concurrency": 2,
+            "schema": {"name": "greeter", "description": "Saúda",
+                       "inputSchema": {"type": "object", "properties": {"name": {"type": "string"}}}}
+        }]}
+        (temp_dir / "manifest.json").write_text(json.dumps(manifest))
+        
+        assert basic_server.load_tools_manifest(temp_dir / "manifest.json") == 1
+        tool_info = basic_server.tools_registry["greeter"]
+        assert "handler" not in tool_info
+        listed = json.loads(basic_server.get_tools_list_bytes())["tools"]
+        assert "greeter" in [tool["name"] for tool in listed]
+        assert basic_server.dispatcher.get_metrics()["tools"] == {} and tool_info["max_concurrency"] == 2
+        
+        calls = [{"jsonrpc": "2.0", "id": i, "method": "tools/call",
+                  "params": {"name": "greeter", "arguments": {"name": "Ana"}}} for i in range(3)]
+        response = json.loads(await basic_server.handle_jsonrpc_line(json.dumps(calls).encode()))
+        
+        assert [item["result"]["content"][0]["text"] for item in response] == ["Olá, Ana (1)"] * 3
+        assert callable(tool_info["handler"])
+    
+    @pytest.mark.asyncio
+    async def test_shipped_tools_manifest_is_current(self, basic_server, temp_dir):
+        """Testa que tools-manifest.json corresponde às ferramentas atuais e que elas carregam sob demanda"""
+        import basic_mcp_server
+        
+        generated = basic_mcp_server.write_tools_manifest(temp_dir / "manifest.json")
+        shipped = json.loads((Path(basic_mcp_server.__file__).resolve().parent / "tools-manifest.json").read_text())
+        assert [tool["schema"] for tool in generated["tools"]] == [tool["schema"] for tool in shipped["tools"]]
+        
+        basic_server.load_tools_manifest(temp_dir / "manifest.json")
+        result = await basic_server.call_tool(MCPTestHelper.create_call_tool_request(
+            "data_processor", {"operation": "analyze", "data": '{"a": [1, 2]}'}
+        ))
+        assert json.loads(result.content[0].text)["type"] == "object"
+        # A ferramenta carregada usa o pool do servidor, não um pool próprio
+        assert basic_server.tools_registry["data_processor"]["handler"].tool.cpu_executor is basic_server.cpu_executor
+    
+    @pytest.mark.asyncio
+    async def test_unix_socket_transport_multiplexes_clients(self, basic_server, temp_dir):
+        """Testa vários clientes simultâneos compartilhando um servidor via Unix socket"""
+        socket_server = SocketTransportServer(basic_server)
+        before = set(os.listdir(temp_dir))
+        umask = os.umask(0o022)
+        try:
+            with patch("os.umask", side_effect=AssertionError("umask é estado do processo inteiro")):
+                path = await socket_server.start_unix(str(temp_dir / "mcp.sock"))
+            assert os.umask(0o022) == 0o022
+        finally:
+            os.umask(umask)
+        # Nenhum diretório temporário sobra ao lado do socket
+        assert set(os.listdir(temp_dir)) - before == {"mcp.sock"}
+        
+        async def client(client_id: int) -> List[Dict[str, Any]]:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"".join(json.dumps(echo_request(client_id * 100 + i)).encode() + b"\n" for i in range(10)))
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(10)]
+            writer.close()
+            return responses
+        
+        try:
+            results = await asyncio.gather(*(client(c) for c in range(5)))
+            for client_id, responses in enumerate(results):
+                assert sorted(item["id"] for item in responses) == [client_id * 100 + i for i in range(10)]
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+            metrics = socket_server.get_metrics()
+            assert metrics["accepted"] == 5
+            assert metrics["messages_out"] == 50
+        finally:
+            await socket_server.close()
+        assert not os.path.exists(path)
+    
+    @pytest.mark.asyncio
+    async def test_tcp_transport_loopback_and_connection_limit(self, basic_server):
+        """Testa TCP restrito a loopback e recusa acima de max_connections"""
+        socket_server = SocketTransportServer(basic_server, max_connections=1)
+        with pytest.raises(ValueError, match="loopback"):
+            await socket_server.start_tcp("0.0.0.0", 0)
+        host, port = await socket_server.start_tcp("127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b'{"jsonrpc":"2.0","id":1,"method":"ping"}\n')
+            assert json.loads(await reader.readline())["result"] == {}
+            
+            rejected_reader, rejected_writer = await asyncio.open_connection(host, port)
+            assert "Limite de conexões" in json.loads(await rejected_reader.readline())["error"]["message"]
+            assert await rejected_reader.read() == b""
+            rejected_writer.close()
+            writer.close()
+            assert socket_server.get_metrics()["rejected"] == 1
+        finally:
+            await socket_server.close()
+    
+    @pytest.mark.asyncio
+    async def test_transport_backpressure_on_slow_reader(self, basic_server):
+        """Testa backpressure: cliente que não lê as respostas faz a leitura da entrada parar"""
+        class BlockedWriter:
+            def __init__(self):
+                self.data = []
+                self.unblocked = asyncio.Event()
+            def write(self, data):
+                self.data.append(data)
+            async def drain(self):
+                await self.unblocked.wait()
+            def close(self):
+                pass
+        
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"".join(json.dumps(echo_request(i)).encode() + b"\n" for i in range(50)))
+        reader.feed_eof()
+        writer = BlockedWriter()
+        transport = BatchedStdioTransport(basic_server, max_in_flight=4)
+        serve_task = asyncio.create_task(transport.serve(reader, writer))
+        
+        await asyncio.sleep(0.1)
+        assert transport.stats["messages_in"] == 4
+        
+        writer.unblocked.set()
+        await asyncio.wait_for(serve_task, timeout=5.0)
+        assert transport.stats["messages_in"] == transport.stats["messages_out"] == 50
+    
+    @pytest.mark.asyncio
+    async def test_worker_pool_shards_tool_calls(self):
+        """Testa modo multi-worker: tools/call executado nos workers, métricas agregadas no front"""
+        server = BasicMCPServer(workers=2)
+        await server.worker_pool.start()
+        try:
+            batch = [echo_request(i) for i in range(20)]
+            response = json.loads(await server.handle_jsonrpc_line(json.dumps(batch).encode()))
+            
+            assert sorted(item["id"] for item in response) == list(range(20))
+            assert all(item["result"]["content"][0]["text"] == f"Echo: msg {item['id']}" for item in response)
+            result = await server.call_tool(MCPTestHelper.create_call_tool_request("echo", {"message": "sdk"}))
+            assert result.content[0].text == "Echo: sdk"
+            
+            metrics = (await server.get_metrics())["worker_pool"]
+            assert metrics["tools"]["echo"]["calls"] == 21
+            assert all(worker["calls"] > 0 and worker["pid"] != os.getpid() for worker in metrics["workers"])
+            assert server.dispatcher.get_metrics()["tools"] == {}
+        finally:
+            await server.worker_pool.stop()
+    
+    @pytest.mark.asyncio
+    async def test_worker_pool_sticky_routing(self):
+        """Testa roteamento sticky: mesma chave sempre no mesmo worker"""
+        server = BasicMCPServer(workers=3)
+        server.tools_registry["echo"]["sticky_key"] = "message"
+        await server.worker_pool.start()
+        try:
+            for _ in range(10):
+                await server.worker_pool.call_tool("echo", {"message": "sessão-a"})
+            
+            calls = sorted(worker.calls for worker in server.worker_pool.workers)
+            assert calls == [0, 0, 10]
+            assert server.worker_pool.stats["sticky_calls"] == 10
+        finally:
+            await server.worker_pool.stop()
+    
+    @pytest.mark.asyncio
+    async def test_worker_pool_spawn_keeps_manifest_tools_and_limits(self, temp_dir):
+        """Testa workers spawn: ferramentas do manifesto e limites por ferramenta chegam aos workers"""
+        (temp_dir / "greeter.py").write_text("async def greet(name):\n    return f'Olá, {name}'\n")
+        manifest = {"version": 1, "tools": [{
+            "loader": "greeter.py:greet",
+            "max_concurrency": 2,
+            "schema": {"name": "greeter", "description": "Saúda",
+                       "inputSchema": {"type": "object", "properties": {"name": {"type": "string"}}}}
+        }]}
+        (temp_dir / "manifest.json").write_text(json.dumps(manifest))
+        
+        server = BasicMCPServer(workers=1, worker_start_method="spawn")
+        server.load_tools_manifest(temp_dir / "manifest.json")
+        server.tools_registry["echo"]["max_concurrency"] = 3
+        pool = server.worker_pool
+        
+        worker_server = pool._make_server_factory()()
+        try:
+            await worker_server.execute_tool_json("greeter", {"name": "local"})
+            await worker_server.execute_tool_json("echo", {"message": "local"})
+            limits = {name: tool["limit"] for name, tool in worker_server.dispatcher.get_metrics()["tools"].items()}
+            assert limits == {"greeter": 2, "echo": 3}
+        finally:
+            worker_server.cpu_executor.shutdown()
+        
+        await pool.start()
+        try:
+            assert "Olá, Ana" in (await pool.call_tool("greeter", {"name": "Ana"})).decode()
+        finally:
+            await pool.stop()
+        
+        server.register_tool("local", lambda **kwargs: None, server.tools_registry["echo"]["schema"])
+        with pytest.raises(ValueError, match="spawn"):
+            await pool.start()
+    
+    @pytest.mark.asyncio
+    async def test_worker_pool_graceful_restart_and_crash(self):
+        """Testa restart gracioso (chamadas em andamento concluem) e recriação após crash"""
+        async def slow_handler(**kwargs):
+            await asyncio.sleep(0.3)
+            return "lento"
+        
+        server = BasicMCPServer(workers=1)
+        server.register_tool("slow", slow_handler, server.tools_registry["echo"]["schema"])
+        pool = server.worker_pool
+        await pool.start()
+        try:
+            old_pid = pool.workers[0].pid
+            in_flight = [asyncio.create_task(pool.call_tool("slow", {})) for _ in range(4)]
+            await asyncio.sleep(0.1)
+            await pool.restart_worker(0)
+            
+            assert all(b"lento" in result for result in await asyncio.gather(*in_flight))
+            assert pool.workers[0].pid != old_pid
+            assert pool.stats["restarts"] == 1
+            
+            crashed_pid = pool.workers[0].pid
+            pending = asyncio.create_task(pool.call_tool("slow", {}))
+            await asyncio.sleep(0.1)
+            os.kill(crashed_pid, signal.SIGKILL)
+            with pytest.raises(WorkerUnavailableError):
+                await pending
+            for _ in range(100):
+                if pool.workers[0].pid != crashed_pid and pool.workers[0].alive:
+                    break
+                await asyncio.sleep(0.05)
+            
+            assert pool.stats["crashes"] == 1
+            assert b"Echo: ok" in await pool.call_tool("echo", {"message": "ok"})
+        finally:
+            await pool.stop()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="contagem de processos filhos via /proc")
+    @pytest.mark.parametrize("start_method", ["fork", "spawn"])
+    async def test_worker_pool_cpu_bound_tools_stay_in_worker(self, start_method):
+        """Testa que ferramentas CPU-bound num worker usam o executor do worker, sem abrir pool de processos"""
+        import basic_mcp_server
+        
+        def child_pids(pid: int) -> List[int]:
+            children = []
+            for entry in filter(str.isdigit, os.listdir("/proc")):
+                try:
+                    with open(f"/proc/{entry}/stat") as stat_file:
+                        # Campos após "(comm)": estado, ppid, ...
+                        ppid = int(stat_file.read().rsplit(")", 1)[1].split()[1])
+                except (FileNotFoundError, ProcessLookupError):
+                    continue
+                if ppid == pid:
+                    children.append(int(entry))
+            return children
+        
+        server = BasicMCPServer(workers=1, worker_start_method=start_method)
+        server.load_tools_manifest(Path(basic_mcp_server.__file__).resolve().parent / "tools-manifest.json")
+        # Com fork o worker herdaria a instância já carregada no front, ligada ao pool do front
+        server._resolve_handler("data_processor", server.tools_registry["data_processor"])
+        pool = server.worker_pool
+        await pool.start()
+        try:
+            large_data = json.dumps({f"key_{i}": "x" * 100 for i in range(3000)})
+            assert len(large_data) >= 256 * 1024
+            result = json.loads(await pool.call_tool("data_processor", {"operation": "summarize", "data": large_data}))
+            
+            assert json.loads(result["content"][0]["text"])["key_count"] == 3000
+            assert child_pids(pool.workers[0].pid) == []
+            assert server.cpu_executor.get_metrics()["tasks"] == 0
+        finally:
+            await pool.stop()
+            server.cpu_executor.shutdown()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("garbage", [b"isto nao e json\n", b"[1, 2]\n", b'{"jsonrpc":"2.0","id":x,"result":1}\n'])
+    async def test_worker_pool_malformed_response_restarts_worker(self, garbage):
+        """Testa linha malformada no canal: chamadas pendentes falham e o worker é recriado"""
+        async def slow_handler(**kwargs):
+            await asyncio.sleep(0.3)
+            return "lento"
+        
+        server = BasicMCPServer(workers=1)
+        server.register_tool("slow", slow_handler, server.tools_registry["echo"]["schema"])
+        pool = server.worker_pool
+        await pool.start()
+        try:
+            worker = pool.workers[0]
+            pending = asyncio.create_task(pool.call_tool("slow", {}))
+            await asyncio.sleep(0.1)
+            worker.reader.feed_data(garbage)
+            with pytest.raises(WorkerUnavailableError):
+                await asyncio.wait_for(pending, timeout=5.0)
+            for _ in range(100):
+                if pool.workers[0] is not worker and pool.workers[0].alive:
+                    break
+                await asyncio.sleep(0.05)
+            
+            assert not worker.process.is_alive()
+            assert pool.stats["crashes"] == 1
+            assert b"Echo: ok" in await pool.call_tool("echo", {"message": "ok"})
+        finally:
+            await pool.stop()
+    
+    @pytest.mark.asyncio
+    async def test_call_tool_echo(self, basic_server):
+        """Testa chamada simples via call_tool"""
+        request = MCPTestHelper.create_call_tool_request("echo", {"message": "olá"})
+        result = await basic_server.call_tool(request)
+        
+        assert result.content[0].text == "Echo: olá"
+        metrics = basic_server.dispatcher.get_metrics()
+        assert metrics["tools"]["echo"]["calls"] == 1
+        assert metrics["in_flight"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_slow_tool_does_not_block_others(self, basic_server):
+        """Testa que uma ferramenta lenta não atrasa as demais"""
+        release = asyncio.Event()
+        
+        async def slow_handler(**kwargs):
+            await release.wait()
+            return "lento"
+        
+        basic_server.tools_registry["calculator"]["handler"] = slow_handler
+        slow_call = asyncio.create_task(basic_server.call_tool(
+            MCPTestHelper.create_call_tool_request("calculator", {"operation": "add", "a": 1, "b": 2})
+        ))
+        await asyncio.sleep(0)
+        
+        echo_result = await asyncio.wait_for(
+            basic_server.call_tool(MCPTestHelper.create_call_tool_request("echo", {"message": "rápido"})),
+            timeout=1.0
+        )
+        assert echo_result.content[0].text == "Echo: rápido"
+        assert not slow_call.done()
+        
+        release.set()
+        slow_result = await slow_call
+        assert slow_result.content[0].text == "lento"
+    
+    @pytest.mark.asyncio
+    async def test_dispatcher_per_tool_limit(self):
+        """Testa limite de concorrência por ferramenta e contadores de fila"""
+        dispatcher = ToolDispatcher(max_concurrency=10)
+        dispatcher.set_tool_limit("slow", 2)
+        active = 0
+        peak = 0
+        
+        async def handler():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+        
+        await asyncio.gather(*(dispatcher.submit("slow", handler) for _ in range(6)))
+        
+        metrics = dispatcher.get_metrics()
+        assert peak == 2
+        assert metrics["tools"]["slow"]["calls"] == 6
+        assert metrics["tools"]["slow"]["limit"] == 2
+        assert metrics["max_queue_depth"] >= 4
+        assert metrics["tools"]["slow"]["max_wait_time"] > 0
+        assert metrics["queue_depth"] == 0
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_processes", [True, False])
+    async def test_text_analyzer_runs_in_cpu_pool(self, use_processes):
+        """Testa text_analyzer CPU-bound no pool de processos e no fallback de threads"""
+        executor = ServerCPUBoundExecutor(max_workers=2, use_processes=use_processes, shared_memory_threshold=1024)
+        server = BasicMCPServer(cpu_executor=executor)
+        try:
+            text = "palavra " * 1000
+            result = await server.call_tool(
+                MCPTestHelper.create_call_tool_request("text_analyzer", {"text": text})
+            )
+            
+            assert "Words: 1000" in result.content[0].text
+            metrics = executor.get_metrics()
+            assert metrics["mode"] == ("process" if use_processes else "thread")
+            assert metrics["tasks"] == 1
+            assert metrics["shared_memory_transfers"] == (1 if use_processes else 0)
+        finally:
+            executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_list_tools_cached_until_registry_changes(self, basic_server):
+        """Testa cache de tools/list e invalidação por versão"""
+        first = await basic_server.list_tools()
+        second = await basic_server.list_tools()
+        etag = basic_server.tools_etag
+        
+        assert first is second
+        assert first.meta["etag"] == etag
+        assert not basic_server.tools_list_changed(etag)
+        assert json.loads(basic_server.get_tools_list_bytes())["_meta"]["etag"] == etag
+        
+        basic_server.register_tool(
+            "ping",
+            basic_server._handle_echo,
+            first.tools[0].model_copy(update={"name": "ping"})
+        )
+        updated = await basic_server.list_tools()
+        
+        assert updated is not first
+        assert "ping" in [tool.name for tool in updated.tools]
+        assert basic_server.tools_list_changed(etag)
+        
+        basic_server.unregister_tool("ping")
+        assert "ping" not in [tool.name for tool in (await basic_server.list_tools()).tools]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    async def test_calculator_batch(self, basic_server, monkeypatch, use_numpy):
+        """Testa calculadora em lote com erros por elemento"""
+        import basic_mcp_server
+        
+        if not use_numpy:
+            monkeypatch.setattr(basic_mcp_server, "np", None)
+        elif basic_mcp_server.np is None:
+            pytest.skip("NumPy não instalado")
+        
+        result = await basic_server.call_tool(MCPTestHelper.create_call_tool_request("calculator_batch", {
+            "a": [1, 6, 2, 5],
+            "b": [2, 3, 0, 4],
+            "operations": ["add", "divide", "divide", "power"]
+        }))
+        batch = json.loads(result.content[0].text)
+        
+        assert batch["count"] == 4
+        assert batch["results"] == [3.0, 2.0, None, None]
+        assert [error["index"] for error in batch["errors"]] == [2, 3]
+        assert "zero" in batch["errors"][0]["error"]
+        
+        result = await basic_server.call_tool(MCPTestHelper.create_call_tool_request("calculator_batch", {
+            "items": [{"operation": "multiply", "a": 2, "b": 4}, {"operation": "subtract", "a": 1, "b": 3}]
+        }))
+        assert json.loads(result.content[0].text)["results"] == [8.0, -2.0]
+        
+        result = await basic_server.call_tool(MCPTestHelper.create_call_tool_request("calculator_batch", {
+            "items": [{"operation": "add", "a": 1}, {"operation": "multiply", "a": 1e308, "b": 10},
+                      {"operation": "divide", "a": 1e308, "b": 1e-308}, {"operation": "add", "a": True, "b": 1},
+                      {"operation": "add", "a": "2", "b": 1}, {"operation": "subtract", "a": 5, "b": 2}]
+        }))
+        batch = json.loads(result.content[0].text, parse_constant=lambda name: pytest.fail(f"{name} na resposta"))
+        assert batch["results"] == [None, None, None, None, None, 3.0]
+        assert [error["index"] for error in batch["errors"]] == [0, 1, 2, 3, 4]
+        assert "finitos" in batch["errors"][0]["error"]
+        assert "overflow" in batch["errors"][1]["error"]
+        assert "overflow" in batch["errors"][2]["error"]
+    
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    def test_streaming_analyzer_matches_full_pass(self, chunk_size):
+        """Testa que a análise em blocos equivale à análise do texto inteiro"""
+        text = "Olá  mundo\nlinha\tdois com   espaços \n\nfim"
+        words = text.split()
+        
+        analysis = StreamingTextAnalyzer.analyze(text, chunk_size=chunk_size)
+        
+        assert analysis["characters"] == len(text)
+        assert analysis["lines"] == text.count("\n") + 1
+        assert analysis["characters_no_spaces"] == len(text.replace(" ", ""))
+        assert analysis["words"] == len(words)
+        assert analysis["avg_word_length"] == sum(len(w) for w in words) / len(words)
+        
+        from_chunks = StreamingTextAnalyzer.analyze(iter(["Olá mu", "ndo\n", "x"]))
+        assert from_chunks["words"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_text_analyzer_file_path(self, temp_dir):
+        """Testa text_analyzer lendo de arquivo dentro do diretório permitido"""
+        (temp_dir / "doc.txt").write_text("um dois três\nquatro", encoding="utf-8")
+        executor = ServerCPUBoundExecutor(max_workers=1, use_processes=False)
+        server = BasicMCPServer(cpu_executor=executor, files_root=str(temp_dir))
+        try:
+            result = await server.call_tool(
+                MCPTestHelper.create_call_tool_request("text_analyzer", {"file_path": "doc.txt"})
+            )
+            assert "Words: 4" in result.content[0].text
+            assert "Lines: 2" in result.content[0].text
+            
+            result = await server.call_tool(
+                MCPTestHelper.create_call_tool_request("text_analyzer", {"file_path": "../fora.txt"})
+            )
+            assert "fora do diretório" in result.content[0].text
+        finally:
+            executor.shutdown()
+        
+        # Sem files_root explícito, file_path é recusado (nem o diretório atual é lido)
+        server = BasicMCPServer(cpu_executor=ServerCPUBoundExecutor(max_workers=1, use_processes=False))
+        try:
+            result = await server.call_tool(
+                MCPTestHelper.create_call_tool_request("text_analyzer", {"file_path": "doc.txt"})
+            )
+            assert "Leitura de arquivos desabilitada" in result.content[0].text
+        finally:
+            server.cpu_executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_cpu_pool_propagates_errors(self):
+        """Testa que erros do worker voltam como resultado de erro"""
+        executor = ServerCPUBoundExecutor(max_workers=1)
+        server = BasicMCPServer(cpu_executor=executor)
+        try:
+            result = await server.call_tool(
+                MCPTestHelper.create_call_tool_request("text_analyzer", {"text": ""})
+            )
+            assert "não pode estar vazio" in result.content[0].text
+        finally:
+            executor.shutdown()
+
 # Testes parametrizados
 @pytest.mark.parametrize("operation,data,should_succeed", [
     ("analyze", '{"key": "value"}', True),
@@ -540,6 +2357,159 @@ class TestPerformance:
         
         print(f"Write time: {write_time:.2f}s, Read time: {read_time:.2f}s")
 
+    @pytest.mark.asyncio
+    async def test_stdio_pipeline_throughput(self, basic_server):
+        """Compara requests em rajada (pipeline) com ida-e-volta uma a uma sobre pipe (tempos só informativos)"""
+        import logging
+        import time
+        
+        logging.getLogger("basic_mcp_server").setLevel(logging.WARNING)
+        client_out, client_in, transport, serve_task = await start_piped_server(basic_server)
+        total = 1000
+        
+        try:
+            start_time = time.perf_counter()
+            for i in range(total // 10):
+                client_out.write(json.dumps(echo_request(i)).encode() + b"\n")
+                await client_out.drain()
+                await client_in.readline()
+            sequential_time = time.perf_counter() - start_time
+            sequential_writes = transport.stats["writes"]
+            
+            start_time = time.perf_counter()
+            burst = b"".join(json.dumps(echo_request(i)).encode() + b"\n" for i in range(total))
+            client_out.write(burst)
+            await client_out.drain()
+            for _ in range(total):
+                await client_in.readline()
+            pipelined_time = time.perf_counter() - start_time
+        finally:
+            client_out.close()
+            await serve_task
+            logging.getLogger("basic_mcp_server").setLevel(logging.INFO)
+        
+        sequential_rate = (total // 10) / sequential_time
+        pipelined_rate = total / pipelined_time
+        pipelined_writes = transport.stats["writes"] - sequential_writes
+        print(f"Sequencial: {sequential_rate:.0f} msg/s, pipeline: {pipelined_rate:.0f} msg/s "
+              f"({total / pipelined_writes:.1f} mensagens por escrita)")
+        
+        # Mecanismo, não relógio: ida-e-volta gera uma escrita por mensagem, rajada agrupa
+        assert sequential_writes == total // 10
+        assert pipelined_writes < total / 5
+    
+    def test_parameter_validation_performance(self, file_manager_tool):
+        """Compara validador compilado com o caminho interpretado anterior (tempos só informativos)"""
+        import time
+        
+        def interpreted_validate(tool, **kwargs):
+            validated = {}
+            for param in tool.get_parameters():
+                value = kwargs.get(param.name)
+                if param.required and value is None:
+                    raise ValueError(param.name)
+                if value is None and param.default is not None:
+                    value = param.default
+                validated[param.name] = value
+            return validated
+        
+        kwargs = {"operation": "read", "file_path": "arquivo.txt"}
+        iterations = 20000
+        
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            interpreted_validate(file_manager_tool, **kwargs)
+        interpreted_time = time.perf_counter() - start_time
+        
+        validator = file_manager_tool.get_validator()
+        with patch.object(FileManagerTool, "get_parameters", wraps=file_manager_tool.get_parameters) as get_parameters:
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                file_manager_tool.validate_parameters(**kwargs)
+            compiled_time = time.perf_counter() - start_time
+        
+        print(f"Validação: interpretada {interpreted_time / iterations * 1e6:.2f}us/chamada, "
+              f"compilada {compiled_time / iterations * 1e6:.2f}us/chamada")
+        # Mecanismo, não relógio: o validador é compilado uma vez e reaproveitado
+        assert get_parameters.call_count == 0
+        assert file_manager_tool.get_validator() is validator
+        assert FileManagerTool(config={"base_directory": "."}).get_validator() is validator
+        assert file_manager_tool.validate_parameters(**kwargs) == interpreted_validate(file_manager_tool, **kwargs)
+
+    def test_request_model_validation_performance(self):
+        """Compara construção de modelos Pydantic por chamada com o caminho em cache (tempos só informativos)"""
+        import time
+        
+        iterations = 20000
+        headers = {"Accept": "application/json"}
+        
+        def measure(func):
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            return (time.perf_counter() - start_time) / iterations * 1e6
+        
+        file_before = measure(lambda: FileOperationRequest(file_path="src/modulo.py", encoding="utf-8"))
+        file_after = measure(lambda: validate_file_request("src/modulo.py", "utf-8"))
+        api_before = measure(lambda: APICallRequest(url="https://api.example.com/v1", method="GET", headers=headers, data=None, timeout=30))
+        api_after = measure(lambda: validate_api_request("https://api.example.com/v1", "GET", headers, None, 30))
+        
+        print(f"FileOperationRequest: {file_before:.2f}us -> {file_after:.2f}us; "
+              f"APICallRequest: {api_before:.2f}us -> {api_after:.2f}us")
+        # Mecanismo, não relógio: requests repetidos devolvem o mesmo modelo já validado
+        assert validate_file_request("src/modulo.py", "utf-8") is validate_file_request("src/modulo.py", "utf-8")
+        api_request = validate_api_request("https://api.example.com/v1", "GET", headers, None, 30)
+        assert validate_api_request("https://api.example.com/v1", "GET", dict(headers), None, 30) is api_request
+        assert validate_api_request("https://api.example.com/v1", "POST", headers, {"a": 1}, 30) is not \
+            validate_api_request("https://api.example.com/v1", "POST", headers, {"a": 1}, 30)
+
+    def test_path_guard_performance(self, temp_dir):
+        """Compara resolve() + startswith por chamada com o PathGuard em cache (tempos só informativos)"""
+        import time
+        
+        (temp_dir / "a" / "b" / "c").mkdir(parents=True)
+        guard = PathGuard(temp_dir)
+        relative = "a/b/c/arquivo.txt"
+        iterations = 5000
+        
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            full_path = (temp_dir / relative).resolve()
+            assert str(full_path).startswith(str(temp_dir.resolve()))
+        resolve_time = time.perf_counter() - start_time
+        
+        expected = guard.resolve(relative)
+        with patch.object(Path, "resolve", autospec=True, side_effect=Path.resolve) as path_resolve:
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                assert guard.resolve(relative) == expected
+            guard_time = time.perf_counter() - start_time
+        
+        print(f"Path check: resolve {resolve_time / iterations * 1e6:.2f}us/chamada, "
+              f"PathGuard {guard_time / iterations * 1e6:.2f}us/chamada")
+        # Mecanismo, não relógio: hits revalidam com lstat, sem resolve() por chamada
+        assert path_resolve.call_count == 0
+        metrics = guard.get_metrics()
+        assert metrics["misses"] == 1
+        assert metrics["hits"] == iterations
+
+    def test_cold_start_import_budget(self):
+        """Testa que o import do servidor não carrega o SDK do MCP nem o Pydantic"""
+        import subprocess
+        
+        script = sys.modules[BasicMCPServer.__module__].__file__
+        result = subprocess.run([sys.executable, "-X", "importtime", script, "--help"],
+                                capture_output=True, text=True, timeout=60)
+        imports = [line.split("|") for line in result.stderr.splitlines()
+                   if line.startswith("import time:") and "self [us]" not in line]
+        modules = {name.strip().split(".")[0] for _, _, name in imports}
+        total_ms = sum(int(self_us.split(":")[1]) for self_us, _, _ in imports) / 1000
+        
+        print(f"Import do servidor: {total_ms:.0f}ms em {len(imports)} módulos")
+        assert result.returncode == 0
+        assert not modules & {"mcp", "pydantic"}
+        assert total_ms < 1000
+
 # Configuração de testes
 def pytest_configure(config):
     """Configuração do pytest"""
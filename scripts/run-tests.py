@@ -22,6 +22,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Orçamento de cold start: clientes MCP iniciam o servidor a cada sessão
+STARTUP_IMPORT_BUDGET_MS = 300
+# Módulos que não devem ser importados no startup (carregados sob demanda)
+STARTUP_FORBIDDEN_IMPORTS = ("mcp", "pydantic")
+
 class TestRunner:
     """Runner para executar testes MCP com diferentes configurações"""
     
@@ -290,6 +295,62 @@ class TestRunner:
                 "error": str(e)
             }
     
+    def profile_startup_imports(self, server_script: str = "examples/basic-mcp-server.py",
+                                budget_ms: float = STARTUP_IMPORT_BUDGET_MS) -> Dict[str, any]:
+        """
+        Perfil de import do servidor (python -X importtime) contra o orçamento de cold start
+        Roda o script com --help: todo o import do módulo, sem iniciar transporte
+        """
+        logger.info(f"Perfil de import do servidor: {server_script}")
+        
+        cmd = [sys.executable, "-X", "importtime", str(self.project_root / server_script), "--help"]
+        
+        start_time = time.time()
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.project_root)
+            duration = time.time() - start_time
+            
+            total_us = 0
+            top_level = []
+            modules = set()
+            for line in result.stderr.splitlines():
+                if not line.startswith("import time:") or "self [us]" in line:
+                    continue
+                self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+                modules.add(name.strip().split(".")[0])
+                total_us += int(self_us)
+                # Um espaço de indentação = import direto do script
+                if name.startswith(" ") and not name.startswith("  "):
+                    top_level.append((int(cumulative_us), name.strip()))
+            
+            total_ms = total_us / 1000
+            forbidden = sorted(modules.intersection(STARTUP_FORBIDDEN_IMPORTS))
+            success = result.returncode == 0 and total_ms <= budget_ms and not forbidden
+            message = (f"Import em {total_ms:.0f}ms (orçamento {budget_ms:.0f}ms); "
+                       f"módulos proibidos: {forbidden or 'nenhum'}")
+            report = {
+                "success": success,
+                "duration": duration,
+                "import_time_ms": total_ms,
+                "budget_ms": budget_ms,
+                "forbidden_imports": forbidden,
+                "top_imports": [
+                    {"module": name, "cumulative_ms": cumulative / 1000}
+                    for cumulative, name in sorted(top_level, reverse=True)[:10]
+                ],
+                "message": message
+            }
+            if not success:
+                report["error"] = result.stderr if result.returncode != 0 else message
+            return report
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "duration": time.time() - start_time,
+                "error": str(e)
+            }
+    
     def generate_coverage_report(self, test_path: str = "examples/test-examples.py") -> Dict[str, any]:
         """Gera relatório de cobertura"""
         logger.info("Gerando relatório de cobertura...")
@@ -374,6 +435,7 @@ class TestRunner:
         # Teste de inicialização do servidor
         server_test = asyncio.run(self.test_server_startup())
         results["server_startup"] = server_test
+        results["startup_imports"] = self.profile_startup_imports()
         
         return results
     
@@ -429,7 +491,7 @@ def main():
                         help="Inclui testes lentos (performance e integração)")
     parser.add_argument("--output", type=Path,
                         help="Arquivo para salvar resultados JSON")
-    parser.add_argument("--category", choices=["unit", "lint", "type", "performance", "integration", "coverage", "server"],
+    parser.add_argument("--category", choices=["unit", "lint", "type", "performance", "integration", "coverage", "server", "startup"],
                         help="Executa apenas uma categoria específica")
     
     args = parser.parse_args()
@@ -460,6 +522,8 @@ def main():
         elif args.category == "server":
             server_result = asyncio.run(runner.test_server_startup())
             results = {"server_startup": server_result}
+        elif args.category == "startup":
+            results = {"startup_imports": runner.profile_startup_imports()}
     else:
         # Executa todos os testes
         results = runner.run_all_tests(include_slow=args.include_slow)